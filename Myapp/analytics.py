@@ -0,0 +1,302 @@
+"""
+Task analytics computed in the database: lead time percentiles, throughput per
+period and ageing of unfinished tasks, from the tasks or from daily rollups.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from math import ceil
+
+from django.db import connections, models, transaction
+from django.db.models import Count, F, Max, Q, Sum, Value, Window
+from django.db.models.functions import RowNumber, Trunc, TruncDate
+from django.utils import timezone
+
+from .models import Task, TaskDailyRollup
+from .signals import invalidate_users
+
+PERCENTILES = (50, 90, 99)
+
+# Time from creation to completion of a task.
+LEAD_TIME = models.ExpressionWrapper(
+    F("completed_date") - F("creation_date"), output_field=models.DurationField()
+)
+
+# Upper bounds of the lead time ranges counted by the daily rollups. The last
+# range, holding longer lead times, has no upper bound.
+LEAD_TIME_BUCKETS = [
+    timedelta(hours=1),
+    timedelta(hours=4),
+    timedelta(days=1),
+    timedelta(days=2),
+    timedelta(days=4),
+    timedelta(days=7),
+    timedelta(days=14),
+    timedelta(days=30),
+    timedelta(days=90),
+]
+
+# Rollups looked up per query by `adjust_rollups`, keeping the number of query
+# parameters below the limit of older SQLite versions.
+ROLLUP_KEYS_PER_QUERY = 200
+
+# Names and age ranges in days of the ageing buckets of unfinished tasks.
+AGEING_BUCKETS = [("0-1d", 0, 1), ("1-7d", 1, 7), ("7-30d", 7, 30), ("30d+", 30, None)]
+
+
+def percentile_ranks(count):
+    """
+    Returns the nearest rank of every percentile among `count` ordered values.
+    """
+    return {p: max(ceil(p * count / 100), 1) for p in PERCENTILES}
+
+
+def lead_time_percentiles(tasks):
+    """
+    Returns the number of finished tasks and their lead time percentiles in
+    seconds.
+
+    The database orders the lead times and numbers them with a window function,
+    and only the rows at the percentile ranks are fetched.
+    """
+    finished = tasks.filter(completed_date__isnull=False).annotate(lead_time=LEAD_TIME)
+    count = finished.count()
+    result = {"finished": count, **{f"p{p}": None for p in PERCENTILES}}
+    if not count:
+        return result
+
+    ranks = percentile_ranks(count)
+    rows = dict(
+        finished.annotate(
+            rank=Window(RowNumber(), order_by=[F("lead_time").asc(), F("pk").asc()])
+        )
+        .filter(rank__in=set(ranks.values()))
+        .values_list("rank", "lead_time")
+    )
+    for p, rank in ranks.items():
+        result[f"p{p}"] = rows[rank].total_seconds()
+    return result
+
+
+def rollup_lead_time_percentiles(rollups):
+    """
+    Returns the number of finished tasks and their lead time percentiles from
+    daily rollups.
+
+    Rollups only count tasks per lead time range, so every percentile is the
+    upper bound of its range in seconds, or None beyond the last range.
+    """
+    buckets = (
+        rollups.values_list("lead_time_bucket")
+        .annotate(finished=Sum("finished"))
+        .order_by("lead_time_bucket")
+    )
+    buckets = list(buckets)
+    count = sum(finished for _, finished in buckets)
+    result = {"finished": count, **{f"p{p}": None for p in PERCENTILES}}
+    if not count:
+        return result
+
+    ranks = percentile_ranks(count)
+    cumulative = 0
+    for bucket, finished in buckets:
+        cumulative += finished
+        for p, rank in list(ranks.items()):
+            if rank <= cumulative:
+                if bucket < len(LEAD_TIME_BUCKETS):
+                    result[f"p{p}"] = LEAD_TIME_BUCKETS[bucket].total_seconds()
+                del ranks[p]
+    return result
+
+
+def throughput(tasks, period):
+    """
+    Returns the number of tasks finished per `day` or `week` (starting Monday).
+    """
+    rows = (
+        tasks.filter(completed_date__isnull=False)
+        .annotate(
+            period=Trunc("completed_date", period, output_field=models.DateField())
+        )
+        .values_list("period")
+        .annotate(finished=Count("pk"))
+        .order_by("period")
+    )
+    return [{"period": day.isoformat(), "finished": count} for day, count in rows]
+
+
+def rollup_throughput(rollups, period):
+    """
+    Returns the number of tasks finished per `day` or `week` from daily rollups.
+    """
+    rows = (
+        rollups.annotate(period=Trunc("day", period, output_field=models.DateField()))
+        .values_list("period")
+        .annotate(finished=Sum("finished"))
+        .order_by("period")
+    )
+    return [{"period": day.isoformat(), "finished": count} for day, count in rows]
+
+
+def ageing(tasks, now):
+    """
+    Returns the number of unfinished tasks per age bucket, from one aggregate.
+    """
+    buckets = {}
+    for name, newest, oldest in AGEING_BUCKETS:
+        age = Q(creation_date__lte=now - timedelta(days=newest))
+        if oldest is not None:
+            age &= Q(creation_date__gt=now - timedelta(days=oldest))
+        buckets[name] = Count("pk", filter=age)
+    return tasks.exclude(status=Task.StatusChoice.FINISHED).aggregate(**buckets)
+
+
+def lead_time_bucket():
+    """
+    Returns an expression of the index of the task lead time range.
+    """
+    return models.Case(
+        *(
+            models.When(lead_time__lt=bound, then=Value(index))
+            for index, bound in enumerate(LEAD_TIME_BUCKETS)
+        ),
+        default=Value(len(LEAD_TIME_BUCKETS)),
+        output_field=models.PositiveSmallIntegerField(),
+    )
+
+
+def refresh_rollups(full=False, recent_days=2):
+    """
+    Recomputes the daily rollups and returns the number of rows written.
+
+    An incremental refresh only recomputes the last `recent_days` days and the
+    days of tasks changed since the previous refresh started. Deleting finished
+    tasks does not mark their day as changed, so deletions of older tasks are
+    applied by the next full refresh. Rollups of deleted cases and users are
+    deleted with them.
+
+    The cached responses of the users whose rollups were rewritten are
+    invalidated, so rollup analytics show the refresh at once.
+    """
+    started = timezone.now()
+    tasks = Task.objects.filter(completed_date__isnull=False)
+    rollups = TaskDailyRollup.objects.all()
+
+    previous = rollups.aggregate(refreshed=Max("refreshed_date"))["refreshed"]
+    if not full and previous is not None:
+        changed_days = set(
+            tasks.filter(last_updated_date__gte=previous)
+            .annotate(day=TruncDate("completed_date"))
+            .values_list("day", flat=True)
+            .distinct()
+        )
+        start = (started - timedelta(days=recent_days)).date()
+        tasks = tasks.filter(
+            Q(completed_date__date__gte=start)
+            | Q(completed_date__date__in=changed_days)
+        )
+        rollups = rollups.filter(Q(day__gte=start) | Q(day__in=changed_days))
+
+    with transaction.atomic():
+        user_ids = set(rollups.values_list("user_id", flat=True).distinct())
+        rollups.delete()
+        created = TaskDailyRollup.objects.bulk_create(
+            (
+                TaskDailyRollup(refreshed_date=started, **row)
+                for row in rollup_rows(tasks).iterator()
+            ),
+            batch_size=1000,
+        )
+        invalidate_users(user_ids | {rollup.user_id for rollup in created})
+    return len(created)
+
+
+def rollup_rows(tasks):
+    """
+    Returns the rollup values of the finished tasks, one row per user, case,
+    day and lead time range.
+    """
+    return (
+        tasks.filter(completed_date__isnull=False)
+        .annotate(
+            lead_time=LEAD_TIME,
+            day=TruncDate("completed_date"),
+            lead_time_bucket=lead_time_bucket(),
+        )
+        .values("user_id", "case_id", "day", "lead_time_bucket")
+        .annotate(finished=Count("pk"))
+        .order_by()
+    )
+
+
+def rollups_by_key(keys):
+    """
+    Returns the primary key, unique key and number of finished tasks of the
+    rollups with the given (user_id, case_id, day, lead_time_bucket) keys.
+
+    The keys are matched with one row value `IN` list, which the unique index
+    of the rollups serves, instead of an `OR` of conditions per key.
+    """
+    connection = connections[TaskDailyRollup.objects.db]
+    columns = ", ".join(
+        connection.ops.quote_name(column)
+        for column in ("user_id", "case_id", "day", "lead_time_bucket")
+    )
+    params = []
+    for user_id, case_id, day, bucket in keys:
+        params += [user_id, case_id, connection.ops.adapt_datefield_value(day), bucket]
+    values = ", ".join(["(%s, %s, %s, %s)"] * len(keys))
+    return (
+        TaskDailyRollup.objects.select_for_update()
+        .extra(where=[f"({columns}) IN ({values})"], params=params)
+        .values_list("pk", "user_id", "case_id", "day", "lead_time_bucket", "finished")
+    )
+
+
+def adjust_rollups(tasks, sign):
+    """
+    Adds (`sign` 1) or removes (`sign` -1) finished tasks to or from the daily
+    rollups, e.g. when they are archived or restored.
+
+    The affected rollups are looked up by their unique key, a few hundred per
+    query, and written back in bulk. Their refresh date is kept, so the next
+    incremental refresh still recomputes every task changed since the previous
+    one. Nothing is done before the first refresh.
+    """
+    refreshed = TaskDailyRollup.objects.aggregate(refreshed=Max("refreshed_date"))[
+        "refreshed"
+    ]
+    if refreshed is None:
+        return
+    changes = {}
+    for row in rollup_rows(tasks):
+        finished = row.pop("finished")
+        changes[tuple(row.values())] = finished * sign
+    updated = defaultdict(list)
+    keys = list(changes)
+    for start in range(0, len(keys), ROLLUP_KEYS_PER_QUERY):
+        chunk = keys[start : start + ROLLUP_KEYS_PER_QUERY]
+        for pk, *key, finished in rollups_by_key(chunk):
+            updated[max(finished + changes.pop(tuple(key)), 0)].append(pk)
+    # Rollups mostly change to a handful of values, zero being the most common.
+    for finished, pks in updated.items():
+        rollups = TaskDailyRollup.objects.filter(pk__in=pks)
+        if finished:
+            rollups.update(finished=finished)
+        else:
+            rollups.delete()
+    TaskDailyRollup.objects.bulk_create(
+        (
+            TaskDailyRollup(
+                user_id=user_id,
+                case_id=case_id,
+                day=day,
+                lead_time_bucket=bucket,
+                finished=finished,
+                refreshed_date=refreshed,
+            )
+            for (user_id, case_id, day, bucket), finished in changes.items()
+            if finished > 0
+        ),
+        batch_size=1000,
+    )
@@ -0,0 +1,214 @@
+"""
+Archival of finished tasks and closed cases, keeping the task and case tables
+small for the per-user queries of the API.
+
+Finished tasks completed before a cutoff are moved to `ArchivedTask`, and
+closed cases without unfinished tasks are moved to `ArchivedCase` together with
+their tasks. Rows are moved in batches, each in its own transaction, keeping
+their primary keys.
+
+For the rest of the application an archived task is a deleted one: syncing
+clients get a tombstone, the task counters and daily rollups no longer count
+it and the cached responses of its owner are invalidated. Restoring moves the
+rows back, counts them again and marks the tasks as updated, so syncing
+clients fetch them again.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from .analytics import adjust_rollups
+from .deletion import delete_task_rows
+from .models import ArchivedCase, ArchivedTask, Case, Task
+from .signals import tasks_changed
+
+TASK_FIELDS = [
+    "id",
+    "user_id",
+    "case_id",
+    "title",
+    "description",
+    "status",
+    "creation_date",
+    "last_updated_date",
+    "completed_date",
+]
+CASE_FIELDS = ["id", "user_id", "title", "status", "last_updated_date"]
+
+
+def archivable_tasks(cutoff):
+    """
+    Returns the finished tasks completed before the cutoff.
+    """
+    return Task.objects.filter(
+        status=Task.StatusChoice.FINISHED, completed_date__lt=cutoff
+    )
+
+
+def archivable_cases(cutoff):
+    """
+    Returns the closed cases unchanged since the cutoff without unfinished
+    tasks.
+    """
+    return Case.objects.filter(
+        status=Case.StatusChoice.CLOSED, last_updated_date__lt=cutoff
+    ).exclude(
+        tasks__status__in=[Task.StatusChoice.CREATED, Task.StatusChoice.IN_PROGRESS]
+    )
+
+
+def move_tasks(tasks, now):
+    """
+    Moves the tasks to the archive and returns their values.
+
+    Must run in a transaction. The task rows are deleted with one statement,
+    without the per-task delete signals, so tombstones, counters and rollups
+    are maintained here in bulk and the caller sends `tasks_changed` with the
+    owners for the cached responses.
+
+    The cases of the tasks are touched, as their nested tasks changed, but not
+    recounted: only the archived tasks are subtracted from their counters.
+    """
+    rows = list(tasks.select_for_update().values(*TASK_FIELDS))
+    if not rows:
+        return rows
+    ArchivedTask.objects.bulk_create(
+        [ArchivedTask(archived_date=now, **row) for row in rows]
+    )
+    delete_task_rows(rows, now)
+    return rows
+
+
+def archive_cases(cutoff, batch_size, progress=None):
+    """
+    Archives the closed cases unchanged since the cutoff and their tasks, and
+    returns the number of cases and tasks archived.
+    """
+    cases_archived = tasks_archived = 0
+    last = 0
+    while True:
+        with transaction.atomic():
+            now = timezone.now()
+            cases = list(
+                archivable_cases(cutoff)
+                .filter(pk__gt=last)
+                .order_by("pk")
+                .values(*CASE_FIELDS)[:batch_size]
+            )
+            if not cases:
+                break
+            last = cases[-1]["id"]
+            case_ids = [case["id"] for case in cases]
+            rows = move_tasks(Task.objects.filter(case_id__in=case_ids), now)
+            ArchivedCase.objects.bulk_create(
+                [ArchivedCase(archived_date=now, **case) for case in cases]
+            )
+            # Counters and rollups of the cases are deleted with them.
+            Case.objects.filter(pk__in=case_ids).delete()
+        tasks_changed.send(
+            sender=Task,
+            user_ids={case["user_id"] for case in cases},
+            case_ids=set(),
+        )
+        cases_archived += len(cases)
+        tasks_archived += len(rows)
+        if progress:
+            progress(cases_archived, tasks_archived)
+    return cases_archived, tasks_archived
+
+
+def archive_tasks(cutoff, batch_size, progress=None):
+    """
+    Archives the finished tasks completed before the cutoff and returns their
+    number.
+
+    Batches walk the tasks by primary key, so every batch is found with an
+    index range scan however many tasks were archived before it.
+    """
+    archived = 0
+    last = 0
+    while True:
+        with transaction.atomic():
+            now = timezone.now()
+            pks = list(
+                archivable_tasks(cutoff)
+                .filter(pk__gt=last)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            last = pks[-1]
+            rows = move_tasks(archivable_tasks(cutoff).filter(pk__in=pks), now)
+        tasks_changed.send(
+            sender=Task, user_ids={row["user_id"] for row in rows}, case_ids=set()
+        )
+        archived += len(rows)
+        if progress:
+            progress(archived)
+    return archived
+
+
+def restore_case_rows(archived_cases):
+    """
+    Moves the archived cases back to the case table and returns their values.
+    Must run in a transaction.
+    """
+    cases = list(archived_cases.select_for_update().values(*CASE_FIELDS))
+    Case.objects.bulk_create([Case(**case) for case in cases])
+    ArchivedCase.objects.filter(pk__in=[case["id"] for case in cases]).delete()
+    return cases
+
+
+def restore_task_rows(archived_tasks):
+    """
+    Moves the archived tasks back to the task table and returns their values.
+    Must run in a transaction, after restoring their cases.
+
+    Creating the tasks sets their creation date to now, so the archived one is
+    written back with a second statement.
+    """
+    rows = list(archived_tasks.select_for_update().values(*TASK_FIELDS))
+    if not rows:
+        return rows
+    tasks = Task.objects.bulk_create([Task(**row) for row in rows])
+    for task, row in zip(tasks, rows):
+        task.creation_date = row["creation_date"]
+    Task.objects.bulk_update(tasks, ["creation_date"], batch_size=1000)
+    adjust_rollups(Task.objects.filter(pk__in=[row["id"] for row in rows]), 1)
+    ArchivedTask.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+    return rows
+
+
+def restore_tasks(archived_tasks):
+    """
+    Restores the archived tasks, and their cases if they were archived too, and
+    returns the number of tasks restored.
+    """
+    with transaction.atomic():
+        case_ids = archived_tasks.values("case_id")
+        cases = restore_case_rows(ArchivedCase.objects.filter(pk__in=case_ids))
+        rows = restore_task_rows(archived_tasks)
+    tasks_changed.send(
+        sender=Task,
+        user_ids={row["user_id"] for row in rows + cases},
+        case_ids={row["case_id"] for row in rows},
+    )
+    return len(rows)
+
+
+def restore_cases(archived_cases):
+    """
+    Restores the archived cases with all their archived tasks, and returns the
+    number of cases and tasks restored.
+    """
+    with transaction.atomic():
+        cases = restore_case_rows(archived_cases)
+        case_ids = {case["id"] for case in cases}
+        rows = restore_task_rows(ArchivedTask.objects.filter(case_id__in=case_ids))
+    tasks_changed.send(
+        sender=Task,
+        user_ids={row["user_id"] for row in rows + cases},
+        case_ids=case_ids,
+    )
+    return len(cases), len(rows)
@@ -0,0 +1,214 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, filters, status
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from .authentication import CachedJWTAuthentication
+from .filters import TaskFilterBackend
+from .models import Case, Task
+from .pagination import KeysetPagination
+from .serializers import CaseSerializer, TaskSerializer
+from .views import CaseQuerysetMixin, parse_pk
+
+
+class AsyncAPIView(View):
+    """
+    Base view for the async-native endpoints.
+
+    Requests are handled on the event loop: querysets are evaluated with the
+    async ORM, and sync code that touches the database (authentication,
+    `save()` with its signal receivers) is bridged with `sync_to_async`, so a
+    request only occupies a thread while it runs a query. Responses are
+    rendered with the same JSON renderer and exception handler as the sync
+    views, so both return the same bodies.
+
+    The async views do not use the response cache or conditional requests.
+    """
+
+    authentication_class = CachedJWTAuthentication
+    pagination_class = KeysetPagination
+    filter_backends = ()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """
+        Returns the view exempt from CSRF checks, as `APIView.as_view` does:
+        requests authenticate with a bearer token, not a session cookie.
+        """
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request, parsers=[JSONParser()])
+        try:
+            await self.authenticate(self.request)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            return await handler(self.request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        """
+        Handles authenticating the request user from the JWT.
+        """
+        authentication = self.authentication_class()
+        result = await sync_to_async(authentication.authenticate)(request._request)
+        if result is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = result
+
+    def handle_exception(self, exc):
+        """
+        Returns the error response of the sync views for the exception.
+        """
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.auth_header = self.authentication_class().authenticate_header(
+                self.request
+            )
+        response = exception_handler(exc, {"view": self, "request": self.request})
+        if response is None:
+            raise exc
+        headers = {
+            name: value for name, value in response.items() if name != "Content-Type"
+        }
+        return self.render(response.data, response.status_code, headers)
+
+    def render(self, data, status_code=status.HTTP_200_OK, headers=None):
+        """
+        Returns a JSON response with the data.
+        """
+        return HttpResponse(
+            JSONRenderer().render(data),
+            status=status_code,
+            headers=headers,
+            content_type="application/json",
+        )
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    async def get_object(self, queryset, pk):
+        """
+        Returns the object with the primary key, or raises 404.
+        """
+        try:
+            return await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            raise Http404
+
+    async def list(self, queryset, serializer_class):
+        """
+        Returns a page of the queryset, fetched with async iteration.
+        """
+        paginator = self.pagination_class()
+        page_queryset = paginator.get_page_queryset(queryset, self.request, self)
+        page = paginator.set_page([obj async for obj in page_queryset])
+        serializer = serializer_class(page, many=True)
+        return self.render(paginator.get_paginated_response(serializer.data).data)
+
+    async def create(self, serializer, **kwargs):
+        """
+        Returns the response of saving a validated serializer.
+        """
+        serializer.is_valid(raise_exception=True)
+        data = await sync_to_async(self.perform_create)(serializer, **kwargs)
+        return self.render(data, status.HTTP_201_CREATED)
+
+    def perform_create(self, serializer, **kwargs):
+        """
+        Handles saving the object and serializing it, which may load relations.
+        """
+        serializer.save(**kwargs)
+        return serializer.data
+
+
+class AsyncTaskListCreateView(AsyncAPIView):
+    """
+    Async view to list all tasks or create a new task item.
+
+    - `GET`: Returns a page of tasks, with the filters and ordering of
+      `TaskListCreateAPIView`.
+    - `POST`: Creates a new task item.
+    """
+
+    filter_backends = [TaskFilterBackend, filters.OrderingFilter]
+    ordering_fields = ["creation_date", "last_updated_date"]
+    ordering = ("creation_date", "pk")
+
+    def get_queryset(self):
+        """
+        Handles filtering tasks for given user.
+        """
+        return Task.objects.filter(user=self.request.user)
+
+    async def get(self, request):
+        return await self.list(
+            self.filter_queryset(self.get_queryset()), TaskSerializer
+        )
+
+    async def post(self, request):
+        # Load the case up front, so validation does not run a sync query.
+        case_pk = (
+            parse_pk(request.data.get("case"))
+            if isinstance(request.data, dict)
+            else None
+        )
+        cases = {case.pk: case async for case in Case.objects.filter(pk=case_pk)}
+        serializer = TaskSerializer(data=request.data, context={"cases": cases})
+        return await self.create(serializer, user=request.user)
+
+
+class AsyncTaskRetrieveView(AsyncAPIView):
+    """
+    Async view to retrieve a task item.
+
+    - `GET`: Returns a single task item.
+    """
+
+    async def get(self, request, pk):
+        task = await self.get_object(Task.objects.filter(user=request.user), pk)
+        return self.render(TaskSerializer(task).data)
+
+
+class AsyncCaseListCreateView(CaseQuerysetMixin, AsyncAPIView):
+    """
+    Async view to list all cases or create a new case item.
+
+    - `GET`: Returns a page of cases, ordered by primary key. Supports
+      `?tasks=summary`.
+    - `POST`: Creates a new case item.
+    """
+
+    ordering = ("pk",)
+
+    async def get(self, request):
+        return await self.list(self.get_queryset(), self.get_serializer_class())
+
+    async def post(self, request):
+        serializer = CaseSerializer(data=request.data)
+        return await self.create(serializer, user=request.user)
+
+
+class AsyncCaseRetrieveView(CaseQuerysetMixin, AsyncAPIView):
+    """
+    Async view to retrieve a case item.
+
+    - `GET`: Returns a single case item. Supports `?tasks=summary`.
+    """
+
+    async def get(self, request, pk):
+        case = await self.get_object(self.get_queryset(), pk)
+        return self.render(self.get_serializer_class()(case).data)
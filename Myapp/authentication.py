@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_KEY = "todo:auth:user:{user_id}"
+# Fields of the cached user, the others are loaded from the database if read.
+USER_FIELDS = ("id", "username", "is_active", "is_staff", "is_superuser")
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drops the cached user, e.g. after they were deactivated or changed password.
+    """
+    cache.delete(USER_KEY.format(user_id=user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that caches the authenticated user.
+
+    The token is still decoded and validated on every request; only the user
+    SELECT is replaced by a cache read, for at most `AUTH_USER_CACHE_TIMEOUT`
+    seconds. Saving or deleting a user drops their cache entry (see
+    `Myapp.signals`), so deactivation and password changes apply at once. This
+    only holds when all processes share the cache, so users are only cached
+    with `SHARED_CACHE`. Queryset updates of users bypass this and apply when
+    the entry expires.
+
+    Only `USER_FIELDS` are cached, and a hash of the password when tokens are
+    revoked on password changes, never the password hash itself.
+    """
+
+    def get_user(self, validated_token):
+        timeout = settings.AUTH_USER_CACHE_TIMEOUT
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not timeout or not settings.SHARED_CACHE or user_id is None:
+            return super().get_user(validated_token)
+
+        key = USER_KEY.format(user_id=user_id)
+        cached = cache.get(key)
+        if cached is None:
+            user = super().get_user(validated_token)
+            cached = {name: getattr(user, name) for name in USER_FIELDS}
+            if api_settings.CHECK_REVOKE_TOKEN:
+                cached["password_hash"] = get_md5_hash_password(user.password)
+            cache.set(key, cached, timeout)
+            return user
+
+        if not cached["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+            != cached["password_hash"]
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        # Deferred fields are read in the order of the model fields.
+        fields = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname in USER_FIELDS
+        ]
+        return self.user_model.from_db(
+            self.user_model.objects.db, fields, [cached[name] for name in fields]
+        )
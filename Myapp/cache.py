@@ -0,0 +1,93 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = "todo:user:{user_id}:version"
+RESPONSE_KEY = "todo:response:{user_id}:{version}:{url}"
+STATS_KEY = "todo:stats:{name}"
+
+
+def get_user_version(user_id):
+    """
+    Returns the current cache version of the user, creating one if needed.
+
+    Every cached response of a user is stored under their current version, so
+    replacing the version invalidates all of them at once.
+    """
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user(user_id):
+    """
+    Drops every cached response of the user.
+    """
+    cache.delete(VERSION_KEY.format(user_id=user_id))
+
+
+def increment(name):
+    """
+    Increments a shared cache statistics counter.
+    """
+    key = STATS_KEY.format(name=name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_stats():
+    """
+    Returns the response cache hit and miss counters and the hit ratio.
+    """
+    hits = cache.get(STATS_KEY.format(name="hits"), 0)
+    misses = cache.get(STATS_KEY.format(name="misses"), 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else 0}
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(name=name) for name in ("hits", "misses")])
+
+
+class CachedResponseMixin:
+    """
+    Caches successful `GET` responses of a view per user.
+
+    Responses are keyed by the user, their cache version and the full request
+    URL. Saving or deleting one of the user's tasks or cases replaces the
+    version (see `Myapp.signals`), so a stale response is never served. This
+    only holds when all processes share the cache, so responses are only
+    cached with `SHARED_CACHE`. The timeout comes from
+    `RESPONSE_CACHE_TIMEOUT`; zero disables the cache.
+    """
+
+    def get(self, request, *args, **kwargs):
+        timeout = settings.RESPONSE_CACHE_TIMEOUT
+        if not timeout or not settings.SHARED_CACHE:
+            return super().get(request, *args, **kwargs)
+
+        url = md5(request.build_absolute_uri().encode("utf-8")).hexdigest()
+        key = RESPONSE_KEY.format(
+            user_id=request.user.pk,
+            version=get_user_version(request.user.pk),
+            url=url,
+        )
+        data = cache.get(key)
+        if data is not None:
+            increment("hits")
+            return Response(data)
+
+        increment("misses")
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout)
+        return response
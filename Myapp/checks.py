@@ -0,0 +1,176 @@
+import logging
+
+from django.conf import settings
+from django.core import checks
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .search import FTS_TABLE, has_fts_index
+
+logger = logging.getLogger(__name__)
+
+# Triggers keeping the SQLite full-text index in sync, see migration 0008.
+FTS_TRIGGERS = {
+    "Myapp_task_fts_insert",
+    "Myapp_task_fts_update",
+    "Myapp_task_fts_delete",
+    "Myapp_case_fts_update",
+}
+
+# Values SQLite reports for the `synchronous` levels.
+SYNCHRONOUS_LEVELS = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+
+# Aliases of the databases whose first connection of the process was verified.
+verified_databases = set()
+
+
+def expected_pragmas():
+    """
+    Returns the pragma values the SQLite profile sets, as SQLite reports them.
+    """
+    pragmas = {
+        name: str(value).lower() for name, value in settings.SQLITE_PRAGMAS.items()
+    }
+    if "synchronous" in pragmas:
+        level = str(settings.SQLITE_PRAGMAS["synchronous"]).upper()
+        pragmas["synchronous"] = str(SYNCHRONOUS_LEVELS.get(level, level))
+    pragmas["busy_timeout"] = str(int(settings.SQLITE_BUSY_TIMEOUT * 1000))
+    return pragmas
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warns about cache features that are enabled but ignored, or limited to one
+    worker, because the worker processes do not share the cache.
+    """
+    if settings.SHARED_CACHE:
+        return []
+    hint = "Set REDIS_URL, or SHARED_CACHE=True with a single worker process."
+    issues = [
+        checks.Warning(
+            f"{name} is ignored without a shared cache.", hint=hint, id="Myapp.W003"
+        )
+        for name in ("RESPONSE_CACHE_TIMEOUT", "AUTH_USER_CACHE_TIMEOUT")
+        if getattr(settings, name)
+    ]
+    if settings.METRICS_ENABLED:
+        issues.append(
+            checks.Warning(
+                "Without a shared cache, the metrics endpoint only reports the "
+                "requests of the worker serving it.",
+                hint=hint,
+                id="Myapp.W004",
+            )
+        )
+    return issues
+
+
+def inactive_pragmas(connection, cursor):
+    """
+    Returns the pragmas of the SQLite profile that are not active on the
+    connection, as `(name, actual, expected)` tuples.
+    """
+    in_memory = connection.is_in_memory_db()
+    inactive = []
+    for name, expected in expected_pragmas().items():
+        # In-memory databases have no journal file to map or share.
+        if in_memory and name in ("journal_mode", "mmap_size"):
+            continue
+        cursor.execute(f"PRAGMA {name}")
+        row = cursor.fetchone()
+        actual = str(row[0]).lower() if row else None
+        if actual != expected:
+            inactive.append((name, actual, expected))
+    return inactive
+
+
+@checks.register(checks.Tags.database)
+def check_sqlite_pragmas(app_configs, databases=None, **kwargs):
+    """
+    Verifies that the SQLite profile is active on new database connections.
+
+    Runs when `SQLITE_TUNING` is enabled, on `migrate`, on the test runner and
+    on `manage.py check --database default`. Servers run no database checks,
+    see `verify_sqlite_pragmas`.
+    """
+    if not settings.SQLITE_TUNING or not databases:
+        return []
+
+    issues = []
+    for alias in databases:
+        connection = connections[alias]
+        if connection.vendor != "sqlite":
+            continue
+        with connection.cursor() as cursor:
+            inactive = inactive_pragmas(connection, cursor)
+        for name, actual, expected in inactive:
+            issues.append(
+                checks.Warning(
+                    f"SQLite pragma {name} of database {alias!r} is "
+                    f"{actual}, expected {expected}.",
+                    hint="Check the DATABASES OPTIONS set by SQLITE_TUNING.",
+                    id="Myapp.W001",
+                )
+            )
+    return issues
+
+
+@receiver(connection_created)
+def verify_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Handles logging a warning when the SQLite profile is not active on the
+    first connection the process opens to a database, e.g. when a server
+    starts.
+    """
+    if (
+        not settings.SQLITE_TUNING
+        or connection.vendor != "sqlite"
+        or connection.alias in verified_databases
+    ):
+        return
+    verified_databases.add(connection.alias)
+    # A cursor of the driver, so the pragmas are not counted as queries.
+    cursor = connection.connection.cursor()
+    try:
+        inactive = inactive_pragmas(connection, cursor)
+    finally:
+        cursor.close()
+    for name, actual, expected in inactive:
+        logger.warning(
+            "SQLite pragma %s of database %r is %s, expected %s. Check the "
+            "DATABASES OPTIONS set by SQLITE_TUNING.",
+            name,
+            connection.alias,
+            actual,
+            expected,
+        )
+
+
+@checks.register(checks.Tags.database)
+def check_search_triggers(app_configs, databases=None, **kwargs):
+    """
+    Verifies that the triggers of the SQLite full-text index exist.
+
+    SQLite migrations that rebuild the task or case table drop its triggers,
+    and such migrations must create them again.
+    """
+    issues = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if not has_fts_index(connection):
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            missing = FTS_TRIGGERS - {name for (name,) in cursor.fetchall()}
+        if missing:
+            issues.append(
+                checks.Warning(
+                    f"Triggers {', '.join(sorted(missing))} of the {FTS_TABLE} "
+                    f"full-text index of database {alias!r} are missing.",
+                    hint="Recreate them as migration 0008_task_search_index does.",
+                    id="Myapp.W002",
+                )
+            )
+    return issues
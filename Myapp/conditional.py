@@ -0,0 +1,70 @@
+import time
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Adds `ETag` and `Last-Modified` headers to `GET` responses of a view and
+    answers matching `If-None-Match` / `If-Modified-Since` requests with 304.
+
+    The validators come from one aggregate over the rows the response is built
+    from: the latest `last_updated_date` and the number of rows. The count
+    changes when a row is deleted, the timestamp when one is created or saved,
+    so a 304 can be served without loading or serializing any object.
+
+    Only the ETag covers deletions, so list responses carry no `Last-Modified`.
+    `Last-Modified` has a resolution of one second, so single objects only
+    carry it once that second has passed and later saves fall in a later one.
+    """
+
+    def get_conditional_queryset(self):
+        """
+        Returns the queryset whose rows the response is built from.
+        """
+        return self.filter_queryset(self.get_queryset())
+
+    def get_validators(self):
+        """
+        Returns the ETag and the last modification timestamp of the response,
+        `None` when the response has no reliable one.
+        """
+        queryset = self.get_conditional_queryset().order_by()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        single_object = lookup_url_kwarg in self.kwargs
+        if single_object:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        aggregate = queryset.aggregate(
+            last_modified=Max("last_updated_date"), count=Count("pk")
+        )
+        last_modified = aggregate["last_modified"]
+        fingerprint = "|".join(
+            [
+                str(self.request.user.pk),
+                self.request.get_full_path(),
+                last_modified.isoformat() if last_modified else "",
+                str(aggregate["count"]),
+            ]
+        )
+        etag = quote_etag(md5(fingerprint.encode("utf-8")).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        if not single_object or timestamp is None or timestamp >= int(time.time()):
+            timestamp = None
+        return etag, timestamp
+
+    def get(self, request, *args, **kwargs):
+        etag, timestamp = self.get_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            return response
+
+        response = super().get(request, *args, **kwargs)
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
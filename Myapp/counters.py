@@ -0,0 +1,97 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import Task, TaskCounter
+
+
+def add_to_counter(user_id, case_id, status, delta):
+    """
+    Adds `delta` to the number of tasks of the user in the case with the status.
+
+    The counter row is updated in place with `count + delta`, so concurrent
+    writers do not overwrite each other, and created on first use.
+    """
+    counter = TaskCounter.objects.filter(
+        user_id=user_id, case_id=case_id, status=status
+    )
+    if counter.update(count=F("count") + delta):
+        return
+    try:
+        with transaction.atomic():
+            TaskCounter.objects.create(
+                user_id=user_id, case_id=case_id, status=status, count=delta
+            )
+    except IntegrityError:
+        # Created by a concurrent writer in the meantime.
+        counter.update(count=F("count") + delta)
+
+
+def count_tasks(tasks):
+    """
+    Returns the number of tasks per (user_id, case_id, status), from one query.
+    """
+    rows = (
+        tasks.values_list("user_id", "case_id", "status")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    return {
+        (user_id, case_id, status): count for user_id, case_id, status, count in rows
+    }
+
+
+def write_counters(counts, counters):
+    """
+    Replaces the counters in the queryset with the given counts.
+    """
+    with transaction.atomic():
+        counters.delete()
+        TaskCounter.objects.bulk_create(
+            (
+                TaskCounter(
+                    user_id=user_id, case_id=case_id, status=status, count=count
+                )
+                for (user_id, case_id, status), count in counts.items()
+            ),
+            batch_size=1000,
+        )
+
+
+def recount_cases(case_ids):
+    """
+    Recomputes the counters of the cases from their tasks.
+
+    Used after set-based task writes, which change any number of tasks at once.
+    """
+    case_ids = {pk for pk in case_ids if pk is not None}
+    if case_ids:
+        write_counters(
+            count_tasks(Task.objects.filter(case_id__in=case_ids)),
+            TaskCounter.objects.filter(case_id__in=case_ids),
+        )
+
+
+def find_drift():
+    """
+    Returns the counters that differ from the tasks, as a mapping of
+    (user_id, case_id, status) to (counted, actual) numbers of tasks.
+    """
+    actual = count_tasks(Task.objects.all())
+    counted = {
+        (user_id, case_id, status): count
+        for user_id, case_id, status, count in TaskCounter.objects.values_list(
+            "user_id", "case_id", "status", "count"
+        )
+    }
+    return {
+        key: (counted.get(key, 0), actual.get(key, 0))
+        for key in counted.keys() | actual.keys()
+        if counted.get(key, 0) != actual.get(key, 0)
+    }
+
+
+def rebuild_counters():
+    """
+    Recomputes all counters from the tasks.
+    """
+    write_counters(count_tasks(Task.objects.all()), TaskCounter.objects.all())
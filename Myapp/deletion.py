@@ -0,0 +1,105 @@
+"""
+Deletion of tasks in bulk, without loading them as model instances.
+
+Deleting a case through the ORM cascade loads every task of the case and
+deletes them all in the transaction that deletes the case. `delete_case`
+deletes the tasks first, in batches of bounded size with one transaction
+each, and then the case, so big cases neither hold a long transaction nor
+load all their tasks in memory.
+
+Task rows are deleted with one statement per batch, without the per-task
+delete signals, so the derived data they maintain (tombstones, counters,
+daily rollups, case timestamps and cached responses) is maintained here in
+bulk. After every batch the remaining tasks, their counters and rollups are
+consistent, so an interrupted deletion leaves a smaller but valid case.
+"""
+
+from collections import Counter
+
+from django.db import connections, transaction
+from django.db.models import DateTimeField, Value
+from django.utils import timezone
+
+from .analytics import adjust_rollups
+from .counters import add_to_counter
+from .models import Task, TaskTombstone
+from .signals import tasks_changed, touch_cases
+
+
+def record_tombstones(tasks, now):
+    """
+    Records tombstones for the tasks with one `INSERT ... SELECT`, without
+    fetching them.
+    """
+    connection = connections[tasks.db]
+    quote_name = connection.ops.quote_name
+    rows = (
+        tasks.order_by()
+        .annotate(deleted=Value(now, output_field=DateTimeField()))
+        .values_list("pk", "user_id", "deleted")
+    )
+    select, params = rows.query.get_compiler(tasks.db).as_sql()
+    columns = ", ".join(
+        quote_name(TaskTombstone._meta.get_field(name).column)
+        for name in ("task_id", "user", "deleted_date")
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote_name(TaskTombstone._meta.db_table)} ({columns}) "
+            f"{select}",
+            params,
+        )
+
+
+def delete_task_rows(rows, now):
+    """
+    Deletes the tasks of the rows, which hold their `id`, `user_id`, `case_id`
+    and `status`, with one statement, and records their tombstones.
+
+    Must run in a transaction. Rollups and counters no longer count the tasks
+    and their cases are touched; the caller sends `tasks_changed` with the
+    owners for the cached responses.
+    """
+    if not rows:
+        return
+    tasks = Task.objects.filter(pk__in=[row["id"] for row in rows])
+    adjust_rollups(tasks, -1)
+    for key, count in Counter(
+        (row["user_id"], row["case_id"], row["status"]) for row in rows
+    ).items():
+        add_to_counter(*key, -count)
+    touch_cases({row["case_id"] for row in rows})
+    record_tombstones(tasks, now)
+    # No model references tasks, so nothing needs to be collected first.
+    tasks._raw_delete(tasks.db)
+
+
+def delete_case(case, batch_size, progress=None):
+    """
+    Deletes the case and its tasks, in batches of `batch_size` tasks with one
+    transaction each, and returns the number of tasks deleted.
+
+    The last batch is deleted together with the case, so tasks added to the
+    case in the meantime are deleted with it by the ORM cascade.
+    """
+    deleted = 0
+    last = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Task.objects.filter(case=case, pk__gt=last)
+                .select_for_update()
+                .order_by("pk")
+                .values("id", "user_id", "case_id", "status")[:batch_size]
+            )
+            delete_task_rows(rows, timezone.now())
+            deleted += len(rows)
+            if len(rows) < batch_size:
+                _, cascaded = case.delete()
+                return deleted + cascaded.get(Task._meta.label, 0)
+        last = rows[-1]["id"]
+        tasks_changed.send(
+            sender=Task, user_ids={row["user_id"] for row in rows}, case_ids=set()
+        )
+        if progress:
+            progress(deleted)
@@ -0,0 +1,81 @@
+"""
+Streaming export of tasks as NDJSON or CSV.
+
+Tasks are read with a server-side cursor (`iterator`) and rendered one chunk
+of rows at a time, so memory use does not depend on the number of tasks.
+"""
+
+import csv
+import json
+
+from django.conf import settings
+
+from .serializers import TaskSerializer
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Case columns added to every task when the export is grouped by case.
+CASE_FIELDS = ["case_title", "case_status"]
+
+
+class Echo:
+    """
+    File-like object that returns what is written, for `csv.writer`.
+    """
+
+    def write(self, value):
+        return value
+
+
+def task_rows(tasks, group_by_case=False):
+    """
+    Yields the API representation of every task, fetching them in chunks.
+
+    Grouped exports are ordered by case, and every row also holds the case
+    title and status, so consumers can group consecutive rows.
+    """
+    if group_by_case:
+        tasks = tasks.select_related("case").order_by("case_id", "creation_date", "pk")
+    else:
+        tasks = tasks.order_by("creation_date", "pk")
+    serializer = TaskSerializer()
+    for task in tasks.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        row = serializer.to_representation(task)
+        if group_by_case:
+            row["case_title"] = task.case.title
+            row["case_status"] = task.case.status
+        yield row
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def csv_lines(rows, group_by_case=False):
+    fields = list(TaskSerializer.Meta.fields)
+    if group_by_case:
+        fields += CASE_FIELDS
+    writer = csv.DictWriter(Echo(), fieldnames=fields)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_tasks(tasks, output, group_by_case=False):
+    """
+    Yields the export of the tasks in chunks of `EXPORT_CHUNK_SIZE` rows.
+    """
+    rows = task_rows(tasks, group_by_case)
+    if output == "csv":
+        lines = csv_lines(rows, group_by_case)
+    else:
+        lines = ndjson_lines(rows)
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= settings.EXPORT_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,77 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Task
+
+DATE_INPUT_FORMATS = ["iso-8601", "%Y-%m-%d"]
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """
+    Validates the query parameters accepted by the task list.
+
+    Fields:
+    - status: One or more task statuses (`?status=CREATED&status=IN_PROGRESS`).
+    - case: Primary key of the case the tasks belong to.
+    - created_after / created_before: Range of the task creation date.
+    - completed_after / completed_before: Range of the task completion date.
+    """
+
+    status = serializers.MultipleChoiceField(
+        choices=Task.StatusChoice.choices, required=False
+    )
+    case = serializers.IntegerField(required=False, min_value=1)
+    created_after = serializers.DateTimeField(
+        required=False, input_formats=DATE_INPUT_FORMATS
+    )
+    created_before = serializers.DateTimeField(
+        required=False, input_formats=DATE_INPUT_FORMATS
+    )
+    completed_after = serializers.DateTimeField(
+        required=False, input_formats=DATE_INPUT_FORMATS
+    )
+    completed_before = serializers.DateTimeField(
+        required=False, input_formats=DATE_INPUT_FORMATS
+    )
+
+    def validate(self, attrs):
+        """
+        Ensures that every date range starts before it ends.
+        """
+        for prefix in ("created", "completed"):
+            start = attrs.get(f"{prefix}_after")
+            end = attrs.get(f"{prefix}_before")
+            if start and end and start > end:
+                raise serializers.ValidationError(
+                    {f"{prefix}_after": _("The range start must precede its end.")}
+                )
+        return attrs
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Pushes the task list query parameters down into the SQL query.
+
+    Invalid parameters are rejected with a 400 response instead of being ignored.
+    """
+
+    lookups = {
+        "case": "case_id",
+        "created_after": "creation_date__gte",
+        "created_before": "creation_date__lt",
+        "completed_after": "completed_date__gte",
+        "completed_before": "completed_date__lt",
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = TaskFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = {
+            self.lookups[name]: value
+            for name, value in params.validated_data.items()
+            if name in self.lookups
+        }
+        if params.validated_data.get("status"):
+            filters["status__in"] = params.validated_data["status"]
+        return queryset.filter(**filters)
@@ -0,0 +1,224 @@
+"""
+Bulk import of tasks from NDJSON or CSV, e.g. when migrating from another
+tracker.
+
+Rows are read from a text stream one at a time and written in batches. Every
+batch resolves the cases it references by title with one query, creates the
+missing ones, validates its rows with `TaskSerializer` and inserts the valid
+tasks with `bulk_create` in its own transaction. Invalid rows are reported and
+skipped, and a failing batch does not undo the batches written before it.
+"""
+
+import csv
+import json
+import time
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from .models import Case, Task
+from .serializers import TaskSerializer
+from .signals import tasks_changed
+
+INPUT_FORMATS = ["ndjson", "csv"]
+CASE_TITLE_MAX_LENGTH = Case._meta.get_field("title").max_length
+CASE_TITLE_ERROR = _("Expected a case title of at most %(limit)s characters.")
+
+
+def ndjson_rows(stream):
+    """
+    Yields the line number, the object and the parse errors of every
+    non-blank line.
+    """
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield line_number, None, {"non_field_errors": [str(error)]}
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, {"non_field_errors": [_("Expected an object.")]}
+            continue
+        yield line_number, row, None
+
+
+def csv_rows(stream):
+    """
+    Yields the line number and the fields of every row, using the header row as
+    field names.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row, None
+
+
+def read_rows(stream, input_format):
+    if input_format == "csv":
+        return csv_rows(stream)
+    return ndjson_rows(stream)
+
+
+def guess_format(name):
+    """
+    Returns the input format matching the extension of a file name, or None.
+    """
+    if name.lower().endswith(".csv"):
+        return "csv"
+    if name.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def case_title(row):
+    """
+    Returns the title of the case of a row, or None if it is not a valid title.
+
+    Rows name their case in `case`, or in `case_title` as written by grouped
+    exports, whose `case` column holds the primary key.
+    """
+    title = row.get("case_title", row.get("case"))
+    if not isinstance(title, str):
+        return None
+    title = title.strip()
+    return title if 0 < len(title) <= CASE_TITLE_MAX_LENGTH else None
+
+
+class ImportReport:
+    """
+    Progress and result of an import.
+
+    Attributes:
+    - rows (int): Number of rows read.
+    - created (int): Number of tasks created.
+    - cases_created (int): Number of cases created for unknown titles.
+    - failed (int): Number of invalid rows.
+    - errors (list): Line number and errors of the first `max_errors` invalid rows.
+    """
+
+    def __init__(self, max_errors):
+        self.max_errors = max_errors
+        self.rows = 0
+        self.created = 0
+        self.cases_created = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.perf_counter()
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.started
+        return round(self.rows / elapsed, 1) if elapsed else 0.0
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_number, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "cases_created": self.cases_created,
+            "failed": self.failed,
+            "rows_per_second": self.rows_per_second,
+            "errors": self.errors,
+        }
+
+
+class TaskImporter:
+    """
+    Imports the tasks of a user in batches of `batch_size` rows.
+
+    Cases are resolved by title among the cases of the user, the oldest one
+    when several share a title, and created open when none exists. Resolved
+    cases are remembered for the following batches, so every batch only looks
+    up titles it is the first to reference.
+
+    Derived data (cached responses, case timestamps and task counters) of the
+    imported cases is updated once at the end, also when the import fails.
+    """
+
+    def __init__(self, user, batch_size, max_errors=100, progress=None):
+        self.user = user
+        self.batch_size = batch_size
+        self.progress = progress
+        self.report = ImportReport(max_errors)
+        self.cases = {}
+        self.case_ids = set()
+
+    def run(self, stream, input_format):
+        """
+        Imports the rows of the stream and returns the report.
+        """
+        rows = read_rows(stream, input_format)
+        try:
+            while batch := list(islice(rows, self.batch_size)):
+                self.import_batch(batch)
+                if self.progress is not None:
+                    self.progress(self.report)
+        finally:
+            if self.case_ids:
+                tasks_changed.send(
+                    sender=Task, user_ids={self.user.pk}, case_ids=self.case_ids
+                )
+        return self.report
+
+    def resolve_cases(self, titles):
+        """
+        Loads the cases of the titles not resolved yet, creating missing ones.
+        """
+        missing = set(titles) - set(self.cases)
+        if not missing:
+            return
+        for case in Case.objects.filter(user=self.user, title__in=missing).order_by(
+            "-pk"
+        ):
+            self.cases[case.title] = case
+        new = [
+            Case(user=self.user, title=title)
+            for title in sorted(missing - set(self.cases))
+        ]
+        for case in Case.objects.bulk_create(new):
+            self.cases[case.title] = case
+        self.report.cases_created += len(new)
+
+    def import_batch(self, batch):
+        self.report.rows += len(batch)
+        titles = [case_title(row) for _, row, errors in batch if errors is None]
+        with transaction.atomic():
+            self.resolve_cases(title for title in titles if title is not None)
+            # One serializer validates every row, like the child of a list
+            # serializer, so its fields are only built once per batch.
+            serializer = TaskSerializer(
+                context={"cases": {case.pk: case for case in self.cases.values()}}
+            )
+            tasks = []
+            now = timezone.now()
+            for line_number, row, errors in batch:
+                if errors:
+                    self.report.add_error(line_number, errors)
+                    continue
+                case = self.cases.get(case_title(row))
+                if case is None:
+                    message = CASE_TITLE_ERROR % {"limit": CASE_TITLE_MAX_LENGTH}
+                    self.report.add_error(line_number, {"case": [message]})
+                    continue
+                try:
+                    data = serializer.run_validation({**row, "case": case.pk})
+                except ValidationError as error:
+                    self.report.add_error(line_number, as_serializer_error(error))
+                    continue
+                task = Task(user=self.user, **data)
+                if task.status == Task.StatusChoice.FINISHED:
+                    task.completed_date = now
+                tasks.append(task)
+            Task.objects.bulk_create(tasks)
+
+        self.case_ids.update(task.case_id for task in tasks)
+        self.report.created += len(tasks)
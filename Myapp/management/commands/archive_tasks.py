@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from Myapp.archive import archive_cases, archive_tasks
+
+
+class Command(BaseCommand):
+    """
+    Moves old finished tasks and closed cases to the archive tables.
+
+    Meant to run periodically, e.g. daily from cron. Closed cases unchanged for
+    `--days` days, without unfinished tasks, are archived with their tasks.
+    Then finished tasks completed more than `--days` days ago are archived.
+    Archived items are listed and restored through the `archive/` endpoints.
+    """
+
+    help = "Archives finished tasks and closed cases older than ARCHIVE_AFTER_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ARCHIVE_AFTER_DAYS,
+            help="Age in days of the archived items.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        cases, case_tasks = archive_cases(
+            cutoff, options["batch_size"], progress=self.write_case_progress
+        )
+        tasks = archive_tasks(
+            cutoff, options["batch_size"], progress=self.write_task_progress
+        )
+        self.stdout.write("")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {cases} cases with {case_tasks} tasks and "
+                f"{tasks} other tasks."
+            )
+        )
+
+    def write_case_progress(self, cases, tasks):
+        self.stdout.write(f"{cases} cases, {tasks} tasks", ending="\r")
+
+    def write_task_progress(self, tasks):
+        self.stdout.write(f"{tasks} tasks", ending="\r")
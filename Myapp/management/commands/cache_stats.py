@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from Myapp.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    """
+    Prints the response cache hit/miss counters shared by all workers.
+    """
+
+    help = "Prints the response cache hit and miss counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Reset the counters after printing."
+        )
+
+    def handle(self, *args, **options):
+        if not settings.SHARED_CACHE:
+            raise CommandError(
+                "The counters are kept in the cache of each worker process, "
+                "set REDIS_URL to share them."
+            )
+        stats = get_stats()
+        self.stdout.write(
+            f"hits: {stats['hits']}\n"
+            f"misses: {stats['misses']}\n"
+            f"hit ratio: {stats['hit_ratio']:.2%}"
+        )
+        if options["reset"]:
+            reset_stats()
@@ -0,0 +1,79 @@
+import sys
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from Myapp.imports import INPUT_FORMATS, TaskImporter, guess_format
+
+
+class Command(BaseCommand):
+    """
+    Imports the tasks of a user from an NDJSON or CSV file, e.g. when migrating
+    from another tracker.
+
+    Every row holds the task fields of the API and the title of its case in
+    `case`. Cases are matched by title among the cases of the user, and
+    created when missing. Invalid rows are reported and skipped.
+    """
+
+    help = "Imports tasks of a user from an NDJSON or CSV file ('-' for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or '-' to read stdin.")
+        parser.add_argument("--user", required=True, help="Username of the owner.")
+        parser.add_argument(
+            "--format",
+            choices=INPUT_FORMATS,
+            help="Input format, guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+        input_format = options["format"] or guess_format(options["path"])
+        if input_format is None:
+            raise CommandError("Cannot guess the input format, pass --format.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        importer = TaskImporter(
+            user,
+            options["batch_size"],
+            settings.IMPORT_MAX_ERRORS,
+            progress=self.write_progress,
+        )
+        try:
+            if options["path"] == "-":
+                report = importer.run(sys.stdin, input_format)
+            else:
+                with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                    report = importer.run(stream, input_format)
+        except UnicodeDecodeError:
+            raise CommandError(
+                f"The file is not UTF-8, {importer.report.created} tasks were "
+                "imported before the error."
+            )
+
+        self.stdout.write("")
+        for error in report.errors:
+            self.stdout.write(f"line {error['line']}: {error['errors']}")
+        message = (
+            f"Imported {report.created} of {report.rows} tasks "
+            f"({report.rows_per_second} rows/s), created {report.cases_created} "
+            f"cases, {report.failed} rows failed."
+        )
+        style = self.style.WARNING if report.failed else self.style.SUCCESS
+        self.stdout.write(style(message))
+
+    def write_progress(self, report):
+        self.stdout.write(
+            f"{report.rows} rows, {report.created} tasks, {report.failed} failed, "
+            f"{report.rows_per_second} rows/s",
+            ending="\r",
+        )
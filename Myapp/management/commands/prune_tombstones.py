@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from Myapp.models import TaskTombstone
+
+
+class Command(BaseCommand):
+    """
+    Deletes task tombstones older than the sync retention period.
+
+    Clients syncing from before the retention period get a full reset instead.
+    """
+
+    help = "Deletes task tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = TaskTombstone.objects.filter(deleted_date__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Myapp.counters import find_drift, rebuild_counters
+from Myapp.signals import invalidate_users
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the task counters behind the statistics endpoint from the tasks.
+
+    With `--check` the counters are only compared with the tasks, and the
+    command fails if any of them drifted, e.g. to alert from a cron job.
+    """
+
+    help = "Rebuilds the task counters, or checks them for drift with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report drifted counters instead of rebuilding them.",
+        )
+
+    def handle(self, *args, **options):
+        drift = find_drift()
+        for (user_id, case_id, status), (counted, actual) in sorted(drift.items()):
+            self.stdout.write(
+                f"user {user_id} case {case_id} {status}: "
+                f"counted {counted}, actual {actual}"
+            )
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} task counters drifted.")
+            self.stdout.write(self.style.SUCCESS("Task counters are up to date."))
+            return
+        rebuild_counters()
+        invalidate_users({user_id for user_id, _, _ in drift})
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt task counters, {len(drift)} had drifted.")
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from Myapp.analytics import refresh_rollups
+
+
+class Command(BaseCommand):
+    """
+    Refreshes the daily task rollups read by `?source=rollup` analytics.
+
+    Meant to run periodically, e.g. hourly from cron. Each run recomputes the
+    recent days and the days of tasks changed since the previous run.
+    """
+
+    help = "Refreshes the daily task rollups incrementally, or fully with --full."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute the rollups of all days, e.g. after deleting tasks.",
+        )
+        parser.add_argument(
+            "--recent-days",
+            type=int,
+            default=2,
+            help="Number of latest days always recomputed (default 2).",
+        )
+
+    def handle(self, *args, **options):
+        rows = refresh_rollups(full=options["full"], recent_days=options["recent_days"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} rollup rows."))
@@ -0,0 +1,163 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from Myapp.models import Case, Task
+from Myapp.signals import tasks_changed
+
+TASK_STATUS_WEIGHTS = {
+    Task.StatusChoice.CREATED: 30,
+    Task.StatusChoice.IN_PROGRESS: 20,
+    Task.StatusChoice.FINISHED: 50,
+}
+CASE_STATUS_WEIGHTS = {
+    Case.StatusChoice.OPEN: 80,
+    Case.StatusChoice.CLOSED: 20,
+}
+
+
+@contextmanager
+def explicit_dates():
+    """
+    Temporarily disables auto_now/auto_now_add, so generated dates are stored.
+    """
+    fields = [
+        field
+        for field in Task._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    """
+    Seeds the database with synthetic users, cases and tasks through bulk inserts.
+
+    Users are named `<prefix><number>` and share the `--password` password.
+    Existing users with these names are reused, so running the command again
+    adds cases and tasks to them. Tasks are spread over the last `--days` days
+    with a realistic status mix; tasks of closed cases are finished. With
+    `--skew` above 0 a few cases hold most tasks, following a Zipf law.
+
+    Task counters are rebuilt for the new cases once all tasks are inserted.
+    """
+
+    help = "Seeds the database with synthetic users, cases and tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--cases", type=int, default=20, help="Cases per user.")
+        parser.add_argument("--tasks", type=int, default=10000, help="Total tasks.")
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=0,
+            help="Zipf exponent of the number of tasks per case, 0 for uniform.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--prefix", default="seed_user_")
+        parser.add_argument("--password", default="seed-password")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        now = timezone.now()
+        password = make_password(options["password"])
+
+        usernames = [
+            f"{options['prefix']}{number}" for number in range(options["users"])
+        ]
+        existing = User.objects.filter(username__in=usernames)
+        existing_names = set(existing.values_list("username", flat=True))
+        User.objects.bulk_create(
+            User(username=username, password=password)
+            for username in usernames
+            if username not in existing_names
+        )
+        users = list(User.objects.filter(username__in=usernames).order_by("pk"))
+        cases = Case.objects.bulk_create(
+            (
+                Case(
+                    user=user,
+                    title=f"Case {number}",
+                    status=self.pick(rng, CASE_STATUS_WEIGHTS),
+                )
+                for user in users
+                for number in range(options["cases"])
+            ),
+            batch_size=options["batch_size"],
+        )
+        weights = [1 / (rank + 1) ** options["skew"] for rank in range(len(cases))]
+        rng.shuffle(weights)
+
+        created = 0
+        with explicit_dates():
+            while created < options["tasks"]:
+                size = min(options["batch_size"], options["tasks"] - created)
+                tasks = [
+                    self.build_task(rng, case, now, options["days"])
+                    for case in rng.choices(cases, weights, k=size)
+                ]
+                with transaction.atomic():
+                    Task.objects.bulk_create(tasks)
+                created += size
+                self.stdout.write(f"{created}/{options['tasks']} tasks", ending="\r")
+
+        # Bulk inserts bypass the task signals, counters are built per chunk.
+        for start in range(0, len(cases), options["batch_size"]):
+            chunk = cases[start : start + options["batch_size"]]
+            tasks_changed.send(
+                sender=Task,
+                user_ids={case.user_id for case in chunk},
+                case_ids={case.pk for case in chunk},
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(users)} users, {len(cases)} cases and {created} tasks."
+            )
+        )
+
+    def pick(self, rng, weights):
+        return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def build_task(self, rng, case, now, days):
+        """
+        Builds an unsaved task with random dates consistent with its status, and
+        finished if its case is closed.
+        """
+        status = self.pick(rng, TASK_STATUS_WEIGHTS)
+        if case.status == Case.StatusChoice.CLOSED:
+            status = Task.StatusChoice.FINISHED
+        creation_date = now - timedelta(seconds=rng.randint(0, days * 86400))
+        completed_date = None
+        last_updated_date = creation_date
+        if status == Task.StatusChoice.FINISHED:
+            lead_time = timedelta(seconds=int(rng.expovariate(1 / 259200)))
+            completed_date = last_updated_date = min(creation_date + lead_time, now)
+        elif status == Task.StatusChoice.IN_PROGRESS:
+            last_updated_date = creation_date + (now - creation_date) * rng.random()
+        return Task(
+            user_id=case.user_id,
+            case=case,
+            title=f"Task {rng.randrange(10**6)}",
+            description="Synthetic task generated by seed_data.",
+            status=status,
+            creation_date=creation_date,
+            last_updated_date=last_updated_date,
+            completed_date=completed_date,
+        )
@@ -0,0 +1,406 @@
+"""
+Per-route request metrics: latency, database queries, database time and
+response size, exposed in the Prometheus text format.
+
+`MetricsMiddleware` times every request and the SQL queries it runs, and
+records them per named URL route, method and status code. Recording only
+updates counters of the worker process. With `SHARED_CACHE`, every
+`METRICS_FLUSH_INTERVAL` seconds a worker adds what it recorded since its
+previous flush to counters in the shared cache, so the metrics endpoint reports
+the totals of all workers, as `cache_stats` does for the response cache.
+Without it the counters stay in the worker, and the endpoint only reports the
+worker that serves it, which is only consistent with a single worker process.
+
+Metrics are only recorded and served with `METRICS_ENABLED`.
+
+Requests slower than `METRICS_SLOW_REQUEST_MS` are logged to the
+`Myapp.metrics` logger with the SQL of their slowest queries.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = "todo:metrics:{series}:{name}"
+SERIES_KEY = "todo:metrics:series"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the histogram buckets, the last bucket (+Inf) has none.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+# Microseconds per second, shared counters only hold integers.
+MICROSECONDS = 1000000
+# Metrics counted in microseconds and reported in seconds.
+MICROSECOND_METRICS = {"duration_sum", "db_time"}
+
+HISTOGRAMS = {
+    "duration": (
+        "todo_http_request_duration_seconds",
+        "Time to respond to a request, up to the first byte of streamed responses.",
+        DURATION_BUCKETS,
+    ),
+    "queries": (
+        "todo_http_request_queries",
+        "Number of SQL queries run by a request.",
+        QUERY_BUCKETS,
+    ),
+}
+COUNTERS = {
+    "db_time": (
+        "todo_http_request_db_seconds_total",
+        "Time spent running the SQL queries of requests.",
+    ),
+    "size": (
+        "todo_http_response_bytes_total",
+        "Size of the response bodies, except streamed ones.",
+    ),
+}
+# Names of the shared counters of every series.
+METRIC_NAMES = [
+    "requests",
+    "duration_sum",
+    "queries_sum",
+    *COUNTERS,
+    *(f"duration_bucket:{i}" for i in range(len(DURATION_BUCKETS) + 1)),
+    *(f"queries_bucket:{i}" for i in range(len(QUERY_BUCKETS) + 1)),
+]
+
+
+class QueryTimer:
+    """
+    Database execute wrapper timing the queries of one request and keeping
+    the slowest ones.
+    """
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, (duration, self.count, sql))
+            elif duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (duration, self.count, sql))
+
+
+class MetricsRegistry:
+    """
+    Metrics recorded by the worker process and not flushed yet.
+
+    Values are kept as integers (durations in microseconds), per series and
+    metric name, with histograms counted per bucket and not cumulated.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.series = set()
+        self.flushed = time.monotonic()
+
+    def record(self, series, duration, queries, db_time, size):
+        """
+        Adds a request to the pending metrics of its series.
+        """
+        values = {
+            "requests": 1,
+            f"duration_bucket:{bisect_left(DURATION_BUCKETS, duration)}": 1,
+            "duration_sum": round(duration * MICROSECONDS),
+            f"queries_bucket:{bisect_left(QUERY_BUCKETS, queries)}": 1,
+            "queries_sum": queries,
+            "db_time": round(db_time * MICROSECONDS),
+        }
+        if size is not None:
+            values["size"] = size
+        with self.lock:
+            self.series.add(series)
+            for name, value in values.items():
+                self.pending[series, name] += value
+
+    def is_due(self):
+        """
+        Tells whether the next `flush` adds the pending metrics to the shared
+        counters.
+        """
+        return (
+            settings.SHARED_CACHE
+            and time.monotonic() - self.flushed >= settings.METRICS_FLUSH_INTERVAL
+        )
+
+    def flush(self, force=False):
+        """
+        Adds the pending metrics to the shared counters, at most once per
+        `METRICS_FLUSH_INTERVAL` seconds unless forced.
+
+        Without `SHARED_CACHE` the pending metrics are the totals of the worker
+        and are never flushed.
+        """
+        if not settings.SHARED_CACHE:
+            return
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self.flushed < settings.METRICS_FLUSH_INTERVAL:
+                return
+            pending, self.pending = self.pending, Counter()
+            series, self.flushed = set(self.series), now
+        for (name, metric), value in pending.items():
+            incr(METRICS_KEY.format(series=name, name=metric), value)
+        # Every flush re-adds series lost to concurrent updates of the index.
+        known = cache.get(SERIES_KEY, set())
+        if not series <= known:
+            cache.set(SERIES_KEY, known | series, None)
+
+
+registry = MetricsRegistry()
+
+
+def incr(key, delta):
+    """
+    Adds `delta` to a shared counter, creating it on first use.
+    """
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, None):
+            cache.incr(key, delta)
+
+
+def series_name(route, method, status):
+    """
+    Returns the name of the series of requests to a route.
+    """
+    return f"{route}|{method}|{status}"
+
+
+def read_metrics():
+    """
+    Returns the shared metrics per series (route, method, status) and name, or
+    the metrics of the worker without `SHARED_CACHE`.
+    """
+    if not settings.SHARED_CACHE:
+        with registry.lock:
+            pending = Counter(registry.pending)
+        metrics = {}
+        for (name, metric), value in sorted(pending.items()):
+            metrics.setdefault(tuple(name.split("|", 2)), Counter())[metric] = value
+        return metrics
+
+    series = sorted(cache.get(SERIES_KEY, set()))
+    keys = {
+        METRICS_KEY.format(series=name, name=metric): (name, metric)
+        for name in series
+        for metric in METRIC_NAMES
+    }
+    values = cache.get_many(keys)
+    metrics = {tuple(name.split("|", 2)): Counter() for name in series}
+    for key, value in values.items():
+        name, metric = keys[key]
+        metrics[tuple(name.split("|", 2))][metric] = value
+    return metrics
+
+
+def escape(value):
+    """
+    Returns the value escaped for a Prometheus label.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def report(values, metric):
+    """
+    Returns the value of the metric in its reported unit.
+    """
+    if metric in MICROSECOND_METRICS:
+        return values[metric] / MICROSECONDS
+    return values[metric]
+
+
+def render_metrics(metrics):
+    """
+    Returns the metrics in the Prometheus text exposition format.
+    """
+    lines = [
+        "# HELP todo_http_requests_total Number of requests.",
+        "# TYPE todo_http_requests_total counter",
+    ]
+    labels = {
+        key: f'route="{escape(key[0])}",method="{escape(key[1])}",'
+        f'status="{escape(key[2])}"'
+        for key in metrics
+    }
+    for key, values in metrics.items():
+        lines.append(f"todo_http_requests_total{{{labels[key]}}} {values['requests']}")
+
+    for metric, (name, help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, values in metrics.items():
+            cumulative = 0
+            for index, bound in enumerate((*buckets, "+Inf")):
+                cumulative += values[f"{metric}_bucket:{index}"]
+                lines.append(
+                    f'{name}_bucket{{{labels[key]},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f"{name}_sum{{{labels[key]}}} {report(values, f'{metric}_sum')}"
+            )
+            lines.append(f"{name}_count{{{labels[key]}}} {cumulative}")
+
+    for metric, (name, help_text) in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for key, values in metrics.items():
+            lines.append(f"{name}{{{labels[key]}}} {report(values, metric)}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    """
+    Drops the pending and shared metrics.
+    """
+    with registry.lock:
+        registry.pending.clear()
+        registry.series.clear()
+    cache.delete_many(
+        [
+            METRICS_KEY.format(series=name, name=metric)
+            for name in cache.get(SERIES_KEY, set())
+            for metric in METRIC_NAMES
+        ]
+        + [SERIES_KEY]
+    )
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, SQL queries, database time and response size of every
+    request per named URL route, method and status code, see `Myapp.metrics`.
+
+    Requests that match no route are recorded as route `unmatched`. Not used
+    unless `METRICS_ENABLED` is set.
+
+    Supports both sync and async requests, so under ASGI the async views are
+    not run in a thread because of it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer(settings.METRICS_SLOW_QUERIES)
+        start = time.perf_counter()
+        with self.timed_queries(timer):
+            response = self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - start)
+        registry.flush()
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer(settings.METRICS_SLOW_QUERIES)
+        start = time.perf_counter()
+        with self.timed_queries(timer):
+            response = await self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - start)
+        # Only flushes, which write to the shared cache, are run in a thread.
+        if registry.is_due():
+            await sync_to_async(registry.flush)()
+        return response
+
+    @contextmanager
+    def timed_queries(self, timer):
+        """
+        Times the queries run on any database connection of the request.
+
+        Connections are shared with the threads that run the queries of async
+        requests, so their queries are timed too.
+        """
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            yield
+
+    def record(self, request, response, timer, duration):
+        """
+        Handles recording the request, and logging it when it is slow.
+        """
+        match = getattr(request, "resolver_match", None)
+        route = (match and match.url_name) or "unmatched"
+        size = None if response.streaming else len(response.content)
+        registry.record(
+            series_name(route, request.method, response.status_code),
+            duration,
+            timer.count,
+            timer.duration,
+            size,
+        )
+        if duration * 1000 >= settings.METRICS_SLOW_REQUEST_MS:
+            log_slow_request(request, route, response, duration, timer)
+
+
+def log_slow_request(request, route, response, duration, timer):
+    """
+    Logs a slow request with the SQL of its slowest queries.
+    """
+    queries = "".join(
+        f"\n  {query_duration * 1000:.1f} ms: {sql}"
+        for query_duration, _, sql in sorted(timer.slowest, reverse=True)
+    )
+    logger.warning(
+        "Slow request %s %s (%s) %s: %.1f ms, %d queries in %.1f ms.%s",
+        request.method,
+        request.path,
+        route,
+        response.status_code,
+        duration * 1000,
+        timer.count,
+        timer.duration * 1000,
+        queries,
+    )
+
+
+def metrics_view(request):
+    """
+    Handles serving the metrics in the Prometheus text format.
+
+    Requests must send `METRICS_TOKEN` as a bearer token. Without a token the
+    metrics are only served with `DEBUG`.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden()
+    registry.flush(force=True)
+    return HttpResponse(render_metrics(read_metrics()), content_type=CONTENT_TYPE)
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.2 on 2026-10-18 11:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Myapp", "0001_Case_and_Task_models_created"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="case",
+            index=models.Index(fields=["user", "status"], name="case_user_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "creation_date", "id"], name="task_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "status", "creation_date"],
+                name="task_user_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("status", "FINISHED"), _negated=True),
+                fields=["user", "creation_date"],
+                name="task_user_unfinished_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-18 11:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Myapp", "0002_task_and_case_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "last_updated_date", "id"], name="task_user_updated_idx"
+            ),
+        ),
+    ]
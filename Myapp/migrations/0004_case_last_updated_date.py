@@ -0,0 +1,19 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Myapp", "0003_task_last_updated_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="case",
+            name="last_updated_date",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.2 on 2026-10-18 11:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    """
+    Counts the existing tasks per owner, case and status.
+    """
+    Task = apps.get_model("Myapp", "Task")
+    TaskCounter = apps.get_model("Myapp", "TaskCounter")
+    rows = (
+        Task.objects.values("user_id", "case_id", "status")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    TaskCounter.objects.bulk_create(
+        (TaskCounter(**row) for row in rows.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Myapp", "0005_task_tombstone"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("CREATED", "Created Task"),
+                            ("IN_PROGRESS", "In Progress"),
+                            ("FINISHED", "Finished Task"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "case",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="task_counters",
+                        to="Myapp.case",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="task_counters",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task counter",
+                "verbose_name_plural": "Task counters",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "case", "status"), name="task_counter_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
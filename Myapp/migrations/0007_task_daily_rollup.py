@@ -0,0 +1,76 @@
+# Generated by Django 5.1.2 on 2026-10-18 11:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Myapp", "0006_task_counter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("lead_time_bucket", models.PositiveSmallIntegerField()),
+                ("finished", models.PositiveIntegerField()),
+                (
+                    "refreshed_date",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "Task daily rollup",
+                "verbose_name_plural": "Task daily rollups",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "completed_date"], name="task_user_completed_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskdailyrollup",
+            name="case",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="task_rollups",
+                to="Myapp.case",
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskdailyrollup",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="task_rollups",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskdailyrollup",
+            index=models.Index(fields=["day"], name="task_rollup_day_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="taskdailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("user", "day", "case", "lead_time_bucket"),
+                name="task_rollup_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,121 @@
+"""
+Full-text search indexes of tasks, see `Myapp.search`.
+
+SQLite gets an FTS5 table holding the task title, description and case title,
+kept in sync by triggers on tasks and cases. PostgreSQL gets GIN expression
+indexes on the task and case `tsvector`. Other databases, and SQLite builds
+without FTS5, get no index and search with a scan.
+"""
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLE = "Myapp_task_fts"
+SEARCH_CONFIG = "simple"
+
+SQLITE_INDEX = [
+    f"""
+    CREATE VIRTUAL TABLE "{FTS_TABLE}" USING fts5(
+        title, description, case_title,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    INSERT INTO "{FTS_TABLE}" (rowid, title, description, case_title)
+    SELECT task.id, task.title, task.description, "case".title
+    FROM "Myapp_task" task JOIN "Myapp_case" "case" ON "case".id = task.case_id
+    """,
+    f"""
+    CREATE TRIGGER "Myapp_task_fts_insert" AFTER INSERT ON "Myapp_task" BEGIN
+        INSERT INTO "{FTS_TABLE}" (rowid, title, description, case_title)
+        VALUES (
+            new.id, new.title, new.description,
+            (SELECT title FROM "Myapp_case" WHERE id = new.case_id)
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER "Myapp_task_fts_update"
+    AFTER UPDATE OF title, description, case_id ON "Myapp_task" BEGIN
+        UPDATE "{FTS_TABLE}" SET
+            title = new.title,
+            description = new.description,
+            case_title = (SELECT title FROM "Myapp_case" WHERE id = new.case_id)
+        WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER "Myapp_task_fts_delete" AFTER DELETE ON "Myapp_task" BEGIN
+        DELETE FROM "{FTS_TABLE}" WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER "Myapp_case_fts_update" AFTER UPDATE OF title ON "Myapp_case"
+    WHEN new.title IS NOT old.title BEGIN
+        UPDATE "{FTS_TABLE}" SET case_title = new.title
+        WHERE rowid IN (SELECT id FROM "Myapp_task" WHERE case_id = new.id);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS "Myapp_case_fts_update"',
+    'DROP TRIGGER IF EXISTS "Myapp_task_fts_delete"',
+    'DROP TRIGGER IF EXISTS "Myapp_task_fts_update"',
+    'DROP TRIGGER IF EXISTS "Myapp_task_fts_insert"',
+    f'DROP TABLE IF EXISTS "{FTS_TABLE}"',
+]
+
+
+def postgres_indexes():
+    """
+    Returns the GIN indexes of tasks and cases. Their expressions must match
+    the vectors searched by `Myapp.search`.
+    """
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    task_vector = SearchVector(
+        "title", weight="A", config=SEARCH_CONFIG
+    ) + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+    return {
+        "Task": GinIndex(task_vector, name="task_search_idx"),
+        "Case": GinIndex(
+            SearchVector("title", config=SEARCH_CONFIG), name="case_search_idx"
+        ),
+    }
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        try:
+            schema_editor.execute(SQLITE_INDEX[0])
+        except OperationalError:
+            # SQLite built without FTS5, tasks are searched with a scan.
+            return
+        for statement in SQLITE_INDEX[1:]:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        for model, index in postgres_indexes().items():
+            schema_editor.add_index(apps.get_model("Myapp", model), index)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        for model, index in postgres_indexes().items():
+            schema_editor.remove_index(apps.get_model("Myapp", model), index)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Myapp", "0007_task_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
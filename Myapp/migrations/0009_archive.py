@@ -0,0 +1,98 @@
+# Generated by Django 5.1.2 on 2026-10-18 12:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Myapp", "0008_task_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedCase",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=150, verbose_name="Case title")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("OPEN", "Open case"), ("CLOSED", "Closed case")],
+                        max_length=30,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("last_updated_date", models.DateTimeField()),
+                (
+                    "archived_date",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_cases",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived case",
+                "verbose_name_plural": "Archived cases",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("case_id", models.BigIntegerField()),
+                ("title", models.CharField(max_length=150, verbose_name="Task title")),
+                (
+                    "description",
+                    models.TextField(max_length=250, verbose_name="Task description"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("CREATED", "Created Task"),
+                            ("IN_PROGRESS", "In Progress"),
+                            ("FINISHED", "Finished Task"),
+                        ],
+                        max_length=30,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("creation_date", models.DateTimeField()),
+                ("last_updated_date", models.DateTimeField()),
+                ("completed_date", models.DateTimeField(blank=True, null=True)),
+                (
+                    "archived_date",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_tasks",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived task",
+                "verbose_name_plural": "Archived tasks",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "creation_date", "id"],
+                        name="archived_task_user_created_idx",
+                    ),
+                    models.Index(fields=["case_id"], name="archived_task_case_idx"),
+                ],
+            },
+        ),
+    ]
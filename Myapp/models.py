@@ -1,5 +1,7 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -12,6 +14,7 @@ class Case(models.Model):
     - title (CharField): The title of the case, limited to 150 characters.
     - user (ForeignKey): A foreign key linking the case to a user. When a user is deleted, their cases are also removed.
     - status (CharField): Indicates the current state of the case, with choices of 'OPEN' or 'CLOSED'.
+    - last_updated_date (DateTimeField): The date and time when the case or one of its tasks was last changed.
 
     Inner Classes:
     - StatusChoice (TextChoices): Defines the possible statuses for a case.
@@ -32,15 +35,23 @@ class Case(models.Model):
         default=StatusChoice.OPEN,
         verbose_name=_("Status"),
     )
+    last_updated_date = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = _("Case")
         verbose_name_plural = _("Cases")
+        indexes = [
+            models.Index(fields=["user", "status"], name="case_user_status_idx"),
+        ]
 
     def __str__(self):
         return f" {self.title} | {self.user} | {self.status}"
 
 
+# Fields of a task that decide which task counter counts it.
+COUNTED_FIELDS = {"user", "user_id", "case", "case_id", "status"}
+
+
 class Task(models.Model):
     """
     Model representing a task associated with a specific user and case.
@@ -59,7 +70,9 @@ class Task(models.Model):
     - StatusChoice (TextChoices): Defines the possible statuses for a task.
 
     Methods:
+    - from_db: Remembers the case, status and owner the task was loaded with.
     - save: Custom save method to set the completion date when the task is marked as finished.
+    - completion_date_expression: Expression setting the completion date in set-based updates.
     - __str__: Returns a string representation of the task, including related case, title, description, creation date, and status.
     """
 
@@ -85,27 +98,321 @@ class Task(models.Model):
     class Meta:
         verbose_name = _("Task")
         verbose_name_plural = _("Tasks")
+        indexes = [
+            models.Index(
+                fields=["user", "creation_date", "id"], name="task_user_created_idx"
+            ),
+            models.Index(
+                fields=["user", "last_updated_date", "id"],
+                name="task_user_updated_idx",
+            ),
+            models.Index(
+                fields=["user", "status", "creation_date"],
+                name="task_user_status_created_idx",
+            ),
+            models.Index(
+                fields=["user", "completed_date"], name="task_user_completed_idx"
+            ),
+            # Partial index, skipped on backends without partial index support.
+            models.Index(
+                fields=["user", "creation_date"],
+                condition=~Q(status="FINISHED"),
+                name="task_user_unfinished_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the loaded case, status and owner, so moving the task can
+        update the derived data of both cases and both status counters.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_case_id = instance.__dict__.get("case_id")
+        instance._loaded_status = instance.__dict__.get("status")
+        instance._loaded_user_id = instance.__dict__.get("user_id")
+        return instance
+
+    def lock_stored_row(self):
+        """
+        Locks the stored row of the task and remembers its stored case, status
+        and owner as the loaded ones.
+
+        The row is locked by an update matching the loaded values, so as long
+        as no concurrent writer changed them this costs one query. Otherwise
+        the stored values are read from the locked row, so that the counters
+        move from what is stored and do not drift.
+        """
+        loaded = {
+            "user_id": getattr(self, "_loaded_user_id", None),
+            "case_id": getattr(self, "_loaded_case_id", None),
+            "status": getattr(self, "_loaded_status", None),
+        }
+        if None in loaded.values():
+            return
+        row = Task.objects.filter(pk=self.pk)
+        if row.filter(**loaded).update(status=F("status")):
+            return
+        stored = row.values_list("user_id", "case_id", "status").first()
+        if stored is not None:
+            self._loaded_user_id, self._loaded_case_id, self._loaded_status = stored
 
     def save(self, *args, **kwargs):
         """
-         Overrides the save method to set the completed_date field.
-         If the task status changes to 'FINISHED',
-         the completed_date is set to the current date and time.
-
-         Args:
-             *args: Additional positional arguments.
-             **kwargs: Additional keyword arguments.
-         """
-        if self.pk:
+        Overrides the save method to set the completed_date field.
+        If the task is saved as 'FINISHED' without a completion date,
+        the completed_date is set to the current date and time.
+
+        Updates do not read the previous row. The date is written as
+        COALESCE(completed_date, now), so when two writers finish the same
+        task concurrently the date stored by the first one is kept. Updates
+        that write the case, status or owner lock the row first, see
+        `lock_stored_row`.
+
+        Args:
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+        """
+        update_fields = kwargs.get("update_fields")
+        with transaction.atomic(savepoint=False):
+            if not self._state.adding and (
+                update_fields is None or COUNTED_FIELDS.intersection(update_fields)
+            ):
+                self.lock_stored_row()
             if (
-                Task.objects.get(pk=self.pk).status != self.StatusChoice.FINISHED
-                and self.status == self.StatusChoice.FINISHED
+                self.status == self.StatusChoice.FINISHED
+                and self.completed_date is None
             ):
-                self.completed_date = timezone.now()
-        else:
-            if self.status == self.StatusChoice.FINISHED:
-                self.completed_date = timezone.now()
-        super().save(*args, **kwargs)
+                now = timezone.now()
+                if self._state.adding:
+                    self.completed_date = now
+                else:
+                    self.completed_date = self.completion_date_expression(now)
+                    if update_fields is not None:
+                        kwargs["update_fields"] = {*update_fields, "completed_date"}
+            super().save(*args, **kwargs)
+        if isinstance(self.completed_date, Coalesce):
+            self.refresh_from_db(fields=["completed_date"])
+
+    def delete(self, *args, **kwargs):
+        """
+        Overrides the delete method to lock the row first, see
+        `lock_stored_row`.
+        """
+        with transaction.atomic(savepoint=False):
+            self.lock_stored_row()
+            return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def completion_date_expression(now):
+        """
+        Returns an expression that keeps a stored completion date or sets `now`.
+
+        Used by updates that finish tasks without reading them first, so that
+        concurrent writers never move an existing completion date.
+
+        Args:
+            now: The completion date to store when none is stored yet.
+        """
+        return Coalesce(
+            F("completed_date"), Value(now, output_field=models.DateTimeField())
+        )
+
+    def __str__(self):
+        return (
+            f"{self.case.title} | {self.title} | {self.creation_date} | {self.status}"
+        )
+
+
+class TaskTombstone(models.Model):
+    """
+    Model recording a deleted task, so that syncing clients learn about deletions.
+
+    Attributes:
+    - task_id (BigIntegerField): Primary key of the deleted task.
+    - user (ForeignKey): The user who owned the deleted task.
+    - deleted_date (DateTimeField): The date and time when the task was deleted.
+    """
+
+    task_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="task_tombstones"
+    )
+    deleted_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Task tombstone")
+        verbose_name_plural = _("Task tombstones")
+        indexes = [
+            models.Index(
+                fields=["user", "deleted_date"], name="tombstone_user_deleted_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} | {self.user} | {self.deleted_date}"
+
+
+class TaskCounter(models.Model):
+    """
+    Model holding the number of tasks of a user in a case with a given status.
+
+    The counters are kept up to date incrementally on every task write (see
+    `Myapp.signals`), so task statistics are read without scanning tasks. They
+    are deleted together with their case or user. The `rebuild_task_counters`
+    command recomputes them from the tasks.
+
+    Attributes:
+    - user (ForeignKey): The owner of the counted tasks.
+    - case (ForeignKey): The case of the counted tasks.
+    - status (CharField): The status of the counted tasks.
+    - count (IntegerField): The number of tasks.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="task_counters"
+    )
+    case = models.ForeignKey(
+        Case, on_delete=models.CASCADE, related_name="task_counters"
+    )
+    status = models.CharField(max_length=30, choices=Task.StatusChoice.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Task counter")
+        verbose_name_plural = _("Task counters")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "case", "status"], name="task_counter_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} | {self.case_id} | {self.status} | {self.count}"
+
+
+class TaskDailyRollup(models.Model):
+    """
+    Model holding the number of tasks finished per day, case and lead time range.
+
+    Precomputed from the tasks by the `refresh_task_rollups` command, so the
+    analytics of big accounts read a few rows per day instead of every task.
+
+    Attributes:
+    - user (ForeignKey): The owner of the finished tasks.
+    - case (ForeignKey): The case of the finished tasks.
+    - day (DateField): The day (UTC) the tasks were finished.
+    - lead_time_bucket (PositiveSmallIntegerField): Index of the lead time range
+      in `Myapp.analytics.LEAD_TIME_BUCKETS`.
+    - finished (PositiveIntegerField): The number of tasks.
+    - refreshed_date (DateTimeField): The start of the refresh that computed the row.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="task_rollups"
+    )
+    case = models.ForeignKey(
+        Case, on_delete=models.CASCADE, related_name="task_rollups"
+    )
+    day = models.DateField()
+    lead_time_bucket = models.PositiveSmallIntegerField()
+    finished = models.PositiveIntegerField()
+    refreshed_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Task daily rollup")
+        verbose_name_plural = _("Task daily rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "day", "case", "lead_time_bucket"],
+                name="task_rollup_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["day"], name="task_rollup_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} | {self.case_id} | {self.day} | {self.finished}"
+
+
+class ArchivedCase(models.Model):
+    """
+    Model holding a closed case moved out of the case table by archival.
+
+    Archived cases keep their primary key, so restoring moves them back
+    unchanged. Their archived tasks are `ArchivedTask` rows with their `case_id`.
+
+    Attributes:
+    - id (BigIntegerField): Primary key of the case.
+    - user (ForeignKey): The owner of the case.
+    - title (CharField): The title of the case.
+    - status (CharField): The status of the case, normally 'CLOSED'.
+    - last_updated_date (DateTimeField): When the case was last changed before archival.
+    - archived_date (DateTimeField): When the case was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_cases"
+    )
+    title = models.CharField(max_length=150, verbose_name=_("Case title"))
+    status = models.CharField(
+        max_length=30, choices=Case.StatusChoice.choices, verbose_name=_("Status")
+    )
+    last_updated_date = models.DateTimeField()
+    archived_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Archived case")
+        verbose_name_plural = _("Archived cases")
+
+    def __str__(self):
+        return f" {self.title} | {self.user} | {self.status}"
+
+
+class ArchivedTask(models.Model):
+    """
+    Model holding a finished task moved out of the task table by archival.
+
+    Archived tasks keep their primary key and dates, so restoring moves them
+    back unchanged. Their case is referenced by primary key only, as it may be
+    a `Case` or an `ArchivedCase`.
+
+    Attributes:
+    - id (BigIntegerField): Primary key of the task.
+    - user (ForeignKey): The owner of the task.
+    - case_id (BigIntegerField): Primary key of the task case.
+    - title, description, status, creation_date, last_updated_date and
+      completed_date: The task fields, as they were before archival.
+    - archived_date (DateTimeField): When the task was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_tasks"
+    )
+    case_id = models.BigIntegerField()
+    title = models.CharField(max_length=150, verbose_name=_("Task title"))
+    description = models.TextField(max_length=250, verbose_name=_("Task description"))
+    status = models.CharField(
+        max_length=30, choices=Task.StatusChoice.choices, verbose_name=_("Status")
+    )
+    creation_date = models.DateTimeField()
+    last_updated_date = models.DateTimeField()
+    completed_date = models.DateTimeField(null=True, blank=True)
+    archived_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Archived task")
+        verbose_name_plural = _("Archived tasks")
+        indexes = [
+            models.Index(
+                fields=["user", "creation_date", "id"],
+                name="archived_task_user_created_idx",
+            ),
+            models.Index(fields=["case_id"], name="archived_task_case_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.case.title} | {self.title} | {self.creation_date} | {self.status}"
+        return f"{self.case_id} | {self.title} | {self.creation_date} | {self.status}"
@@ -0,0 +1,231 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import DateTimeField, Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a stable, unique ordering.
+
+    Instead of an OFFSET, the cursor carries the ordering values of the last row
+    of the previous page, and the next page is fetched with a range condition on
+    those values. The database can therefore seek straight into an index on the
+    ordering columns, so every page costs the same no matter how deep it is.
+
+    The ordering is taken from the view's ordering filter (or its `ordering`
+    attribute) and always ends with the primary key, which makes it unique and
+    the cursor unambiguous. Only non-nullable fields may be used for ordering.
+
+    Query parameters:
+    - cursor: Opaque cursor taken from the `next` link of the previous page.
+    - page_size: Number of items per page, capped at `MAX_PAGE_SIZE`.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "MAX_PAGE_SIZE", 500)
+    cursor_query_param = "cursor"
+    ordering = ("pk",)
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns a single page of the queryset, starting right after the cursor.
+        """
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Returns the unevaluated queryset of the page rows, with one extra row.
+
+        Async views evaluate it with the async ORM and pass the rows to
+        `set_page`.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [
+            queryset.model._meta.get_field(field.lstrip("-"))
+            if field.lstrip("-") != "pk"
+            else queryset.model._meta.pk
+            for field in self.ordering
+        ]
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_filter(position))
+
+        # Fetch one extra row to find out whether there is a next page.
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        """
+        Stores the page from the fetched rows and returns it.
+        """
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """
+        Returns the requested page size, falling back to the default one.
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Returns the requested ordering, with the primary key appended as a tiebreaker.
+        """
+        ordering_filters = [
+            backend
+            for backend in getattr(view, "filter_backends", [])
+            if hasattr(backend, "get_ordering")
+        ]
+        if ordering_filters:
+            ordering = ordering_filters[0]().get_ordering(request, queryset, view)
+        else:
+            ordering = getattr(view, "ordering", None)
+        ordering = list(ordering or self.ordering)
+        if ordering[-1].lstrip("-") not in ("pk", "id"):
+            descending = ordering[-1].startswith("-")
+            ordering.append("-pk" if descending else "pk")
+        return tuple(ordering)
+
+    def get_seek_filter(self, position):
+        """
+        Builds the condition selecting rows that come after the given position.
+
+        For an ordering (a, b, pk) this is `a >= x AND (a > x OR (a = x AND b > y)
+        OR (a = x AND b = y AND pk > z))`. The leading range on the first column
+        lets the database start an index range scan instead of filtering rows.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        first = self.ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        position = [self.get_value(last, field) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position)
+        )
+
+    def get_value(self, row, field):
+        """
+        Reads an ordering value from a model instance or a `values()` row.
+        """
+        name = field.lstrip("-")
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def encode_cursor(self, position):
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in position
+        ]
+        encoded = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return b64encode(encoded).decode("ascii")
+
+    def decode_cursor(self, request):
+        """
+        Returns the position stored in the request cursor, or None on the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            values = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (TypeError, ValueError, UnicodeError, BinasciiError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class TaskSyncPagination(KeysetPagination):
+    """
+    Keyset pagination of the task changes returned by a sync, in the order they
+    were made.
+
+    The cursor also carries the `watermark` of the first page, since changes
+    committed while the next pages are fetched are only returned by the next
+    sync if it starts from there.
+
+    Query parameters:
+    - cursor: Opaque cursor taken from the `next` link of the previous page.
+    - limit: Number of tasks per page, capped at `MAX_PAGE_SIZE`.
+    """
+
+    page_size = KeysetPagination.max_page_size
+    page_size_query_param = "limit"
+    ordering = ("last_updated_date", "pk")
+    watermark_field = DateTimeField()
+
+    def paginate_queryset(self, queryset, request, view=None, watermark=None):
+        """
+        Returns a single page of the changes, keeping the watermark of the
+        cursor, or `watermark` on the first page.
+        """
+        self.watermark = watermark
+        return super().paginate_queryset(queryset, request, view)
+
+    def encode_cursor(self, position):
+        return super().encode_cursor([self.watermark, *position])
+
+    def decode_cursor(self, request):
+        """
+        Returns the position stored in the request cursor, or None on the first
+        page, and restores the watermark stored with it.
+        """
+        fields = self.fields
+        self.fields = [self.watermark_field, *fields]
+        try:
+            values = super().decode_cursor(request)
+        finally:
+            self.fields = fields
+        if values is None:
+            return None
+        self.watermark, *position = values
+        return position
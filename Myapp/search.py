@@ -0,0 +1,135 @@
+"""
+Full-text search of tasks by their title, description and case title.
+
+The search is backed by a database index that follows every write to tasks and
+cases, including set-based ones, without application code:
+
+- SQLite searches the FTS5 table `Myapp_task_fts`, kept in sync by triggers
+  (migration 0008), and ranks tasks with bm25.
+- PostgreSQL searches GIN expression indexes on the task and case `tsvector`
+  (migration 0008) and ranks tasks with `ts_rank`.
+- Other databases, and SQLite builds without FTS5, scan the tasks with
+  `icontains` and do not rank them.
+
+Every word of the query must match, in any of the searched fields.
+"""
+
+import operator
+import re
+from functools import reduce
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+
+FTS_TABLE = "Myapp_task_fts"
+# Text search configuration of the PostgreSQL indexes, see migration 0008.
+SEARCH_CONFIG = "simple"
+# Relative weights of matches in the task title, description and case title.
+FTS_WEIGHTS = (10.0, 1.0, 4.0)
+MAX_TERMS = 10
+
+
+def search_terms(query):
+    """
+    Returns the words of a search query, ignoring punctuation and operators.
+    """
+    return re.findall(r"\w+", query)[:MAX_TERMS]
+
+
+def has_fts_index(connection):
+    """
+    Tells whether the SQLite database has the FTS5 task index.
+    """
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [FTS_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def search_tasks(tasks, query):
+    """
+    Returns the tasks matching every word of the query, best matches first,
+    annotated with their `rank` (None when the database cannot rank).
+    """
+    terms = search_terms(query)
+    connection = connections[tasks.db]
+    if connection.vendor == "postgresql":
+        return postgres_search(tasks, terms)
+    if has_fts_index(connection):
+        return sqlite_search(tasks, terms, connection)
+    return naive_search(tasks, terms)
+
+
+def sqlite_search(tasks, terms, connection):
+    """
+    Joins the tasks with their FTS5 entries matching the terms.
+
+    Every term is quoted, so the query syntax of FTS5 never applies to user
+    input. bm25 scores better matches lower, the rank is its negation.
+    """
+    table = connection.ops.quote_name(FTS_TABLE)
+    task_table = connection.ops.quote_name(tasks.model._meta.db_table)
+    return tasks.extra(
+        tables=[FTS_TABLE],
+        where=[f"{table}.rowid = {task_table}.id", f"{table} MATCH %s"],
+        params=[" ".join(f'"{term}"' for term in terms)],
+        select={"rank": f"-bm25({table}, %s, %s, %s)"},
+        select_params=FTS_WEIGHTS,
+    ).order_by("-rank", "pk")
+
+
+def task_search_vector():
+    """
+    Returns the weighted `tsvector` of the task title and description, as
+    indexed by migration 0008.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector("title", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "description", weight="B", config=SEARCH_CONFIG
+    )
+
+
+def postgres_search(tasks, terms):
+    """
+    Filters the tasks term by term with the GIN indexed vectors of tasks and
+    cases, so terms may match different fields, and ranks them by both.
+    """
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+    from .models import Case
+
+    queries = [SearchQuery(term, config=SEARCH_CONFIG) for term in terms]
+    tasks = tasks.alias(search=task_search_vector())
+    for query in queries:
+        cases = (
+            Case.objects.alias(search=SearchVector("title", config=SEARCH_CONFIG))
+            .filter(search=query)
+            .values("pk")
+        )
+        tasks = tasks.filter(Q(search=query) | Q(case__in=cases))
+
+    any_term = reduce(operator.or_, queries)
+    return tasks.annotate(
+        rank=SearchRank(task_search_vector(), any_term)
+        + SearchRank(
+            SearchVector("case__title", weight="C", config=SEARCH_CONFIG), any_term
+        )
+    ).order_by("-rank", "pk")
+
+
+def naive_search(tasks, terms):
+    """
+    Scans the tasks for every term with case-insensitive substring matches.
+    """
+    for term in terms:
+        tasks = tasks.filter(
+            Q(title__icontains=term)
+            | Q(description__icontains=term)
+            | Q(case__title__icontains=term)
+        )
+    return tasks.annotate(rank=Value(None, output_field=FloatField())).order_by("pk")
@@ -1,7 +1,32 @@
 from django.utils.translation import gettext_lazy as _
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
-from .models import Case, Task
+from .models import ArchivedCase, ArchivedTask, Case, Task
+from .search import search_terms
+
+
+class CaseField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for the task case that can resolve cases from a cache.
+
+    Bulk operations load all referenced cases with one query and pass them in
+    the `cases` serializer context, so validating a batch does not run one query
+    per item. Without the cache, the case is fetched from the queryset.
+    """
+
+    def to_internal_value(self, data):
+        cases = self.context.get("cases")
+        if cases is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return cases[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -23,6 +48,7 @@ class TaskSerializer(serializers.ModelSerializer):
     - validate_case: Ensures that a task cannot be added to a closed case.
     """
 
+    case = CaseField(queryset=Case.objects.all())
     creation_date = serializers.DateTimeField(read_only=True)
     last_updated_date = serializers.DateTimeField(read_only=True)
     completed_date = serializers.DateTimeField(required=False, read_only=True)
@@ -102,3 +128,244 @@ class CaseSerializer(serializers.ModelSerializer):
         model = Case
         fields = ["pk", "title", "status", "tasks"]
         read_only_fields = ["user"]
+
+
+class CaseSummarySerializer(CaseSerializer):
+    """
+    Serializer for the Case model that replaces nested tasks with task counts.
+
+    Fields:
+    - pk: Primary key of the case.
+    - title: Title of the case.
+    - status: Current status of the case.
+    - task_counts: Number of tasks of the case per task status (read-only).
+
+    The counts are read from `tasks_<status>` annotations on the case queryset.
+    """
+
+    task_counts = serializers.SerializerMethodField()
+
+    class Meta(CaseSerializer.Meta):
+        fields = ["pk", "title", "status", "task_counts"]
+
+    def get_task_counts(self, obj):
+        """
+        Returns the annotated number of tasks for each task status.
+        """
+        return {
+            status: getattr(obj, f"tasks_{status.lower()}", 0)
+            for status in Task.StatusChoice.values
+        }
+
+
+# Fields whose representation is the value read from the database.
+PLAIN_FIELDS = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+
+
+def datetime_converter(field):
+    """
+    Returns a function formatting aware datetimes as the `DateTimeField` does,
+    in the current time zone.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = getattr(field, "timezone", field.default_timezone())
+    if (
+        field_timezone is None
+        or output_format is None
+        or output_format.lower() == ISO_8601
+    ):
+        return field.to_representation
+
+    def convert(value):
+        if not value:
+            return None
+        return value.astimezone(field_timezone).strftime(output_format)
+
+    return convert
+
+
+class RowSerializer:
+    """
+    Read-only fast path of a model serializer, for large listings.
+
+    Rows are fetched with `values_list(*row_serializer.columns)` instead of as
+    model instances, and converted by one precompiled converter per field.
+    Fields whose database value is their representation are copied as is. The
+    result is the same as the representation of the model serializer.
+
+    Supports plain model fields, primary key relations and datetimes; other
+    fields, e.g. nested serializers, must be excluded and added by the caller.
+    """
+
+    def __init__(self, serializer_class, exclude=()):
+        self.fields = {
+            name: field
+            for name, field in serializer_class().fields.items()
+            if name not in exclude
+        }
+        self.columns = []
+        for name, field in self.fields.items():
+            if isinstance(field, serializers.RelatedField):
+                self.columns.append(f"{field.source}_id")
+            elif isinstance(field, (serializers.DateTimeField, *PLAIN_FIELDS)):
+                self.columns.append(field.source)
+            else:
+                raise TypeError(f"Field {name} cannot be read from a database row.")
+
+    def get_converters(self):
+        """
+        Returns the (column index, converter) pairs of the fields to convert.
+        """
+        return [
+            (index, datetime_converter(field))
+            for index, field in enumerate(self.fields.values())
+            if isinstance(field, serializers.DateTimeField)
+        ]
+
+    def to_representation(self, rows):
+        """
+        Returns the representation of rows of the `columns` values.
+        """
+        names = list(self.fields)
+        converters = self.get_converters()
+        data = []
+        for row in rows:
+            values = list(row)
+            for index, convert in converters:
+                values[index] = convert(values[index])
+            data.append(dict(zip(names, values)))
+        return data
+
+
+class TaskSearchResultSerializer(TaskSerializer):
+    """
+    Serializer for tasks found by the task search.
+
+    Fields:
+    - rank: Relevance of the task, higher is better, comparable within one
+      response (null when the database cannot rank).
+    """
+
+    rank = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ["rank"]
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for the ArchivedTask model.
+
+    Fields:
+    - The fields of `TaskSerializer`, with `case` holding the case primary key.
+    - archived_date: Date when the task was archived.
+    """
+
+    case = serializers.IntegerField(source="case_id", read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        fields = TaskSerializer.Meta.fields + ["archived_date"]
+        read_only_fields = fields
+
+
+class ArchivedCaseSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for the ArchivedCase model.
+
+    Fields:
+    - pk: Primary key of the case.
+    - title: Title of the case.
+    - status: Status of the case.
+    - archived_date: Date when the case was archived.
+    """
+
+    class Meta:
+        model = ArchivedCase
+        fields = ["pk", "title", "status", "archived_date"]
+        read_only_fields = fields
+
+
+class TaskSearchQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the task search endpoint.
+
+    Fields:
+    - q: Words to search in the task title, description and case title.
+    - limit: Maximum number of tasks returned.
+    """
+
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(
+        required=False, default=20, min_value=1, max_value=100
+    )
+
+    def validate_q(self, value):
+        """
+        Ensures that the query contains at least one word.
+        """
+        if not search_terms(value):
+            raise serializers.ValidationError(_("Enter at least one word."))
+        return value
+
+
+class TaskSyncQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the task sync endpoint.
+
+    Fields:
+    - since: Watermark returned by the previous sync (optional).
+    """
+
+    since = serializers.DateTimeField(required=False)
+
+
+class TaskAnalyticsQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the task analytics endpoint.
+
+    Fields:
+    - case: Primary key of the case to analyse (optional, all cases by default).
+    - days: Number of past days of finished tasks to analyse.
+    - period: Throughput period, `day` or `week`.
+    - source: `tasks` for exact numbers, `rollup` for the precomputed daily rollups.
+    """
+
+    case = serializers.IntegerField(required=False, min_value=1)
+    days = serializers.IntegerField(
+        required=False, default=30, min_value=1, max_value=366
+    )
+    period = serializers.ChoiceField(choices=["day", "week"], default="day")
+    source = serializers.ChoiceField(choices=["tasks", "rollup"], default="tasks")
+
+
+class TaskExportQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the task export endpoint.
+
+    Fields:
+    - output: Export format, `ndjson` (one JSON task per line) or `csv`.
+    - group: `case` to order the tasks by case and add the case title and status.
+    """
+
+    output = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    group = serializers.ChoiceField(choices=["case"], required=False)
+
+
+class TaskImportSerializer(serializers.Serializer):
+    """
+    Validates the upload of the task import endpoint.
+
+    Fields:
+    - file: NDJSON or CSV file with one task per row.
+    - input: Input format, `ndjson` or `csv`, guessed from the file extension by default.
+    """
+
+    file = serializers.FileField()
+    input = serializers.ChoiceField(choices=["ndjson", "csv"], required=False)
@@ -0,0 +1,213 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .authentication import invalidate_cached_user
+from .cache import invalidate_user
+from .counters import add_to_counter, recount_cases
+from .models import ArchivedCase, ArchivedTask, Case, Task, TaskTombstone
+
+# Sent after set-based task writes (bulk_create, bulk_update, queryset updates)
+# that bypass the model signals. Arguments: user_ids, case_ids.
+tasks_changed = Signal()
+
+
+def invalidate_users(user_ids):
+    """
+    Invalidates the cached responses of the users now and after commit.
+
+    The second invalidation drops responses that concurrent requests may have
+    cached from data read before the transaction was committed.
+    """
+    user_ids = set(user_ids)
+    for user_id in user_ids:
+        invalidate_user(user_id)
+    transaction.on_commit(lambda: [invalidate_user(pk) for pk in user_ids])
+
+
+def is_cascade(origin):
+    """
+    Tells whether a task is deleted as part of deleting its case or user.
+
+    Derived data of the case is dropped together with the case, so it does not
+    need to be maintained task by task during a cascade.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is not Task
+    return origin is not None and not isinstance(origin, Task)
+
+
+def is_user_deletion(origin):
+    """
+    Tells whether the deletion was started by deleting a user.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is User
+
+
+def touch_cases(case_ids):
+    """
+    Bumps the change timestamp of the cases after one of their tasks changed.
+    """
+    case_ids = {pk for pk in case_ids if pk is not None}
+    if case_ids:
+        Case.objects.filter(pk__in=case_ids).update(last_updated_date=timezone.now())
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Case)
+@receiver(post_delete, sender=Case)
+def invalidate_owner_cache(sender, instance, origin=None, **kwargs):
+    """
+    Handles invalidating the owner's cached responses when a task or case changes.
+    """
+    if sender is Task and is_cascade(origin):
+        return
+    invalidate_users([instance.user_id])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def touch_task_cases(sender, instance, origin=None, **kwargs):
+    """
+    Handles bumping the change timestamp of the task case, and of the case the
+    task was moved from.
+    """
+    if is_cascade(origin):
+        return
+    touch_cases([instance.case_id, getattr(instance, "_loaded_case_id", None)])
+
+
+def loaded_counter_key(instance):
+    """
+    Returns the counter the task was counted in when it was loaded, or None if
+    it is unknown, e.g. for tasks saved without loading them.
+    """
+    key = tuple(
+        getattr(instance, name, None)
+        for name in ("_loaded_user_id", "_loaded_case_id", "_loaded_status")
+    )
+    return None if None in key else key
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, **kwargs):
+    """
+    Handles counting a created task, and moving a task between counters when
+    its status, case or owner changed.
+    """
+    key = (instance.user_id, instance.case_id, instance.status)
+    if created:
+        add_to_counter(*key, 1)
+        return
+    loaded = loaded_counter_key(instance)
+    if loaded is None:
+        recount_cases([instance.case_id, getattr(instance, "_loaded_case_id", None)])
+    elif loaded != key:
+        add_to_counter(*loaded, -1)
+        add_to_counter(*key, 1)
+
+
+@receiver(post_save, sender=Task)
+def remember_saved_task(sender, instance, **kwargs):
+    """
+    Handles remembering the saved case, status and owner as the loaded ones.
+
+    Connected after the receivers that compare them with the saved values.
+    """
+    instance._loaded_case_id = instance.case_id
+    instance._loaded_status = instance.status
+    instance._loaded_user_id = instance.user_id
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, origin=None, **kwargs):
+    """
+    Handles uncounting a deleted task. Counters of deleted cases are deleted
+    with them.
+    """
+    if is_cascade(origin):
+        return
+    loaded = loaded_counter_key(instance)
+    if loaded is None:
+        recount_cases([instance.case_id])
+    else:
+        add_to_counter(*loaded, -1)
+
+
+@receiver(tasks_changed)
+def invalidate_changed_users_cache(sender, user_ids, **kwargs):
+    """
+    Handles invalidating cached responses after set-based task writes.
+    """
+    invalidate_users(user_ids)
+
+
+@receiver(tasks_changed)
+def touch_changed_cases(sender, case_ids, **kwargs):
+    """
+    Handles bumping the change timestamp of cases after set-based task writes.
+    """
+    touch_cases(case_ids)
+
+
+@receiver(tasks_changed)
+def recount_changed_cases(sender, case_ids, **kwargs):
+    """
+    Handles recomputing the task counters of cases after set-based task writes.
+    """
+    recount_cases(case_ids)
+
+
+@receiver(post_delete, sender=Task)
+def record_task_tombstone(sender, instance, origin=None, **kwargs):
+    """
+    Handles recording a deleted task for syncing clients.
+    """
+    if is_cascade(origin):
+        return
+    TaskTombstone.objects.create(task_id=instance.pk, user_id=instance.user_id)
+
+
+@receiver(pre_delete, sender=Case)
+def record_case_task_tombstones(sender, instance, origin=None, **kwargs):
+    """
+    Handles recording all tasks of a deleted case with batched inserts.
+
+    Tombstones are not needed when the whole user is deleted.
+    """
+    if is_user_deletion(origin):
+        return
+    now = timezone.now()
+    TaskTombstone.objects.bulk_create(
+        (
+            TaskTombstone(task_id=pk, user_id=instance.user_id, deleted_date=now)
+            for pk in instance.tasks.values_list("pk", flat=True).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+@receiver(post_delete, sender=Case)
+def delete_archived_case_tasks(sender, instance, origin=None, **kwargs):
+    """
+    Handles deleting the archived tasks of a deleted case, unless the case
+    itself was archived. Archived tasks of a deleted user are deleted with them.
+    """
+    if is_user_deletion(origin):
+        return
+    if not ArchivedCase.objects.filter(pk=instance.pk).exists():
+        ArchivedTask.objects.filter(case_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authentication_cache(sender, instance, **kwargs):
+    """
+    Handles dropping the cached authenticated user when the user changes.
+    """
+    invalidate_cached_user(instance.pk)
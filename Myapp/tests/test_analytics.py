@@ -0,0 +1,173 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task, TaskDailyRollup
+
+
+class TaskAnalyticsAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("tasks_analytics")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.now = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+
+    def create_task(self, created, completed=None, case=None, user=None):
+        task = Task.objects.create(
+            case=case or self.case, user=user or self.user, title="Task"
+        )
+        Task.objects.filter(pk=task.pk).update(
+            creation_date=created,
+            completed_date=completed,
+            status="FINISHED" if completed else "CREATED",
+        )
+        return task
+
+    def create_finished_tasks(self):
+        # Lead times of 1 to 10 hours, finished on the two previous days.
+        for hours in range(1, 11):
+            completed = self.now - timedelta(days=1 + hours % 2)
+            self.create_task(completed - timedelta(hours=hours), completed)
+
+    def get(self, **params):
+        cache.clear()
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def test_lead_time_percentiles(self):
+        self.create_finished_tasks()
+        data = self.get()
+        self.assertEqual(
+            data["lead_time"],
+            {"finished": 10, "p50": 5 * 3600.0, "p90": 9 * 3600.0, "p99": 10 * 3600.0},
+        )
+
+    def test_lead_time_without_finished_tasks(self):
+        self.create_task(self.now)
+        data = self.get()
+        self.assertEqual(
+            data["lead_time"], {"finished": 0, "p50": None, "p90": None, "p99": None}
+        )
+        self.assertEqual(data["throughput"], [])
+
+    def test_lead_time_only_counts_the_period_case_and_user(self):
+        self.create_finished_tasks()
+        self.create_task(self.now - timedelta(days=50), self.now - timedelta(days=40))
+        other_case = Case.objects.create(title="Other case", user=self.user)
+        self.create_task(self.now - timedelta(days=2), self.now, case=other_case)
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        other_user_case = Case.objects.create(title="Other", user=other_user)
+        self.create_task(
+            self.now - timedelta(days=2),
+            self.now,
+            case=other_user_case,
+            user=other_user,
+        )
+
+        self.assertEqual(self.get()["lead_time"]["finished"], 11)
+        self.assertEqual(self.get(case=self.case.pk)["lead_time"]["finished"], 10)
+        self.assertEqual(self.get(days=60)["lead_time"]["finished"], 12)
+
+    def test_throughput_per_day_and_week(self):
+        self.create_finished_tasks()
+        day = (self.now - timedelta(days=2)).date()
+        self.assertEqual(
+            self.get()["throughput"],
+            [
+                {"period": day.isoformat(), "finished": 5},
+                {"period": (day + timedelta(days=1)).isoformat(), "finished": 5},
+            ],
+        )
+        weeks = self.get(period="week")["throughput"]
+        self.assertEqual(sum(week["finished"] for week in weeks), 10)
+        for week in weeks:
+            self.assertEqual(
+                timezone.datetime.fromisoformat(week["period"]).weekday(), 0
+            )
+
+    def test_ageing_of_unfinished_tasks(self):
+        for days in (0.5, 3, 10, 40, 50):
+            self.create_task(self.now - timedelta(days=days))
+        self.create_task(self.now - timedelta(days=3), self.now)
+        self.assertEqual(
+            self.get()["ageing"], {"0-1d": 1, "1-7d": 1, "7-30d": 1, "30d+": 2}
+        )
+
+    def test_rollup_source(self):
+        self.create_finished_tasks()
+        call_command("refresh_task_rollups", stdout=StringIO())
+        tasks = self.get()
+        rollup = self.get(source="rollup")
+        self.assertEqual(rollup["source"], "rollup")
+        self.assertEqual(rollup["throughput"], tasks["throughput"])
+        self.assertEqual(rollup["ageing"], tasks["ageing"])
+        # Lead times of 4 to 10 hours fall into the range up to one day.
+        self.assertEqual(
+            rollup["lead_time"],
+            {"finished": 10, "p50": 86400.0, "p90": 86400.0, "p99": 86400.0},
+        )
+
+    def test_incremental_rollup_refresh(self):
+        old = self.create_task(
+            self.now - timedelta(days=20), self.now - timedelta(days=10)
+        )
+        changed = self.create_task(
+            self.now - timedelta(days=21), self.now - timedelta(days=11)
+        )
+        call_command("refresh_task_rollups", stdout=StringIO())
+        self.assertEqual(TaskDailyRollup.objects.count(), 2)
+
+        # Changed tasks are recomputed, deletions of old tasks need --full.
+        moved_case = Case.objects.create(title="Moved", user=self.user)
+        Task.objects.filter(pk=changed.pk).update(
+            case=moved_case, last_updated_date=timezone.now()
+        )
+        Task.objects.filter(pk=old.pk).delete()
+        call_command("refresh_task_rollups", stdout=StringIO())
+        self.assertEqual(
+            set(TaskDailyRollup.objects.values_list("case_id", flat=True)),
+            {self.case.pk, moved_case.pk},
+        )
+
+        call_command("refresh_task_rollups", full=True, stdout=StringIO())
+        self.assertEqual(
+            list(TaskDailyRollup.objects.values_list("case_id", "finished")),
+            [(moved_case.pk, 1)],
+        )
+
+    @override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=300)
+    def test_rollup_refresh_invalidates_cached_analytics(self):
+        self.create_finished_tasks()
+        call_command("refresh_task_rollups", stdout=StringIO())
+        self.assertEqual(self.get(source="rollup")["lead_time"]["finished"], 10)
+        Task.objects.filter(user=self.user).update(completed_date=None)
+        # Served from the cache until the rollups are refreshed.
+        response = self.client.get(self.url, {"source": "rollup"})
+        self.assertEqual(response.data["lead_time"]["finished"], 10)
+
+        call_command("refresh_task_rollups", full=True, stdout=StringIO())
+        response = self.client.get(self.url, {"source": "rollup"})
+        self.assertEqual(response.data["lead_time"]["finished"], 0)
+
+    def test_invalid_parameters(self):
+        for params in ({"period": "month"}, {"days": 0}, {"source": "cache"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
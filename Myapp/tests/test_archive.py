@@ -0,0 +1,211 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.analytics import refresh_rollups
+from Myapp.counters import find_drift
+from Myapp.models import (
+    ArchivedCase,
+    ArchivedTask,
+    Case,
+    Task,
+    TaskDailyRollup,
+    TaskTombstone,
+)
+
+
+class ArchiveTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.old = timezone.now() - timedelta(days=100)
+        self.case = Case.objects.create(title="Case", user=self.user)
+
+    def create_task(self, title, completed=None, case=None):
+        task = Task.objects.create(
+            case=case or self.case,
+            user=self.user,
+            title=title,
+            description="",
+            status="FINISHED" if completed else "CREATED",
+        )
+        if completed:
+            Task.objects.filter(pk=task.pk).update(
+                creation_date=completed - timedelta(hours=1), completed_date=completed
+            )
+        return task
+
+    def create_closed_case(self, title, updated, *task_titles):
+        case = Case.objects.create(title=title, user=self.user)
+        for task_title in task_titles or [f"{title} task"]:
+            self.create_task(task_title, self.old, case=case)
+        Case.objects.filter(pk=case.pk).update(
+            status="CLOSED", last_updated_date=updated
+        )
+        return case
+
+    def archive(self, *args):
+        out = StringIO()
+        call_command("archive_tasks", *args, stdout=out)
+        return out.getvalue()
+
+    def titles(self, url_name):
+        cache.clear()
+        response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(item["title"] for item in response.data["results"])
+
+    def test_archive_old_finished_tasks(self):
+        old = self.create_task("Old", self.old)
+        self.create_task("Recent", timezone.now() - timedelta(days=10))
+        self.create_task("Open")
+        self.titles("tasks_list_create")
+
+        output = self.archive()
+
+        self.assertIn("Archived 0 cases with 0 tasks and 1 other tasks.", output)
+        self.assertEqual(self.titles("tasks_list_create"), ["Open", "Recent"])
+        self.assertEqual(self.titles("archived_tasks_list"), ["Old"])
+        archived = ArchivedTask.objects.get()
+        self.assertEqual(
+            (archived.pk, archived.case_id, archived.creation_date),
+            (old.pk, self.case.pk, self.old - timedelta(hours=1)),
+        )
+        self.assertTrue(TaskTombstone.objects.filter(task_id=old.pk).exists())
+        self.assertEqual(find_drift(), {})
+
+        self.assertIn("and 1 other tasks.", self.archive("--days", "5"))
+        self.assertEqual(self.titles("tasks_list_create"), ["Open"])
+
+    def test_archive_closed_cases(self):
+        old_case = self.create_closed_case("Old", self.old)
+        self.create_closed_case("Recent", timezone.now())
+        busy_case = self.create_closed_case("Busy", self.old)
+        self.create_task("Unfinished", case=busy_case)
+        Case.objects.filter(pk=busy_case.pk).update(last_updated_date=self.old)
+
+        output = self.archive("--batch-size", "1")
+
+        self.assertIn("Archived 1 cases with 1 tasks and 2 other tasks.", output)
+        self.assertEqual(self.titles("archived_cases_list"), ["Old"])
+        self.assertEqual(self.titles("cases_list_create"), ["Busy", "Case", "Recent"])
+        self.assertEqual(
+            list(ArchivedTask.objects.filter(case_id=old_case.pk).values_list("title")),
+            [("Old task",)],
+        )
+        self.assertEqual(self.titles("tasks_list_create"), ["Unfinished"])
+        self.assertEqual(find_drift(), {})
+
+    def test_restore_task_with_its_case(self):
+        case = self.create_closed_case("Old", self.old, "Old task", "Other")
+        task = Task.objects.get(title="Old task")
+        self.archive()
+        archived = ArchivedTask.objects.get(pk=task.pk)
+        self.titles("tasks_list_create")
+
+        response = self.client.post(
+            reverse("archived_task_restore", kwargs={"pk": task.pk})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["pk"], task.pk)
+        restored = Task.objects.get(pk=task.pk)
+        self.assertEqual(
+            (restored.case_id, restored.creation_date, restored.completed_date),
+            (case.pk, archived.creation_date, archived.completed_date),
+        )
+        self.assertGreater(restored.last_updated_date, archived.archived_date)
+        self.assertEqual(Case.objects.get(pk=case.pk).status, "CLOSED")
+        self.assertFalse(ArchivedCase.objects.exists())
+        self.assertEqual(self.titles("archived_tasks_list"), ["Other"])
+        self.assertEqual(self.titles("tasks_list_create"), ["Old task"])
+        self.assertEqual(find_drift(), {})
+
+    def test_restore_case_with_its_tasks(self):
+        case = self.create_closed_case("Old", self.old, "Old task", "Other")
+        self.archive()
+
+        response = self.client.post(
+            reverse("archived_case_restore", kwargs={"pk": case.pk})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(task["title"] for task in response.data["tasks"]),
+            ["Old task", "Other"],
+        )
+        self.assertFalse(ArchivedCase.objects.exists())
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertEqual(self.titles("tasks_list_create"), ["Old task", "Other"])
+        self.assertEqual(find_drift(), {})
+
+    def test_rollups_follow_archival_and_restore(self):
+        for days in (100, 100, 95, 10):
+            self.create_task("Done", timezone.now() - timedelta(days=days))
+        refresh_rollups(full=True)
+
+        def rollups():
+            return sorted(
+                TaskDailyRollup.objects.values_list(
+                    "day", "lead_time_bucket", "finished"
+                )
+            )
+
+        before = rollups()
+        self.archive()
+        self.assertEqual([row[2] for row in rollups()], [1])
+        after = rollups()
+        refresh_rollups()
+        self.assertEqual(rollups(), after)
+
+        for task in ArchivedTask.objects.all():
+            self.client.post(reverse("archived_task_restore", kwargs={"pk": task.pk}))
+        self.assertEqual(rollups(), before)
+        refresh_rollups(full=True)
+        self.assertEqual(rollups(), before)
+
+    def test_archive_is_private_and_read_only(self):
+        task = self.create_task("Old", self.old)
+        case = self.create_closed_case("Closed", self.old)
+        self.archive()
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        self.client.force_authenticate(other_user)
+
+        self.assertEqual(self.titles("archived_tasks_list"), [])
+        for url_name, pk in (
+            ("archived_task_retrieve", task.pk),
+            ("archived_task_restore", task.pk),
+            ("archived_case_retrieve", case.pk),
+            ("archived_case_restore", case.pk),
+        ):
+            response = self.client.post(reverse(url_name, kwargs={"pk": pk}))
+            self.assertIn(
+                response.status_code,
+                (status.HTTP_404_NOT_FOUND, status.HTTP_405_METHOD_NOT_ALLOWED),
+            )
+        response = self.client.get(
+            reverse("archived_task_retrieve", kwargs={"pk": task.pk})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(ArchivedTask.objects.count(), 2)
+
+    def test_deleting_a_case_deletes_its_archived_tasks(self):
+        self.create_task("Old", self.old)
+        self.archive()
+        self.case.delete()
+        self.assertFalse(ArchivedTask.objects.exists())
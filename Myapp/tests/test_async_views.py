@@ -0,0 +1,155 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from Myapp.models import Case, Task
+
+
+class AsyncViewsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.tasks = [
+            Task.objects.create(case=self.case, user=self.user, title=f"Task {n}")
+            for n in range(3)
+        ]
+
+    def assertSameResponse(self, sync_url, async_url):
+        sync_response = self.client.get(sync_url)
+        async_response = self.client.get(async_url)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        # Next page links point to the view that served the page.
+        sync_path, async_path = (url.split("?")[0] for url in (sync_url, async_url))
+        self.assertEqual(
+            async_response.content,
+            sync_response.content.replace(sync_path.encode(), async_path.encode()),
+        )
+        return async_response
+
+    def test_task_list_matches_sync_view(self):
+        response = self.assertSameResponse(
+            reverse("tasks_list_create") + "?page_size=2&ordering=-creation_date",
+            reverse("async_tasks_list_create") + "?page_size=2&ordering=-creation_date",
+        )
+        self.assertEqual(len(response.json()["results"]), 2)
+        self.assertIsNotNone(response.json()["next"])
+
+    def test_task_list_filters(self):
+        self.tasks[0].status = "FINISHED"
+        self.tasks[0].save()
+        response = self.client.get(
+            reverse("async_tasks_list_create"), {"status": "FINISHED"}
+        )
+        self.assertEqual(
+            [task["pk"] for task in response.json()["results"]], [self.tasks[0].pk]
+        )
+        response = self.client.get(
+            reverse("async_tasks_list_create"), {"status": "UNKNOWN"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", response.json())
+
+    def test_task_retrieve_matches_sync_view(self):
+        pk = self.tasks[1].pk
+        self.assertSameResponse(
+            reverse("task_retrieve_update_destroy", args=[pk]),
+            reverse("async_task_retrieve", args=[pk]),
+        )
+        self.assertSameResponse(
+            reverse("task_retrieve_update_destroy", args=[999]),
+            reverse("async_task_retrieve", args=[999]),
+        )
+
+    def test_task_retrieve_of_other_user_is_not_found(self):
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        other_case = Case.objects.create(title="Other case", user=other_user)
+        task = Task.objects.create(case=other_case, user=other_user, title="Other")
+        response = self.client.get(reverse("async_task_retrieve", args=[task.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_task_create(self):
+        response = self.client.post(
+            reverse("async_tasks_list_create"),
+            {
+                "case": self.case.pk,
+                "title": "New task",
+                "description": "Created asynchronously",
+                "status": "FINISHED",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.get(pk=response.json()["pk"])
+        self.assertEqual(task.user, self.user)
+        self.assertIsNotNone(task.completed_date)
+        self.assertEqual(response.json()["title"], "New task")
+
+    def test_task_create_validates_case(self):
+        closed_case = Case.objects.create(
+            title="Closed", user=self.user, status=Case.StatusChoice.CLOSED
+        )
+        for case, message in (
+            (closed_case.pk, "You cannot add task to closed case."),
+            (999, 'Invalid pk "999" - object does not exist.'),
+        ):
+            response = self.client.post(
+                reverse("async_tasks_list_create"),
+                {"case": case, "title": "New task", "description": "Description"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.json()["case"], [message])
+
+    def test_case_list_and_retrieve_match_sync_views(self):
+        Case.objects.create(title="Second case", user=self.user)
+        for query in ("", "?tasks=summary"):
+            self.assertSameResponse(
+                reverse("cases_list_create") + query,
+                reverse("async_cases_list_create") + query,
+            )
+            self.assertSameResponse(
+                reverse("case_retrieve_update_destroy", args=[self.case.pk]) + query,
+                reverse("async_case_retrieve", args=[self.case.pk]) + query,
+            )
+
+    def test_case_create(self):
+        response = self.client.post(
+            reverse("async_cases_list_create"), {"title": "New case"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Case.objects.filter(user=self.user, title="New case").exists())
+
+    def test_create_is_exempt_from_csrf_checks(self):
+        client = APIClient(enforce_csrf_checks=True)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        for url, data in (
+            (
+                reverse("async_tasks_list_create"),
+                {"case": self.case.pk, "title": "New task", "description": "Task"},
+            ),
+            (reverse("async_cases_list_create"), {"title": "New case"}),
+        ):
+            response = client.post(url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.get(reverse("async_tasks_list_create"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        response = self.client.get(reverse("async_tasks_list_create"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_method_not_allowed(self):
+        response = self.client.delete(reverse("async_tasks_list_create"))
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
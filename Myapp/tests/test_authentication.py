@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.authentication import USER_KEY, CachedJWTAuthentication
+
+
+@override_settings(SHARED_CACHE=True, AUTH_USER_CACHE_TIMEOUT=60)
+class CachedJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("task_retrieve_update_destroy", args=[999])
+
+    def test_user_is_loaded_once(self):
+        self.client.get(self.url)
+        # The ETag aggregate and the task lookup, no user SELECT.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_can_be_disabled(self):
+        with self.settings(AUTH_USER_CACHE_TIMEOUT=0):
+            self.client.get(self.url)
+            with self.assertNumQueries(3):
+                self.client.get(self.url)
+
+    def test_deactivated_user_is_rejected_at_once(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_drops_cached_user(self):
+        self.client.get(self.url)
+        self.user.set_password("newpassword")
+        self.user.save()
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    def test_deleted_user_is_rejected_at_once(self):
+        self.client.get(self.url)
+        self.user.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_is_disabled_without_shared_cache(self):
+        with self.settings(SHARED_CACHE=False):
+            self.client.get(self.url)
+            with self.assertNumQueries(3):
+                self.client.get(self.url)
+
+    def test_password_hash_is_not_cached(self):
+        self.client.get(self.url)
+        cached = cache.get(USER_KEY.format(user_id=self.user.pk))
+        self.assertEqual(cached["username"], "testuser")
+        self.assertNotIn("password", cached)
+        self.assertNotIn(self.user.password, cached.values())
+
+    def test_cached_user_loads_other_fields_on_access(self):
+        self.user.email = "testuser@example.com"
+        self.user.save()
+        self.client.get(self.url)
+        authentication = CachedJWTAuthentication()
+        token = authentication.get_validated_token(self.access_token)
+        with self.assertNumQueries(0):
+            user = authentication.get_user(token)
+        self.assertEqual((user.pk, user.is_active), (self.user.pk, True))
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "testuser@example.com")
@@ -0,0 +1,104 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.cache import get_stats
+from Myapp.models import Case, Task
+
+
+@override_settings(
+    SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=300, AUTH_USER_CACHE_TIMEOUT=60
+)
+class ResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.task = Task.objects.create(case=self.case, user=self.user, title="Task")
+
+    def test_repeated_get_is_served_from_cache(self):
+        url = reverse("cases_list_create")
+        first = self.client.get(url)
+        # Only the ETag aggregate hits the database, the user is cached too.
+        with self.assertNumQueries(1):
+            second = self.client.get(url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(get_stats()["hits"], 1)
+        self.assertEqual(get_stats()["misses"], 1)
+
+    def test_query_string_is_part_of_the_key(self):
+        url = reverse("cases_list_create")
+        self.client.get(url)
+        response = self.client.get(url + "?tasks=summary")
+        self.assertIn("task_counts", response.data["results"][0])
+
+    def test_task_save_invalidates_case_detail(self):
+        url = reverse("case_retrieve_update_destroy", args=[self.case.pk])
+        self.client.get(url)
+        self.task.title = "Renamed"
+        self.task.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["tasks"][0]["title"], "Renamed")
+
+    def test_delete_invalidates_list(self):
+        url = reverse("tasks_list_create")
+        self.client.get(url)
+        self.task.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.data["results"], [])
+
+    def test_api_write_invalidates_list(self):
+        url = reverse("cases_list_create")
+        self.client.get(url)
+        self.client.post(url, {"title": "New case"}, format="json")
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_bulk_create_invalidates_list(self):
+        url = reverse("tasks_list_create")
+        self.client.get(url)
+        self.client.post(
+            reverse("tasks_bulk"),
+            [{"case": self.case.pk, "title": "Bulk", "description": "Bulk"}],
+            format="json",
+        )
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_cache_is_per_user(self):
+        url = reverse("tasks_list_create")
+        self.client.get(url)
+        User.objects.create_user(username="otheruser", password="password")
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "otheruser", "password": "password"},
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        response = self.client.get(url)
+        self.assertEqual(response.data["results"], [])
+
+    def test_cache_can_be_disabled(self):
+        url = reverse("tasks_list_create")
+        with self.settings(RESPONSE_CACHE_TIMEOUT=0):
+            self.client.get(url)
+            self.client.get(url)
+        self.assertEqual(get_stats()["hits"], 0)
+
+    def test_cache_is_disabled_without_shared_cache(self):
+        url = reverse("tasks_list_create")
+        with self.settings(SHARED_CACHE=False):
+            self.client.get(url)
+            self.client.get(url)
+        self.assertEqual(get_stats()["misses"], 0)
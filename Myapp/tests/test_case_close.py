@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.analytics import refresh_rollups
+from Myapp.counters import find_drift
+from Myapp.models import Case, Task, TaskDailyRollup
+
+
+class CaseCloseTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.completed = timezone.now() - timedelta(days=2)
+        self.finished = Task.objects.create(
+            case=self.case, user=self.user, title="Finished", status="FINISHED"
+        )
+        Task.objects.filter(pk=self.finished.pk).update(completed_date=self.completed)
+        for task_status in ("CREATED", "CREATED", "IN_PROGRESS"):
+            Task.objects.create(
+                case=self.case, user=self.user, title="Open", status=task_status
+            )
+
+    def close(self, case=None):
+        return self.client.post(
+            reverse("case_close", kwargs={"pk": (case or self.case).pk})
+        )
+
+    def test_close_case_finishes_open_tasks(self):
+        self.client.get(reverse("tasks_list_create"))
+
+        response = self.close()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "pk": self.case.pk,
+                "status": "CLOSED",
+                "closed": True,
+                "tasks_finished": 3,
+            },
+        )
+        self.assertEqual(Case.objects.get(pk=self.case.pk).status, "CLOSED")
+        self.assertFalse(self.case.tasks.exclude(status="FINISHED").exists())
+        self.assertFalse(self.case.tasks.filter(completed_date__isnull=True).exists())
+        self.assertEqual(
+            Task.objects.get(pk=self.finished.pk).completed_date, self.completed
+        )
+        self.assertEqual(find_drift(), {})
+        response = self.client.get(reverse("tasks_list_create"))
+        self.assertEqual(
+            {task["status"] for task in response.data["results"]}, {"FINISHED"}
+        )
+
+    def test_closing_again_changes_nothing(self):
+        self.close()
+        response = self.close()
+        self.assertEqual(
+            (response.data["closed"], response.data["tasks_finished"]), (False, 0)
+        )
+
+    def test_query_count_does_not_depend_on_tasks(self):
+        counts = []
+        self.client.get(reverse("cases_list_create"))
+        for size in (1, 10):
+            case = Case.objects.create(title=f"Case {size}", user=self.user)
+            for _ in range(size):
+                Task.objects.create(case=case, user=self.user, title="Open")
+            with CaptureQueriesContext(connection) as queries:
+                self.close(case)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_rollups_follow_closed_tasks(self):
+        refresh_rollups(full=True)
+        self.close()
+        refresh_rollups()
+        rollups = sorted(TaskDailyRollup.objects.values_list("day", "finished"))
+        refresh_rollups(full=True)
+        self.assertEqual(
+            sorted(TaskDailyRollup.objects.values_list("day", "finished")), rollups
+        )
+        self.assertEqual(sum(finished for _, finished in rollups), 4)
+
+    def test_cannot_close_other_users_case(self):
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        other_case = Case.objects.create(title="Other", user=other_user)
+        response = self.close(other_case)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Case.objects.get(pk=other_case.pk).status, "OPEN")
@@ -0,0 +1,131 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.analytics import refresh_rollups
+from Myapp.counters import find_drift
+from Myapp.deletion import delete_case
+from Myapp.models import (
+    ArchivedTask,
+    Case,
+    Task,
+    TaskCounter,
+    TaskDailyRollup,
+    TaskTombstone,
+)
+
+
+class CaseDeleteTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Big case", user=self.user)
+        self.other_case = Case.objects.create(title="Other case", user=self.user)
+        self.other_task = self.create_tasks(1, self.other_case)[0]
+
+    def create_tasks(self, count, case=None):
+        tasks = []
+        for number in range(count):
+            task = Task.objects.create(
+                case=case or self.case,
+                user=self.user,
+                title=f"Task {number}",
+                status="FINISHED" if number % 2 else "CREATED",
+            )
+            tasks.append(task)
+        finished = Task.objects.filter(pk__in=[task.pk for task in tasks[1::2]])
+        finished.update(completed_date=timezone.now() - timedelta(days=1))
+        return tasks
+
+    def delete(self, case):
+        return self.client.delete(
+            reverse("case_retrieve_update_destroy", kwargs={"pk": case.pk})
+        )
+
+    @override_settings(CASE_DELETE_BATCH_SIZE=2)
+    def test_delete_case_in_batches(self):
+        pks = [task.pk for task in self.create_tasks(5)]
+        refresh_rollups(full=True)
+        self.client.get(reverse("tasks_list_create"))
+
+        response = self.delete(self.case)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Case.objects.filter(pk=self.case.pk).exists())
+        self.assertFalse(Task.objects.filter(pk__in=pks).exists())
+        self.assertCountEqual(
+            TaskTombstone.objects.values_list("task_id", flat=True), pks
+        )
+        self.assertFalse(TaskCounter.objects.filter(case_id=self.case.pk).exists())
+        self.assertFalse(TaskDailyRollup.objects.filter(case_id=self.case.pk).exists())
+        self.assertEqual(find_drift(), {})
+        response = self.client.get(reverse("tasks_list_create"))
+        self.assertEqual(
+            [task["pk"] for task in response.data["results"]], [self.other_task.pk]
+        )
+
+    def test_query_count_does_not_depend_on_tasks(self):
+        counts = []
+        # Warms up the first request, so both deletions run the same queries.
+        self.client.get(reverse("cases_list_create"))
+        for size in (2, 20):
+            case = Case.objects.create(title=f"Case {size}", user=self.user)
+            self.create_tasks(size, case)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.delete(case).status_code, 204)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    @override_settings(CASE_DELETE_BATCH_SIZE=2)
+    def test_interrupted_deletion_leaves_a_consistent_case(self):
+        self.create_tasks(5)
+        refresh_rollups(full=True)
+
+        with mock.patch.object(Case, "delete", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                delete_case(self.case, 2)
+
+        # The last batch is rolled back with the case.
+        self.assertEqual(self.case.tasks.count(), 1)
+        self.assertEqual(TaskTombstone.objects.count(), 4)
+        self.assertEqual(find_drift(), {})
+        rollups = list(TaskDailyRollup.objects.values_list("case_id", "finished"))
+        refresh_rollups(full=True)
+        self.assertEqual(
+            list(TaskDailyRollup.objects.values_list("case_id", "finished")), rollups
+        )
+
+    def test_delete_case_returns_deleted_tasks(self):
+        self.create_tasks(3)
+        ArchivedTask.objects.create(
+            id=10**6,
+            user=self.user,
+            case_id=self.case.pk,
+            title="Archived",
+            description="",
+            status="FINISHED",
+            creation_date=timezone.now(),
+            last_updated_date=timezone.now(),
+            archived_date=timezone.now(),
+        )
+
+        self.assertEqual(delete_case(self.case, 1), 3)
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertTrue(Task.objects.filter(pk=self.other_task.pk).exists())
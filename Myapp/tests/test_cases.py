@@ -3,7 +3,7 @@ from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient, APITestCase
 
-from Myapp.models import Case, User
+from Myapp.models import Case, Task, User
 
 
 class CaseAPITestCase(APITestCase):
@@ -39,7 +39,7 @@ class CaseAPITestCase(APITestCase):
         other_case = Case.objects.create(user=other_user, title="Other user's case")
         response = self.client.get(reverse("cases_list_create"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        case_ids = [case["pk"] for case in response.data]
+        case_ids = [case["pk"] for case in response.data["results"]]
         self.assertIn(user_case.id, case_ids)
         self.assertNotIn(other_case.id, case_ids)
 
@@ -108,11 +108,12 @@ class CaseAPITestCase(APITestCase):
         url = reverse("cases_list_create")
         response = self.client.get(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        self.assertEqual(response.data[0]["title"], "Open test case 1")
-        self.assertEqual(response.data[0]["status"], "OPEN")
-        self.assertEqual(response.data[1]["title"], "Open test case 2")
-        self.assertEqual(response.data[1]["status"], "OPEN")
+        results = response.data["results"]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["title"], "Open test case 1")
+        self.assertEqual(results[0]["status"], "OPEN")
+        self.assertEqual(results[1]["title"], "Open test case 2")
+        self.assertEqual(results[1]["status"], "OPEN")
 
     def test_unauthenticated_user_retrieve_case_list(self):
         url = reverse("cases_list_create")
@@ -144,3 +145,53 @@ class CaseAPITestCase(APITestCase):
         url = reverse("case_retrieve_update_destroy", args=[self.case_1.id])
         response = self.unauthenticated_user.delete(url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def create_cases_with_tasks(self, number_of_cases):
+        for number in range(number_of_cases):
+            case = Case.objects.create(title=f"Case {number}", user=self.user)
+            for status_choice in Task.StatusChoice.values:
+                Task.objects.create(
+                    case=case, user=self.user, title="Task", status=status_choice
+                )
+
+    def test_case_list_query_count_does_not_depend_on_cases(self):
+        self.create_cases_with_tasks(5)
+        url = reverse("cases_list_create")
+        # User lookup, ETag aggregate, cases and one prefetch for all nested tasks.
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(len(response.data["results"][1]["tasks"]), 3)
+
+    def test_case_detail_prefetches_tasks(self):
+        self.create_cases_with_tasks(1)
+        case = Case.objects.last()
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                reverse("case_retrieve_update_destroy", args=[case.pk])
+            )
+        self.assertEqual(len(response.data["tasks"]), 3)
+
+    def test_case_list_task_summary(self):
+        self.create_cases_with_tasks(2)
+        url = reverse("cases_list_create") + "?tasks=summary"
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        results = response.data["results"]
+        self.assertNotIn("tasks", results[0])
+        self.assertEqual(
+            results[0]["task_counts"],
+            {"CREATED": 0, "IN_PROGRESS": 0, "FINISHED": 0},
+        )
+        self.assertEqual(
+            results[1]["task_counts"],
+            {"CREATED": 1, "IN_PROGRESS": 1, "FINISHED": 1},
+        )
+
+    def test_case_detail_task_summary(self):
+        self.create_cases_with_tasks(1)
+        case = Case.objects.last()
+        url = reverse("case_retrieve_update_destroy", args=[case.pk])
+        response = self.client.get(url + "?tasks=summary")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["task_counts"]["FINISHED"], 1)
@@ -0,0 +1,130 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from Myapp.checks import (
+    check_search_triggers,
+    check_shared_cache,
+    check_sqlite_pragmas,
+    verified_databases,
+    verify_sqlite_pragmas,
+)
+from Myapp.search import has_fts_index
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite specific check.")
+class SQLitePragmasCheckTestCase(SimpleTestCase):
+    # Outside of a transaction, where SQLite allows changing `synchronous`.
+    databases = {"default"}
+
+    def set_pragmas(self, pragmas):
+        with connection.cursor() as cursor:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            previous = {}
+            for name in ("synchronous", "cache_size", "busy_timeout"):
+                cursor.execute(f"PRAGMA {name}")
+                previous[name] = cursor.fetchone()[0]
+        self.addCleanup(self.set_pragmas, previous)
+
+    @override_settings(SQLITE_TUNING=False)
+    def test_check_is_disabled_without_tuning(self):
+        self.set_pragmas({"synchronous": "FULL"})
+        self.assertEqual(check_sqlite_pragmas(None, databases=["default"]), [])
+
+    @override_settings(SQLITE_TUNING=True)
+    def test_check_reports_pragmas_that_are_not_active(self):
+        self.set_pragmas({"synchronous": "FULL", "busy_timeout": 5000})
+        issues = check_sqlite_pragmas(None, databases=["default"])
+        self.assertEqual({issue.id for issue in issues}, {"Myapp.W001"})
+        messages = " ".join(issue.msg for issue in issues)
+        self.assertIn("synchronous of database 'default' is 2, expected 1", messages)
+        self.assertIn("busy_timeout of database 'default' is 5000", messages)
+
+    @override_settings(SQLITE_TUNING=True)
+    def test_check_passes_when_profile_is_active(self):
+        self.set_pragmas(settings.SQLITE_PRAGMAS)
+        self.set_pragmas({"busy_timeout": settings.SQLITE_BUSY_TIMEOUT * 1000})
+        self.assertEqual(check_sqlite_pragmas(None, databases=["default"]), [])
+
+    @override_settings(SQLITE_TUNING=True)
+    def test_check_skips_other_databases(self):
+        self.set_pragmas({"synchronous": "FULL"})
+        self.assertEqual(check_sqlite_pragmas(None, databases=None), [])
+
+    @override_settings(SQLITE_TUNING=True)
+    def test_first_connection_logs_pragmas_that_are_not_active(self):
+        self.set_pragmas({"synchronous": "FULL"})
+        verified_databases.discard("default")
+        self.addCleanup(verified_databases.discard, "default")
+
+        with self.assertLogs("Myapp.checks", "WARNING") as logs:
+            verify_sqlite_pragmas(None, connection)
+        self.assertIn(
+            "SQLite pragma synchronous of database 'default' is 2, expected 1",
+            logs.output[0],
+        )
+        with self.assertNoLogs("Myapp.checks"):
+            verify_sqlite_pragmas(None, connection)
+
+    @override_settings(SQLITE_TUNING=False)
+    def test_first_connection_is_not_verified_without_tuning(self):
+        self.set_pragmas({"synchronous": "FULL"})
+        verified_databases.discard("default")
+        with self.assertNoLogs("Myapp.checks"):
+            verify_sqlite_pragmas(None, connection)
+        self.assertNotIn("default", verified_databases)
+
+
+class SearchTriggersCheckTestCase(TestCase):
+    def setUp(self):
+        if not has_fts_index(connection):
+            self.skipTest("SQLite FTS5 specific check.")
+
+    def test_check_passes_with_triggers(self):
+        self.assertEqual(check_search_triggers(None, databases=["default"]), [])
+
+    def test_check_reports_missing_triggers(self):
+        # Rolled back with the test transaction.
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER "Myapp_task_fts_update"')
+        issues = check_search_triggers(None, databases=["default"])
+        self.assertEqual([issue.id for issue in issues], ["Myapp.W002"])
+        self.assertIn("Myapp_task_fts_update", issues[0].msg)
+
+
+class SharedCacheCheckTestCase(SimpleTestCase):
+    @override_settings(
+        SHARED_CACHE=False, RESPONSE_CACHE_TIMEOUT=300, AUTH_USER_CACHE_TIMEOUT=0
+    )
+    def test_check_reports_cache_without_shared_cache(self):
+        issues = check_shared_cache(None)
+        self.assertEqual([issue.id for issue in issues], ["Myapp.W003"])
+        self.assertIn("RESPONSE_CACHE_TIMEOUT", issues[0].msg)
+
+    @override_settings(
+        SHARED_CACHE=False, RESPONSE_CACHE_TIMEOUT=0, AUTH_USER_CACHE_TIMEOUT=60
+    )
+    def test_check_reports_user_cache_without_shared_cache(self):
+        issues = check_shared_cache(None)
+        self.assertEqual([issue.id for issue in issues], ["Myapp.W003"])
+        self.assertIn("AUTH_USER_CACHE_TIMEOUT", issues[0].msg)
+
+    @override_settings(SHARED_CACHE=False, METRICS_ENABLED=True)
+    def test_check_reports_metrics_without_shared_cache(self):
+        issues = check_shared_cache(None)
+        self.assertIn("Myapp.W004", [issue.id for issue in issues])
+
+    @override_settings(
+        SHARED_CACHE=True,
+        RESPONSE_CACHE_TIMEOUT=300,
+        AUTH_USER_CACHE_TIMEOUT=60,
+        METRICS_ENABLED=True,
+    )
+    def test_check_passes_with_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
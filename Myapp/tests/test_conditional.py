@@ -0,0 +1,105 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task
+
+
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.task = Task.objects.create(case=self.case, user=self.user, title="Task")
+
+    def test_list_has_validators(self):
+        response = self.client.get(reverse("tasks_list_create"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertNotIn("Last-Modified", response)
+
+    @override_settings(SHARED_CACHE=True, AUTH_USER_CACHE_TIMEOUT=60)
+    def test_matching_etag_returns_not_modified_without_serializing(self):
+        url = reverse("tasks_list_create")
+        etag = self.client.get(url)["ETag"]
+        # The ETag aggregate only, the user is cached by the first request.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since(self):
+        Task.objects.update(last_updated_date="2020-01-01T00:00:00Z")
+        url = reverse("task_retrieve_update_destroy", args=[self.task.pk])
+        last_modified = self.client.get(url)["Last-Modified"]
+        self.assertEqual(last_modified, "Wed, 01 Jan 2020 00:00:00 GMT")
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_no_last_modified_within_the_second_of_the_last_save(self):
+        url = reverse("task_retrieve_update_destroy", args=[self.task.pk])
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        # A save later in the same second must not be answered with 304.
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since_after_deleting_task(self):
+        other = Task.objects.create(case=self.case, user=self.user, title="Other")
+        Task.objects.update(last_updated_date="2020-01-01T00:00:00Z")
+        other.delete()
+        for url in (reverse("tasks_list_create"), reverse("cases_list_create")):
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE="Wed, 01 Jan 2020 00:00:00 GMT"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("Last-Modified", response)
+
+    def test_task_change_changes_task_and_case_etags(self):
+        task_url = reverse("task_retrieve_update_destroy", args=[self.task.pk])
+        case_url = reverse("case_retrieve_update_destroy", args=[self.case.pk])
+        task_etag = self.client.get(task_url)["ETag"]
+        case_etag = self.client.get(case_url)["ETag"]
+        self.client.patch(task_url, {"title": "Renamed"}, format="json")
+        response = self.client.get(case_url, HTTP_IF_NONE_MATCH=case_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], case_etag)
+        response = self.client.get(task_url, HTTP_IF_NONE_MATCH=task_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleting_task_changes_list_etags(self):
+        tasks_url = reverse("tasks_list_create")
+        cases_url = reverse("cases_list_create")
+        tasks_etag = self.client.get(tasks_url)["ETag"]
+        cases_etag = self.client.get(cases_url)["ETag"]
+        self.task.delete()
+        self.assertNotEqual(self.client.get(tasks_url)["ETag"], tasks_etag)
+        self.assertNotEqual(self.client.get(cases_url)["ETag"], cases_etag)
+
+    def test_moving_task_touches_both_cases(self):
+        other_case = Case.objects.create(title="Other case", user=self.user)
+        Case.objects.update(last_updated_date="2020-01-01T00:00:00Z")
+        task = Task.objects.get(pk=self.task.pk)
+        task.case = other_case
+        task.save()
+        self.case.refresh_from_db()
+        other_case.refresh_from_db()
+        self.assertGreater(self.case.last_updated_date.year, 2020)
+        self.assertGreater(other_case.last_updated_date.year, 2020)
+
+    def test_etag_depends_on_query(self):
+        url = reverse("cases_list_create")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url + "?tasks=summary", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
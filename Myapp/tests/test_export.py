@@ -0,0 +1,136 @@
+import csv
+import io
+import json
+import os
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task
+from Myapp.serializers import TaskSerializer
+
+# Number of tasks of the bounded memory test, e.g. 1000000 before a release.
+EXPORT_TEST_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", 8000))
+
+
+class TaskExportAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("tasks_export")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.second_case = Case.objects.create(title="Second case", user=self.user)
+
+    def create_tasks(self, count, case=None):
+        Task.objects.bulk_create(
+            (
+                Task(
+                    case=case or self.case,
+                    user=self.user,
+                    title=f"Task {number}",
+                    description="Exported task, żółć",
+                )
+                for number in range(count)
+            ),
+            batch_size=1000,
+        )
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        self.create_tasks(3)
+        Task.objects.create(case=self.second_case, user=self.user, title="Last")
+        response, content = self.export()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="tasks.ndjson"', response["Content-Disposition"])
+        expected = TaskSerializer(
+            Task.objects.order_by("creation_date", "pk"), many=True
+        ).data
+        self.assertEqual([json.loads(line) for line in content.splitlines()], expected)
+
+    def test_csv_export(self):
+        self.create_tasks(2)
+        response, content = self.export(output="csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(list(rows[0]), TaskSerializer.Meta.fields)
+        self.assertEqual([row["title"] for row in rows], ["Task 0", "Task 1"])
+        self.assertEqual(rows[0]["description"], "Exported task, żółć")
+        self.assertEqual(rows[0]["completed_date"], "")
+
+    def test_export_grouped_by_case(self):
+        self.create_tasks(2, case=self.second_case)
+        self.create_tasks(2)
+        _, content = self.export(group="case")
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            [(row["case"], row["case_title"]) for row in rows],
+            [(self.case.pk, "Case")] * 2 + [(self.second_case.pk, "Second case")] * 2,
+        )
+        _, content = self.export(group="case", output="csv")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(rows[-1]["case_status"], "OPEN")
+
+    def test_export_applies_filters_and_user(self):
+        self.create_tasks(2)
+        Task.objects.create(
+            case=self.second_case, user=self.user, title="Done", status="FINISHED"
+        )
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        other_case = Case.objects.create(title="Other case", user=other_user)
+        Task.objects.create(case=other_case, user=other_user, title="Other")
+
+        _, content = self.export()
+        self.assertEqual(len(content.splitlines()), 3)
+        _, content = self.export(status="FINISHED")
+        self.assertEqual(
+            [json.loads(line)["title"] for line in content.splitlines()], ["Done"]
+        )
+
+    def test_export_rejects_invalid_parameters(self):
+        for params in ({"output": "xml"}, {"group": "status"}, {"status": "UNKNOWN"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def measure_export(self, **params):
+        """
+        Returns the number of exported lines and the peak memory allocated
+        while streaming them.
+        """
+        response = self.client.get(self.url, params)
+        lines = 0
+        tracemalloc.start()
+        try:
+            for chunk in response.streaming_content:
+                lines += chunk.count(b"\n")
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return lines, peak
+
+    @override_settings(EXPORT_CHUNK_SIZE=500)
+    def test_export_memory_does_not_grow_with_rows(self):
+        self.create_tasks(EXPORT_TEST_ROWS // 8)
+        small_lines, small_peak = self.measure_export(output="csv")
+        self.create_tasks(EXPORT_TEST_ROWS - EXPORT_TEST_ROWS // 8)
+        for params in ({"output": "csv"}, {"group": "case"}):
+            lines, peak = self.measure_export(**params)
+            self.assertGreaterEqual(lines, EXPORT_TEST_ROWS)
+            # Only one chunk of rows is held at a time.
+            self.assertLess(peak, 2 * small_peak + 1024 * 1024)
+            self.assertLess(peak, 16 * 1024 * 1024)
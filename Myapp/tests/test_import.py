@@ -0,0 +1,168 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.counters import find_drift
+from Myapp.models import Case, Task, TaskCounter
+
+
+def ndjson(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+class TaskImportAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("tasks_import")
+        self.case = Case.objects.create(title="Case", user=self.user)
+
+    def upload(self, content, name="tasks.ndjson", **data):
+        response = self.client.post(
+            self.url,
+            {"file": SimpleUploadedFile(name, content), **data},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def test_import_ndjson(self):
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        Case.objects.create(title="New case", user=other_user)
+        report = self.upload(
+            ndjson(
+                [
+                    {"case": "Case", "title": "First", "description": "One"},
+                    {
+                        "case": "New case",
+                        "title": "Second",
+                        "description": "Two",
+                        "status": "FINISHED",
+                    },
+                    {"case": "New case", "title": "Third", "description": "Three"},
+                ]
+            )
+        )
+        self.assertEqual(
+            {key: value for key, value in report.items() if key != "rows_per_second"},
+            {"rows": 3, "created": 3, "cases_created": 1, "failed": 0, "errors": []},
+        )
+        new_case = Case.objects.get(user=self.user, title="New case")
+        tasks = Task.objects.filter(user=self.user).order_by("pk")
+        self.assertEqual(
+            [(task.case_id, task.title) for task in tasks],
+            [(self.case.pk, "First"), (new_case.pk, "Second"), (new_case.pk, "Third")],
+        )
+        self.assertIsNotNone(tasks[1].completed_date)
+        self.assertEqual(
+            TaskCounter.objects.get(case=new_case, status="FINISHED").count, 1
+        )
+        self.assertEqual(find_drift(), {})
+
+    def test_import_reports_invalid_rows(self):
+        Case.objects.create(title="Closed", user=self.user, status="CLOSED")
+        content = (
+            "case,title,description,status\n"
+            "Case,Valid,Description,CREATED\n"
+            "Closed,Closed case,Description,CREATED\n"
+            "Case,Bad status,Description,DONE\n"
+            ",No case,Description,CREATED\n"
+        )
+        report = self.upload(content.encode(), name="tasks.csv")
+        self.assertEqual(
+            (report["rows"], report["created"], report["failed"]), (4, 1, 3)
+        )
+        self.assertEqual(
+            [(error["line"], list(error["errors"])) for error in report["errors"]],
+            [(3, ["case"]), (4, ["status"]), (5, ["case"])],
+        )
+        self.assertEqual(
+            report["errors"][0]["errors"]["case"],
+            ["You cannot add task to closed case."],
+        )
+        self.assertEqual(Task.objects.get().title, "Valid")
+
+    def test_import_reports_unparsable_lines(self):
+        content = b'not json\n\n["list"]\n{"case": "Case", "title": "T", "description": "D"}\n'
+        report = self.upload(content)
+        self.assertEqual((report["created"], report["failed"]), (1, 2))
+        self.assertEqual([error["line"] for error in report["errors"]], [1, 3])
+
+    def test_import_query_count_does_not_depend_on_rows(self):
+        def import_rows(count, case):
+            rows = [
+                {"case": case, "title": f"Task {n}", "description": "Imported"}
+                for n in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.upload(ndjson(rows))
+            return len(queries)
+
+        import_rows(1, "Warm up")
+        self.assertEqual(import_rows(5, "First"), import_rows(50, "Second"))
+
+    def test_export_can_be_imported(self):
+        Task.objects.create(case=self.case, user=self.user, title="A", description="D")
+        content = b"".join(
+            self.client.get(
+                reverse("tasks_export"), {"group": "case", "output": "csv"}
+            ).streaming_content
+        )
+        report = self.upload(content, name="tasks.csv")
+        self.assertEqual((report["created"], report["cases_created"]), (1, 0))
+        self.assertEqual(Task.objects.filter(case=self.case, title="A").count(), 2)
+
+    def test_import_requires_known_format(self):
+        response = self.client.post(
+            self.url,
+            {"file": SimpleUploadedFile("tasks.txt", b"case,title\n")},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        report = self.upload(b"case,title\n", name="tasks.txt", input="csv")
+        self.assertEqual(report["rows"], 0)
+
+
+class ImportTasksCommandTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="password")
+
+    def test_import_in_batches(self):
+        rows = [
+            {"case": f"Case {n % 2}", "title": f"Task {n}", "description": "D"}
+            for n in range(5)
+        ]
+        with tempfile.NamedTemporaryFile(suffix=".jsonl") as file:
+            file.write(ndjson(rows))
+            file.flush()
+            out = StringIO()
+            call_command(
+                "import_tasks", file.name, user="testuser", batch_size=2, stdout=out
+            )
+        self.assertEqual(out.getvalue().count("\r"), 3)
+        self.assertIn("Imported 5 of 5 tasks", out.getvalue())
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(Case.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(find_drift(), {})
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesMessage(CommandError, "does not exist"):
+            call_command("import_tasks", "tasks.csv", user="nobody")
+        with self.assertRaisesMessage(CommandError, "pass --format"):
+            call_command("import_tasks", "tasks.txt", user="testuser")
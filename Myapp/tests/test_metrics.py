@@ -0,0 +1,212 @@
+import threading
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp import urls
+from Myapp.metrics import (
+    DURATION_BUCKETS,
+    METRICS_KEY,
+    MetricsMiddleware,
+    metrics_view,
+    read_metrics,
+    reset_metrics,
+)
+from Myapp.models import Case, Task
+
+TASKS_GET = 'route="tasks_list_create",method="GET",status="200"'
+
+# The metrics route is only added when `METRICS_ENABLED` is set at startup.
+urlpatterns = [
+    path(
+        "todo/",
+        include(
+            [
+                *urls.urlpatterns,
+                path("metrics/", metrics_view, name="metrics"),
+            ]
+        ),
+    ),
+]
+
+
+@override_settings(
+    ROOT_URLCONF=__name__,
+    METRICS_ENABLED=True,
+    METRICS_TOKEN="secret",
+    SHARED_CACHE=True,
+)
+class MetricsTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        for i in range(3):
+            Task.objects.create(case=self.case, user=self.user, title=f"Task {i}")
+        reset_metrics()
+
+    def get_metrics(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer secret")
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_records_queries_latency_and_size_per_route(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("tasks_list_create"))
+        query_count = len(queries)
+        cache.clear()
+        self.client.get(reverse("tasks_list_create"))
+        self.client.get(reverse("cases_list_create"))
+
+        samples = self.get_metrics()
+
+        self.assertEqual(samples[f"todo_http_requests_total{{{TASKS_GET}}}"], 2)
+        self.assertEqual(
+            samples[f"todo_http_request_queries_sum{{{TASKS_GET}}}"],
+            2 * query_count,
+        )
+        self.assertGreater(
+            samples[f"todo_http_request_db_seconds_total{{{TASKS_GET}}}"], 0
+        )
+        self.assertEqual(
+            samples[f"todo_http_response_bytes_total{{{TASKS_GET}}}"],
+            2 * len(response.content),
+        )
+        self.assertIn(
+            'todo_http_requests_total{route="cases_list_create",method="GET",'
+            'status="200"}',
+            samples,
+        )
+
+    def test_histograms_are_cumulative(self):
+        for _ in range(3):
+            cache.clear()
+            self.client.get(reverse("tasks_list_create"))
+
+        samples = self.get_metrics()
+
+        buckets = [
+            samples[
+                f'todo_http_request_duration_seconds_bucket{{{TASKS_GET},le="{le}"}}'
+            ]
+            for le in (*DURATION_BUCKETS, "+Inf")
+        ]
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertEqual(buckets[-1], 3)
+        self.assertEqual(
+            samples[f"todo_http_request_duration_seconds_count{{{TASKS_GET}}}"], 3
+        )
+        self.assertEqual(
+            samples[f'todo_http_request_queries_bucket{{{TASKS_GET},le="0"}}'], 0
+        )
+
+    def test_records_status_and_unmatched_routes(self):
+        self.client.get(reverse("task_retrieve_update_destroy", kwargs={"pk": 999}))
+        self.client.get("/todo/nothing/")
+
+        samples = self.get_metrics()
+
+        self.assertIn(
+            'todo_http_requests_total{route="task_retrieve_update_destroy",'
+            'method="GET",status="404"}',
+            samples,
+        )
+        self.assertIn(
+            'todo_http_requests_total{route="unmatched",method="GET",status="404"}',
+            samples,
+        )
+
+    @override_settings(METRICS_SLOW_REQUEST_MS=0, METRICS_SLOW_QUERIES=2)
+    def test_slow_requests_are_logged_with_their_sql(self):
+        with self.assertLogs("Myapp.metrics", "WARNING") as logs:
+            self.client.get(reverse("tasks_list_create"))
+
+        message = logs.output[-1]
+        self.assertIn("Slow request GET /todo/tasks/ (tasks_list_create) 200", message)
+        self.assertEqual(message.count(" ms: "), 2)
+        self.assertIn("SELECT", message)
+
+    def test_metrics_token(self):
+        self.client.credentials()
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.get_metrics()
+
+    @override_settings(METRICS_TOKEN="")
+    def test_metrics_without_token_are_only_served_with_debug(self):
+        self.client.credentials()
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        with self.settings(DEBUG=True):
+            response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_metrics_stay_in_the_worker_without_shared_cache(self):
+        self.client.get(reverse("tasks_list_create"))
+
+        samples = self.get_metrics()
+
+        self.assertEqual(samples[f"todo_http_requests_total{{{TASKS_GET}}}"], 1)
+        key = METRICS_KEY.format(series="tasks_list_create|GET|200", name="requests")
+        self.assertIsNone(cache.get(key))
+
+    @override_settings(SHARED_CACHE=False)
+    async def test_records_async_requests(self):
+        response = await self.async_client.get(
+            reverse("async_tasks_list_create"),
+            headers={"Authorization": f"Bearer {self.access_token}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        metrics = read_metrics()[("async_tasks_list_create", "GET", "200")]
+        self.assertEqual(metrics["requests"], 1)
+        self.assertGreater(metrics["queries_sum"], 0)
+
+    async def test_async_requests_stay_on_the_event_loop(self):
+        threads = []
+
+        async def get_response(request):
+            threads.append(threading.get_ident())
+            return HttpResponse()
+
+        middleware = MetricsMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertFalse(iscoroutinefunction(MetricsMiddleware(lambda request: None)))
+        await middleware(AsyncRequestFactory().get("/todo/tasks/"))
+        self.assertEqual(threads, [threading.get_ident()])
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_metrics_can_be_disabled(self):
+        # A new client, whose handler loads the middleware with the setting.
+        client = self.client_class()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        client.get(reverse("tasks_list_create"))
+        with self.settings(METRICS_ENABLED=True):
+            samples = self.get_metrics()
+        self.assertNotIn(f"todo_http_requests_total{{{TASKS_GET}}}", samples)
+        # Tests run without METRICS_ENABLED, so the route is not added.
+        self.assertNotIn("metrics", {pattern.name for pattern in urls.urlpatterns})
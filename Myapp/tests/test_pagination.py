@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task
+from Myapp.pagination import KeysetPagination
+
+
+class KeysetPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(
+            title="Test case", status=Case.StatusChoice.OPEN, user=self.user
+        )
+        Task.objects.bulk_create(
+            Task(
+                case=self.case,
+                user=self.user,
+                title=f"Task {number}",
+                description="Paginated task",
+            )
+            for number in range(7)
+        )
+        # Identical creation dates force the primary key to break the ties.
+        Task.objects.update(creation_date=timezone.now())
+
+    def collect_pages(self, url):
+        pks = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pks.extend(task["pk"] for task in response.data["results"])
+            url = response.data["next"]
+        return pks
+
+    def test_pages_cover_all_tasks_once_in_order(self):
+        url = reverse("tasks_list_create") + "?page_size=3"
+        pks = self.collect_pages(url)
+        expected = list(
+            Task.objects.order_by("creation_date", "pk").values_list("pk", flat=True)
+        )
+        self.assertEqual(pks, expected)
+
+    def test_last_page_has_no_next_link(self):
+        response = self.client.get(reverse("tasks_list_create") + "?page_size=7")
+        self.assertEqual(len(response.data["results"]), 7)
+        self.assertIsNone(response.data["next"])
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(KeysetPagination, "max_page_size", 2):
+            response = self.client.get(reverse("tasks_list_create") + "?page_size=1000")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_next_page_uses_seek_instead_of_offset(self):
+        response = self.client.get(reverse("tasks_list_create") + "?page_size=2")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.data["next"])
+        task_query = queries.captured_queries[-1]["sql"]
+        self.assertNotIn("OFFSET", task_query.upper())
+        self.assertIn("LIMIT 3", task_query.upper())
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("tasks_list_create") + "?cursor=garbage")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_case_list_is_paginated(self):
+        Case.objects.create(title="Second case", user=self.user)
+        url = reverse("cases_list_create") + "?page_size=1"
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["pk"], self.case.pk)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["title"], "Second case")
+        self.assertIsNone(response.data["next"])
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task
+from Myapp.serializers import CaseSerializer, RowSerializer, TaskSerializer
+
+
+class RowSerializerTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Maison à ranger", user=self.user)
+        self.empty_case = Case.objects.create(
+            title="Empty", user=self.user, status=Case.StatusChoice.CLOSED
+        )
+        other_case = Case.objects.create(title="Other", user=self.user)
+        now = timezone.now()
+        for number, task_status in enumerate(Task.StatusChoice.values * 2):
+            task = Task.objects.create(
+                case=other_case if number % 3 == 0 else self.case,
+                user=self.user,
+                title=f'Tâche {number} "quoted" \\  ',
+                description="Line\nbreak" if number % 2 else "",
+                status=task_status,
+            )
+            # Microseconds and a summer date, so the time zone offset changes.
+            Task.objects.filter(pk=task.pk).update(
+                creation_date=now.replace(month=7) - timedelta(microseconds=number),
+                last_updated_date=now - timedelta(days=number),
+            )
+
+    def assertSameAsSerializer(self, url, serializer_class, queryset):
+        """
+        Follows the pages of the listing and checks every response body against
+        the rendered representation of the model serializer.
+        """
+        rows = []
+        while url:
+            cache.clear()
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pks = [item["pk"] for item in response.data["results"]]
+            instances = queryset.in_bulk(pks)
+            expected = {
+                "next": response.data["next"],
+                "results": serializer_class(
+                    [instances[pk] for pk in pks], many=True
+                ).data,
+            }
+            self.assertEqual(response.content, JSONRenderer().render(expected))
+            rows.extend(pks)
+            url = response.data["next"]
+        return rows
+
+    def test_task_list_matches_task_serializer(self):
+        tasks = Task.objects.filter(user=self.user)
+        for query in ("?page_size=4", "?page_size=3&ordering=-last_updated_date"):
+            pks = self.assertSameAsSerializer(
+                reverse("tasks_list_create") + query, TaskSerializer, tasks
+            )
+            self.assertCountEqual(pks, tasks.values_list("pk", flat=True))
+
+    @override_settings(TIME_ZONE="Europe/Paris")
+    def test_datetimes_use_the_current_time_zone(self):
+        self.assertSameAsSerializer(
+            reverse("tasks_list_create") + "?status=FINISHED",
+            TaskSerializer,
+            Task.objects.all(),
+        )
+
+    def test_case_list_matches_case_serializer(self):
+        cases = Case.objects.prefetch_related(
+            Prefetch("tasks", queryset=Task.objects.order_by("creation_date", "pk"))
+        )
+        pks = self.assertSameAsSerializer(
+            reverse("cases_list_create") + "?page_size=2", CaseSerializer, cases
+        )
+        self.assertEqual(len(pks), 3)
+
+    def test_rejects_fields_not_read_from_rows(self):
+        with self.assertRaises(TypeError):
+            RowSerializer(CaseSerializer)
+        self.assertEqual(
+            RowSerializer(CaseSerializer, exclude=["tasks"]).columns,
+            ["pk", "title", "status"],
+        )
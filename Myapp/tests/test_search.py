@@ -0,0 +1,152 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task
+from Myapp.search import has_fts_index, naive_search, search_tasks, search_terms
+
+
+class TaskSearchAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("tasks_search")
+        self.case = Case.objects.create(title="Garden", user=self.user)
+        self.second_case = Case.objects.create(title="Kitchen", user=self.user)
+
+    def create_task(self, title, description="", case=None, **kwargs):
+        return Task.objects.create(
+            case=case or self.case,
+            user=self.user,
+            title=title,
+            description=description,
+            **kwargs,
+        )
+
+    def search(self, q, **params):
+        cache.clear()
+        response = self.client.get(self.url, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [task["title"] for task in response.data["results"]]
+
+    def test_search_title_description_and_case_title(self):
+        self.create_task("Water plants", "Roses and tulips")
+        self.create_task("Buy seeds", "For the plants")
+        self.create_task("Clean oven", case=self.second_case)
+        self.create_task("Unrelated", case=self.second_case)
+
+        self.assertEqual(self.search("plants"), ["Water plants", "Buy seeds"])
+        self.assertEqual(self.search("tulips"), ["Water plants"])
+        self.assertEqual(sorted(self.search("kitchen")), ["Clean oven", "Unrelated"])
+        # Every word must match, in any field.
+        self.assertEqual(self.search("garden seeds"), ["Buy seeds"])
+        self.assertEqual(self.search("oven seeds"), [])
+
+    def test_results_carry_rank(self):
+        self.create_task("Report", "Write the report")
+        response = self.client.get(self.url, {"q": "report"})
+        task = response.data["results"][0]
+        self.assertEqual(
+            set(task) - {"rank"},
+            {
+                "pk",
+                "case",
+                "title",
+                "description",
+                "status",
+                "creation_date",
+                "last_updated_date",
+                "completed_date",
+            },
+        )
+        if has_fts_index(connection):
+            self.assertGreater(task["rank"], 0)
+
+    def test_search_only_returns_filtered_tasks_of_the_user(self):
+        self.create_task("Paint fence")
+        self.create_task("Paint door", status="FINISHED")
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        other_case = Case.objects.create(title="Other", user=other_user)
+        Task.objects.create(
+            case=other_case, user=other_user, title="Paint wall", description=""
+        )
+
+        self.assertEqual(sorted(self.search("paint")), ["Paint door", "Paint fence"])
+        self.assertEqual(self.search("paint", status="FINISHED"), ["Paint door"])
+        self.assertEqual(len(self.search("paint", limit=1)), 1)
+
+    def test_index_follows_writes(self):
+        task = self.create_task("Old title")
+        task.title = "New title"
+        task.save()
+        self.assertEqual(self.search("old"), [])
+        self.assertEqual(self.search("new"), ["New title"])
+
+        Task.objects.filter(pk=task.pk).update(
+            description="Moved", case=self.second_case
+        )
+        self.assertEqual(self.search("moved kitchen"), ["New title"])
+        Case.objects.filter(pk=self.second_case.pk).update(title="Pantry")
+        self.assertEqual(self.search("pantry"), ["New title"])
+
+        Task.objects.bulk_create(
+            [Task(case=self.case, user=self.user, title="Bulk", description="")]
+        )
+        self.assertEqual(self.search("bulk"), ["Bulk"])
+        task.delete()
+        self.assertEqual(self.search("new"), [])
+        self.case.delete()
+        self.assertEqual(self.search("bulk"), [])
+
+    @override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=300)
+    def test_results_are_cached_until_tasks_change(self):
+        task = self.create_task("Water plants")
+        self.assertEqual(self.search("water"), ["Water plants"])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {"q": "water"})
+        self.assertFalse([query for query in queries if "Myapp_task" in query["sql"]])
+
+        task.title = "Water roses"
+        task.save()
+        response = self.client.get(self.url, {"q": "water"})
+        self.assertEqual(response.data["results"][0]["title"], "Water roses")
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.create_task('Say "hello" OR NOT', "a* (b)")
+        self.assertEqual(self.search('"hello" OR NOT'), ['Say "hello" OR NOT'])
+        self.assertEqual(self.search("a* (b) -"), ['Say "hello" OR NOT'])
+        self.assertEqual(self.search("NEAR(hello)"), [])
+
+    def test_search_ignores_diacritics(self):
+        if not has_fts_index(connection):
+            self.skipTest("SQLite FTS5 specific.")
+        self.create_task("Zażółć gęślą jaźń")
+        self.assertEqual(self.search("gesla JAZN"), ["Zażółć gęślą jaźń"])
+
+    def test_index_matches_naive_search(self):
+        for title in ("Alpha beta", "Beta gamma", "Gamma alpha", "Delta"):
+            self.create_task(title, "Shared words")
+        tasks = Task.objects.filter(user=self.user)
+        for query in ("alpha", "beta gamma", "shared", "garden delta"):
+            self.assertEqual(
+                {task.pk for task in search_tasks(tasks, query)},
+                {task.pk for task in naive_search(tasks, search_terms(query))},
+            )
+
+    def test_invalid_parameters(self):
+        for params in ({}, {"q": "?!"}, {"q": "task", "limit": 0}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,49 @@
+from collections import Counter
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from Myapp.counters import find_drift
+from Myapp.models import Case, Task
+
+
+class SeedDataTestCase(TestCase):
+    def seed(self, *args):
+        out = StringIO()
+        options = ["--users", "2", "--cases", "5", "--seed", "0", *args]
+        call_command("seed_data", *options, stdout=out)
+        return out.getvalue()
+
+    def test_seeds_users_cases_and_tasks(self):
+        output = self.seed("--tasks", "200")
+
+        self.assertIn("Seeded 2 users, 10 cases and 200 tasks.", output)
+        self.assertEqual(Task.objects.count(), 200)
+        self.assertFalse(
+            Task.objects.filter(case__status=Case.StatusChoice.CLOSED)
+            .exclude(status=Task.StatusChoice.FINISHED)
+            .exists()
+        )
+        self.assertFalse(
+            Task.objects.filter(
+                status=Task.StatusChoice.FINISHED, completed_date__isnull=True
+            ).exists()
+        )
+        self.assertEqual(find_drift(), {})
+
+    def test_reseeding_reuses_users(self):
+        self.seed("--tasks", "50")
+        self.seed("--tasks", "50")
+
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(Case.objects.count(), 20)
+        self.assertEqual(Task.objects.count(), 100)
+        self.assertEqual(find_drift(), {})
+
+    def test_skew_concentrates_tasks_in_few_cases(self):
+        self.seed("--tasks", "1000", "--skew", "2")
+
+        sizes = sorted(Counter(Task.objects.values_list("case_id", flat=True)).values())
+        self.assertGreater(sizes[-1], 500)
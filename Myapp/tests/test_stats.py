@@ -0,0 +1,240 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.counters import find_drift
+from Myapp.models import Case, Task, TaskCounter
+
+
+class TaskStatsAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("tasks_stats")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.second_case = Case.objects.create(title="Second case", user=self.user)
+
+    def create_task(self, case=None, **kwargs):
+        return Task.objects.create(
+            case=case or self.case, user=self.user, title="Task", **kwargs
+        )
+
+    def counts(self):
+        return {
+            (counter.case_id, counter.status): counter.count
+            for counter in TaskCounter.objects.filter(count__gt=0)
+        }
+
+    def test_stats_without_tasks(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "total": 0,
+                "counts": {"CREATED": 0, "IN_PROGRESS": 0, "FINISHED": 0},
+                "completion_rate": None,
+                "cases": [],
+            },
+        )
+
+    def test_stats_per_user_and_case(self):
+        self.create_task()
+        self.create_task(status="IN_PROGRESS")
+        self.create_task(status="FINISHED")
+        self.create_task(case=self.second_case, status="FINISHED")
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        other_case = Case.objects.create(title="Other case", user=other_user)
+        Task.objects.create(case=other_case, user=other_user, title="Other")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["total"], 4)
+        self.assertEqual(
+            response.data["counts"], {"CREATED": 1, "IN_PROGRESS": 1, "FINISHED": 2}
+        )
+        self.assertEqual(response.data["completion_rate"], 0.5)
+        self.assertEqual(
+            response.data["cases"],
+            [
+                {
+                    "case": self.case.pk,
+                    "total": 3,
+                    "counts": {"CREATED": 1, "IN_PROGRESS": 1, "FINISHED": 1},
+                    "completion_rate": 0.3333,
+                },
+                {
+                    "case": self.second_case.pk,
+                    "total": 1,
+                    "counts": {"CREATED": 0, "IN_PROGRESS": 0, "FINISHED": 1},
+                    "completion_rate": 1.0,
+                },
+            ],
+        )
+
+    def test_stats_query_count_does_not_depend_on_tasks(self):
+        self.client.get(reverse("tasks_list_create"))
+        self.create_task()
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        for _ in range(20):
+            self.create_task(case=self.second_case)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url)
+        self.assertEqual(len(few), len(many))
+
+    def test_counters_follow_task_saves_and_deletes(self):
+        task = self.create_task()
+        self.assertEqual(self.counts(), {(self.case.pk, "CREATED"): 1})
+
+        task.status = "IN_PROGRESS"
+        task.save()
+        self.assertEqual(self.counts(), {(self.case.pk, "IN_PROGRESS"): 1})
+
+        task = Task.objects.get(pk=task.pk)
+        task.case = self.second_case
+        task.status = "FINISHED"
+        task.save()
+        self.assertEqual(self.counts(), {(self.second_case.pk, "FINISHED"): 1})
+
+        task.title = "Renamed"
+        task.save()
+        Task.objects.get(pk=task.pk).delete()
+        self.assertEqual(self.counts(), {})
+        self.assertEqual(find_drift(), {})
+
+    def test_counters_follow_the_stored_row_of_stale_tasks(self):
+        task = self.create_task()
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.status = second.status = "FINISHED"
+        first.save()
+        second.save()
+        self.assertEqual(self.counts(), {(self.case.pk, "FINISHED"): 1})
+
+        stale, moved = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        moved.case = self.second_case
+        moved.save()
+        # The stale task writes its loaded case back.
+        stale.title = "Renamed"
+        stale.save()
+        self.assertEqual(self.counts(), {(self.case.pk, "FINISHED"): 1})
+
+        stale, moved = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        moved.case = self.second_case
+        moved.save()
+        stale.delete()
+        self.assertEqual(self.counts(), {})
+        self.assertEqual(find_drift(), {})
+
+    def test_counters_follow_api_writes(self):
+        response = self.client.post(
+            reverse("tasks_list_create"),
+            {"case": self.case.pk, "title": "Task", "description": "Description"},
+        )
+        pk = response.data["pk"]
+        self.client.patch(
+            reverse("task_retrieve_update_destroy", args=[pk]), {"status": "FINISHED"}
+        )
+        self.assertEqual(self.counts(), {(self.case.pk, "FINISHED"): 1})
+        self.client.delete(reverse("task_retrieve_update_destroy", args=[pk]))
+        self.assertEqual(self.counts(), {})
+
+    def test_counters_follow_bulk_writes(self):
+        bulk_url = reverse("tasks_bulk")
+        data = [
+            {"case": self.case.pk, "title": f"Task {n}", "description": "Bulk"}
+            for n in range(3)
+        ]
+        self.client.post(bulk_url, data, format="json")
+        self.assertEqual(self.counts(), {(self.case.pk, "CREATED"): 3})
+
+        pks = list(Task.objects.order_by("pk").values_list("pk", flat=True))
+        self.client.patch(
+            bulk_url,
+            [
+                {"pk": pks[0], "status": "FINISHED"},
+                {"pk": pks[1], "case": self.second_case.pk},
+            ],
+            format="json",
+        )
+        self.assertEqual(
+            self.counts(),
+            {
+                (self.case.pk, "CREATED"): 1,
+                (self.case.pk, "FINISHED"): 1,
+                (self.second_case.pk, "CREATED"): 1,
+            },
+        )
+        self.client.delete(bulk_url, pks[:2], format="json")
+        self.assertEqual(self.counts(), {(self.case.pk, "CREATED"): 1})
+        self.assertEqual(find_drift(), {})
+
+    def test_saving_task_without_loading_it_recounts_case(self):
+        task = self.create_task()
+        Task(
+            pk=task.pk,
+            case=self.case,
+            user=self.user,
+            title="Task",
+            description="",
+            status="FINISHED",
+            creation_date=task.creation_date,
+        ).save()
+        self.assertEqual(self.counts(), {(self.case.pk, "FINISHED"): 1})
+
+    def test_counters_are_deleted_with_case(self):
+        self.create_task()
+        self.create_task(case=self.second_case)
+        self.case.delete()
+        self.assertEqual(self.counts(), {(self.second_case.pk, "CREATED"): 1})
+        self.assertEqual(find_drift(), {})
+
+    def test_rebuild_command_fixes_drift(self):
+        self.create_task()
+        self.create_task(case=self.second_case, status="FINISHED")
+        TaskCounter.objects.filter(case=self.case).update(count=5)
+        Task.objects.filter(case=self.second_case).update(status="CREATED")
+
+        with self.assertRaisesMessage(CommandError, "3 task counters drifted."):
+            call_command("rebuild_task_counters", check=True, stdout=StringIO())
+
+        out = StringIO()
+        call_command("rebuild_task_counters", stdout=out)
+        self.assertIn(
+            f"case {self.case.pk} CREATED: counted 5, actual 1", out.getvalue()
+        )
+        self.assertEqual(find_drift(), {})
+        call_command("rebuild_task_counters", check=True, stdout=StringIO())
+
+    @override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=300)
+    def test_stats_are_cached_until_counters_change(self):
+        self.create_task()
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse(
+            [query for query in queries if "Myapp_taskcounter" in query["sql"]]
+        )
+
+        self.create_task(status="FINISHED")
+        self.assertEqual(self.client.get(self.url).data["total"], 2)
+        TaskCounter.objects.filter(case=self.case, status="CREATED").update(count=5)
+        cache.clear()
+        self.assertEqual(self.client.get(self.url).data["total"], 6)
+        call_command("rebuild_task_counters", stdout=StringIO())
+        self.assertEqual(self.client.get(self.url).data["total"], 2)
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task, TaskTombstone
+
+
+class TaskSyncAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("tasks_sync")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.old_task = Task.objects.create(case=self.case, user=self.user, title="Old")
+        self.since = timezone.now()
+        Task.objects.filter(pk=self.old_task.pk).update(
+            last_updated_date=self.since - timedelta(hours=1)
+        )
+
+    def sync(self, since=None):
+        params = {"since": since.isoformat()} if since else {}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_initial_sync_returns_everything(self):
+        data = self.sync()
+        self.assertTrue(data["reset"])
+        self.assertEqual([task["pk"] for task in data["changed"]], [self.old_task.pk])
+        self.assertEqual(data["deleted"], [])
+
+    def test_sync_returns_only_changes(self):
+        new_task = Task.objects.create(case=self.case, user=self.user, title="New")
+        data = self.sync(self.since)
+        self.assertFalse(data["reset"])
+        self.assertEqual([task["pk"] for task in data["changed"]], [new_task.pk])
+
+    def test_sync_reports_deleted_tasks(self):
+        pk = self.old_task.pk
+        self.client.delete(reverse("task_retrieve_update_destroy", args=[pk]))
+        data = self.sync(self.since)
+        self.assertEqual(data["deleted"], [pk])
+        self.assertEqual(data["changed"], [])
+
+    def test_case_deletion_records_tombstones(self):
+        new_task = Task.objects.create(case=self.case, user=self.user, title="New")
+        self.client.delete(reverse("case_retrieve_update_destroy", args=[self.case.pk]))
+        data = self.sync(self.since)
+        self.assertCountEqual(data["deleted"], [self.old_task.pk, new_task.pk])
+
+    def test_user_deletion_does_not_record_tombstones(self):
+        self.user.delete()
+        self.assertFalse(TaskTombstone.objects.exists())
+
+    def test_watermark_lags_behind_now(self):
+        with self.settings(SYNC_SAFETY_WINDOW=5):
+            data = self.sync(self.since)
+        watermark = timezone.datetime.fromisoformat(data["watermark"])
+        self.assertLess(watermark, timezone.now() - timedelta(seconds=4))
+
+    def test_sync_older_than_retention_resets(self):
+        with self.settings(SYNC_TOMBSTONE_RETENTION_DAYS=1):
+            data = self.sync(self.since - timedelta(days=2))
+        self.assertTrue(data["reset"])
+        self.assertEqual(len(data["changed"]), 1)
+
+    def test_sync_rejects_invalid_since(self):
+        response = self.client.get(self.url, {"since": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_changes_are_paged(self):
+        pks = [self.old_task.pk] + [
+            Task.objects.create(case=self.case, user=self.user, title=f"Task {i}").pk
+            for i in range(4)
+        ]
+        response = self.client.get(self.url, {"limit": 2})
+        first_page_done = timezone.now()
+        pages = [response.data]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).data)
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(
+            [task["pk"] for page in pages for task in page["changed"]], pks
+        )
+        self.assertTrue(all(page["reset"] for page in pages))
+        self.assertEqual([page["watermark"] for page in pages[:-1]], [None, None])
+        watermark = timezone.datetime.fromisoformat(pages[-1]["watermark"])
+        self.assertLess(watermark, first_page_done)
+
+    def test_deleted_tasks_are_returned_with_the_first_page(self):
+        for i in range(2):
+            Task.objects.create(case=self.case, user=self.user, title=f"Task {i}")
+        self.client.delete(
+            reverse("task_retrieve_update_destroy", args=[self.old_task.pk])
+        )
+        first = self.client.get(
+            self.url, {"since": self.since.isoformat(), "limit": 1}
+        ).data
+        second = self.client.get(first["next"]).data
+        self.assertEqual(first["deleted"], [self.old_task.pk])
+        self.assertEqual(second["deleted"], [])
+        self.assertIsNone(second["next"])
+
+    def test_sync_rejects_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,159 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task, TaskCounter, TaskTombstone
+
+
+class TaskBulkAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.url = reverse("tasks_bulk")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.second_case = Case.objects.create(title="Second case", user=self.user)
+        self.closed_case = Case.objects.create(
+            title="Closed case", user=self.user, status=Case.StatusChoice.CLOSED
+        )
+
+    def payload(self, number, **kwargs):
+        data = {
+            "case": self.case.pk if number % 2 else self.second_case.pk,
+            "title": f"Bulk task {number}",
+            "description": "Created in bulk",
+        }
+        data.update(kwargs)
+        return data
+
+    def count_queries(self, method, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(self.url, data, format="json")
+        self.assertLess(response.status_code, 300, response.data)
+        return len(queries)
+
+    def test_bulk_create(self):
+        data = [self.payload(1), self.payload(2, status="FINISHED")]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(response.data[0]["title"], "Bulk task 1")
+        self.assertIsNone(response.data[0]["completed_date"])
+        self.assertIsNotNone(response.data[1]["completed_date"])
+
+    def test_bulk_create_query_count_does_not_depend_on_batch_size(self):
+        # Warm up the authenticated user cache, so both batches count the same.
+        self.client.get(reverse("tasks_list_create"))
+        small = self.count_queries("post", [self.payload(n) for n in range(2)])
+        large = self.count_queries("post", [self.payload(n) for n in range(50)])
+        self.assertEqual(small, large)
+
+    def test_bulk_create_rejects_whole_batch_on_invalid_item(self):
+        data = [
+            self.payload(1),
+            self.payload(2, case=self.closed_case.pk),
+            self.payload(3, status="UNKNOWN"),
+        ]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(
+            response.data[1]["case"][0], "You cannot add task to closed case."
+        )
+        self.assertIn("status", response.data[2])
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_bulk_create_rejects_other_users_case(self):
+        other_user = User.objects.create_user(username="otheruser", password="password")
+        other_case = Case.objects.create(title="Other case", user=other_user)
+        response = self.client.post(
+            self.url, [self.payload(1, case=other_case.pk)], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("case", response.data[0])
+
+    def test_bulk_create_rejects_non_list(self):
+        response = self.client.post(self.url, self.payload(1), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        self.client.post(self.url, [self.payload(n) for n in range(3)], format="json")
+        tasks = list(Task.objects.order_by("pk"))
+        data = [
+            {"pk": tasks[0].pk, "status": "FINISHED"},
+            {"pk": tasks[1].pk, "title": "Renamed"},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[1]["title"], "Renamed")
+        for task in tasks:
+            task.refresh_from_db()
+        self.assertIsNotNone(tasks[0].completed_date)
+        self.assertEqual(tasks[1].title, "Renamed")
+        self.assertEqual(tasks[2].title, "Bulk task 2")
+
+    def test_bulk_update_keeps_completion_date_and_rules(self):
+        task = Task.objects.create(
+            case=self.case, user=self.user, title="Done", status="FINISHED"
+        )
+        completed_date = task.completed_date
+        response = self.client.patch(
+            self.url, [{"pk": task.pk, "status": "CREATED"}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(
+            self.url, [{"pk": task.pk, "title": "Still done"}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        task.refresh_from_db()
+        self.assertEqual(task.completed_date, completed_date)
+
+    def test_bulk_update_reports_missing_tasks(self):
+        response = self.client.patch(
+            self.url, [{"pk": 999, "title": "Missing"}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0]["pk"][0], "Not found.")
+
+    def test_bulk_delete(self):
+        self.client.post(self.url, [self.payload(n) for n in range(3)], format="json")
+        pks = list(Task.objects.values_list("pk", flat=True)[:2])
+        response = self.client.delete(self.url, pks, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{"pk": pk, "deleted": True} for pk in pks])
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_bulk_delete_maintains_counters_and_tombstones(self):
+        self.client.post(self.url, [self.payload(n) for n in range(3)], format="json")
+        pks = list(Task.objects.order_by("pk").values_list("pk", flat=True)[:2])
+        self.client.delete(self.url, pks, format="json")
+        self.assertEqual(
+            set(TaskTombstone.objects.values_list("task_id", flat=True)), set(pks)
+        )
+        self.assertEqual(
+            sum(TaskCounter.objects.values_list("count", flat=True)),
+            Task.objects.count(),
+        )
+
+    def test_bulk_delete_query_count_does_not_depend_on_batch_size(self):
+        self.client.post(self.url, [self.payload(n) for n in range(60)], format="json")
+        pks = list(Task.objects.order_by("pk").values_list("pk", flat=True))
+        small = self.count_queries("delete", pks[:2])
+        large = self.count_queries("delete", pks[2:])
+        self.assertEqual(small, large)
+
+    def test_bulk_delete_rejects_missing_tasks(self):
+        task = Task.objects.create(case=self.case, user=self.user, title="Task")
+        response = self.client.delete(self.url, [task.pk, 999], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from Myapp.models import Case, Task
+
+
+class TaskFilterTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "testuser", "password": "testpassword"},
+        )
+        self.access_token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.case = Case.objects.create(title="Case", user=self.user)
+        self.other_case = Case.objects.create(title="Other case", user=self.user)
+        self.created = Task.objects.create(
+            case=self.case, user=self.user, title="Created"
+        )
+        self.in_progress = Task.objects.create(
+            case=self.case,
+            user=self.user,
+            title="In progress",
+            status=Task.StatusChoice.IN_PROGRESS,
+        )
+        self.finished = Task.objects.create(
+            case=self.other_case,
+            user=self.user,
+            title="Finished",
+            status=Task.StatusChoice.FINISHED,
+        )
+        Task.objects.filter(pk=self.created.pk).update(
+            creation_date=timezone.now() - timedelta(days=10)
+        )
+
+    def get_titles(self, query):
+        response = self.client.get(reverse("tasks_list_create") + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["title"] for task in response.data["results"]]
+
+    def test_filter_by_status(self):
+        titles = self.get_titles("?status=CREATED&status=FINISHED")
+        self.assertEqual(titles, ["Created", "Finished"])
+
+    def test_filter_by_case(self):
+        titles = self.get_titles(f"?case={self.other_case.pk}")
+        self.assertEqual(titles, ["Finished"])
+
+    def test_filter_by_creation_date_range(self):
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        titles = self.get_titles(f"?created_after={since}")
+        self.assertEqual(titles, ["In progress", "Finished"])
+        titles = self.get_titles(f"?created_before={since}")
+        self.assertEqual(titles, ["Created"])
+
+    def test_filter_by_completion_date(self):
+        since = (timezone.now() - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S")
+        titles = self.get_titles(f"?completed_after={since}")
+        self.assertEqual(titles, ["Finished"])
+
+    def test_invalid_filter_is_rejected(self):
+        response = self.client.get(reverse("tasks_list_create") + "?status=UNKNOWN")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            reverse("tasks_list_create")
+            + "?created_after=2024-02-01&created_before=2024-01-01"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_descending_ordering_with_pagination(self):
+        url = reverse("tasks_list_create") + "?ordering=-creation_date&page_size=2"
+        response = self.client.get(url)
+        titles = [task["title"] for task in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        titles += [task["title"] for task in response.data["results"]]
+        self.assertEqual(titles, ["Finished", "In progress", "Created"])
+
+    def test_unindexed_ordering_is_ignored(self):
+        titles = self.get_titles("?ordering=-title")
+        self.assertEqual(titles, ["Created", "In progress", "Finished"])
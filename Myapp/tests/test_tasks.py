@@ -1,4 +1,6 @@
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -53,7 +55,7 @@ class TaskAPITestCase(APITestCase):
 
         response = self.client.get(reverse("tasks_list_create"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        task_ids = [task["pk"] for task in response.data]
+        task_ids = [task["pk"] for task in response.data["results"]]
         self.assertIn(user_task.id, task_ids)
         self.assertNotIn(other_task.id, task_ids)
 
@@ -227,3 +229,29 @@ class TaskAPITestCase(APITestCase):
         url = reverse("task_retrieve_update_destroy", args=[self.task.id])
         response = self.unauthenticated_user.get(url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_finishing_task_sets_completed_date(self):
+        url = reverse("task_retrieve_update_destroy", args=[self.task.id])
+        response = self.client.patch(url, {"status": "FINISHED"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["completed_date"])
+        self.task.refresh_from_db()
+        self.assertIsNotNone(self.task.completed_date)
+
+    def test_updating_task_does_not_reselect_it(self):
+        self.task.title = "Renamed task"
+        with CaptureQueriesContext(connection) as queries:
+            self.task.save()
+        statements = [query["sql"].split()[0] for query in queries.captured_queries]
+        self.assertNotIn("SELECT", statements)
+
+    def test_concurrent_finish_keeps_first_completed_date(self):
+        first_writer = Task.objects.get(pk=self.task.pk)
+        second_writer = Task.objects.get(pk=self.task.pk)
+        first_writer.status = Task.StatusChoice.FINISHED
+        first_writer.save()
+        second_writer.status = Task.StatusChoice.FINISHED
+        second_writer.save()
+        self.assertEqual(second_writer.completed_date, first_writer.completed_date)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.completed_date, first_writer.completed_date)
@@ -15,16 +15,28 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from setuptools.extern import names
 
-from . import views
+from . import async_views, metrics, views
 
 urlpatterns = [
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("tasks/", views.TaskListCreateAPIView.as_view(), name="tasks_list_create"),
+    path("tasks/bulk/", views.TaskBulkAPIView.as_view(), name="tasks_bulk"),
+    path("tasks/sync/", views.TaskSyncAPIView.as_view(), name="tasks_sync"),
+    path("tasks/search/", views.TaskSearchAPIView.as_view(), name="tasks_search"),
+    path("tasks/export/", views.TaskExportAPIView.as_view(), name="tasks_export"),
+    path("tasks/import/", views.TaskImportAPIView.as_view(), name="tasks_import"),
+    path("tasks/stats/", views.TaskStatsAPIView.as_view(), name="tasks_stats"),
+    path(
+        "tasks/analytics/",
+        views.TaskAnalyticsAPIView.as_view(),
+        name="tasks_analytics",
+    ),
     path(
         "task/<int:pk>/",
         views.TaskRetrieveUpdateDestroyAPIView.as_view(),
@@ -36,4 +48,58 @@ urlpatterns = [
         views.CaseRetrieveUpdateDestroyAPIView.as_view(),
         name="case_retrieve_update_destroy",
     ),
+    path("case/<int:pk>/close/", views.CaseCloseAPIView.as_view(), name="case_close"),
+    path(
+        "archive/tasks/",
+        views.ArchivedTaskListAPIView.as_view(),
+        name="archived_tasks_list",
+    ),
+    path(
+        "archive/task/<int:pk>/",
+        views.ArchivedTaskRetrieveAPIView.as_view(),
+        name="archived_task_retrieve",
+    ),
+    path(
+        "archive/task/<int:pk>/restore/",
+        views.ArchivedTaskRestoreAPIView.as_view(),
+        name="archived_task_restore",
+    ),
+    path(
+        "archive/cases/",
+        views.ArchivedCaseListAPIView.as_view(),
+        name="archived_cases_list",
+    ),
+    path(
+        "archive/case/<int:pk>/",
+        views.ArchivedCaseRetrieveAPIView.as_view(),
+        name="archived_case_retrieve",
+    ),
+    path(
+        "archive/case/<int:pk>/restore/",
+        views.ArchivedCaseRestoreAPIView.as_view(),
+        name="archived_case_restore",
+    ),
+    path(
+        "async/tasks/",
+        async_views.AsyncTaskListCreateView.as_view(),
+        name="async_tasks_list_create",
+    ),
+    path(
+        "async/task/<int:pk>/",
+        async_views.AsyncTaskRetrieveView.as_view(),
+        name="async_task_retrieve",
+    ),
+    path(
+        "async/cases/",
+        async_views.AsyncCaseListCreateView.as_view(),
+        name="async_cases_list_create",
+    ),
+    path(
+        "async/case/<int:pk>/",
+        async_views.AsyncCaseRetrieveView.as_view(),
+        name="async_case_retrieve",
+    ),
 ]
+
+if settings.METRICS_ENABLED:
+    urlpatterns.append(path("metrics/", metrics.metrics_view, name="metrics"))
@@ -1,19 +1,101 @@
-from rest_framework import generics
+import codecs
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import filters, generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import analytics, archive, deletion, export, imports, search
+from .cache import CachedResponseMixin
+from .conditional import ConditionalGetMixin
+from .filters import TaskFilterBackend
+from .models import (
+    ArchivedCase,
+    ArchivedTask,
+    Case,
+    Task,
+    TaskCounter,
+    TaskDailyRollup,
+    TaskTombstone,
+)
+from .pagination import TaskSyncPagination
+from .serializers import (
+    ArchivedCaseSerializer,
+    ArchivedTaskSerializer,
+    CaseSerializer,
+    CaseSummarySerializer,
+    RowSerializer,
+    TaskAnalyticsQuerySerializer,
+    TaskExportQuerySerializer,
+    TaskImportSerializer,
+    TaskSearchQuerySerializer,
+    TaskSearchResultSerializer,
+    TaskSerializer,
+    TaskSyncQuerySerializer,
+)
+from .signals import tasks_changed
+
+
+def parse_pk(value):
+    """
+    Returns the value as a primary key, or None if it is not a valid one.
+    """
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
 
-from .models import Case, Task
-from .serializers import CaseSerializer, TaskSerializer
+def raise_for_errors(errors):
+    """
+    Raises a validation error listing per-item errors if any item has errors.
+    """
+    if any(errors):
+        raise ValidationError(errors)
 
 
-class TaskListCreateAPIView(generics.ListCreateAPIView):
+class TaskListCreateAPIView(
+    ConditionalGetMixin, CachedResponseMixin, generics.ListCreateAPIView
+):
     """
     View to list all tasks or create a new task item.
 
-    - `GET`: Returns a list of all tasks.
+    - `GET`: Returns a page of tasks, ordered by creation date.
+      Supports `status`, `case`, `created_after`, `created_before`,
+      `completed_after`, `completed_before` and `ordering` query parameters.
     - `POST`: Creates a new task item.
     """
 
     serializer_class = TaskSerializer
+    filter_backends = [TaskFilterBackend, filters.OrderingFilter]
+    # Only fields backed by a (user, field, id) index may be used for ordering.
+    ordering_fields = ["creation_date", "last_updated_date"]
+    ordering = ("creation_date", "pk")
+
+    def list(self, request, *args, **kwargs):
+        """
+        Handles listing tasks from database rows, without building model
+        instances, see `RowSerializer`.
+        """
+        rows = RowSerializer(TaskSerializer)
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.values_list(*rows.columns, named=True)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(rows.to_representation(queryset))
+        return self.get_paginated_response(rows.to_representation(page))
 
     def perform_create(self, serializer):
         """
@@ -28,7 +110,9 @@ class TaskListCreateAPIView(generics.ListCreateAPIView):
         return Task.objects.filter(user=self.request.user)
 
 
-class TaskRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class TaskRetrieveUpdateDestroyAPIView(
+    ConditionalGetMixin, CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     View to retrieve, update, destroy task item.
 
@@ -46,15 +130,540 @@ class TaskRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
         return Task.objects.filter(user=self.request.user)
 
 
-class CaseListCreateAPIView(generics.ListCreateAPIView):
+class TaskBulkAPIView(generics.GenericAPIView):
+    """
+    View to create, update or delete many task items in one request.
+
+    - `POST`: Creates tasks from a list of task payloads.
+    - `PATCH`: Partially updates tasks from a list of payloads containing `pk`.
+    - `DELETE`: Destroys tasks from a list of primary keys.
+
+    The whole batch is validated first, loading the referenced cases and tasks
+    with one query each, and then written. Updated and deleted tasks are locked
+    in the transaction that validates and writes them. If any item
+    is invalid nothing is written and the response lists the errors per item,
+    in the order of the request. Otherwise it lists the result of every item.
+    """
+
+    serializer_class = TaskSerializer
+
+    def get_queryset(self):
+        """
+        Handles filtering tasks for given user.
+        """
+        return Task.objects.filter(user=self.request.user)
+
+    def get_items(self):
+        """
+        Returns the request batch, ensuring it is a list of acceptable size.
+        """
+        items = self.request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError(
+                {"non_field_errors": [_("Expected a non-empty list of items.")]}
+            )
+        if len(items) > settings.BULK_MAX_BATCH_SIZE:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        _("Ensure this batch has no more than %(limit)s items.")
+                        % {"limit": settings.BULK_MAX_BATCH_SIZE}
+                    ]
+                }
+            )
+        return items
+
+    def get_bulk_context(self, items):
+        """
+        Returns the serializer context with all cases referenced by the batch.
+        """
+        case_pks = {
+            pk
+            for pk in (
+                parse_pk(item.get("case")) for item in items if isinstance(item, dict)
+            )
+            if pk is not None
+        }
+        context = self.get_serializer_context()
+        context["cases"] = Case.objects.filter(user=self.request.user).in_bulk(case_pks)
+        return context
+
+    def send_tasks_changed(self, case_ids):
+        """
+        Notifies derived data that tasks were written without model signals.
+        """
+        tasks_changed.send(
+            sender=Task, user_ids={self.request.user.pk}, case_ids=set(case_ids)
+        )
+
+    def post(self, request, *args, **kwargs):
+        items = self.get_items()
+        context = self.get_bulk_context(items)
+        serializers = [TaskSerializer(data=item, context=context) for item in items]
+        raise_for_errors([{} if s.is_valid() else s.errors for s in serializers])
+
+        now = timezone.now()
+        tasks = [Task(user=request.user, **s.validated_data) for s in serializers]
+        for task in tasks:
+            if task.status == Task.StatusChoice.FINISHED:
+                task.completed_date = now
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+        self.send_tasks_changed(task.case_id for task in tasks)
+        return Response(
+            TaskSerializer(tasks, many=True).data, status=status.HTTP_201_CREATED
+        )
+
+    def patch(self, request, *args, **kwargs):
+        items = self.get_items()
+        context = self.get_bulk_context(items)
+        pks = [
+            parse_pk(item.get("pk")) if isinstance(item, dict) else None
+            for item in items
+        ]
+        # The tasks are locked while they are validated and written, so the
+        # fields written back unchanged cannot overwrite concurrent writes.
+        with transaction.atomic():
+            tasks = (
+                self.get_queryset()
+                .select_for_update()
+                .in_bulk([pk for pk in pks if pk is not None])
+            )
+
+            serializers, errors, seen = [], [], set()
+            for pk, item in zip(pks, items):
+                if pk not in tasks or pk in seen:
+                    message = _("Duplicate task.") if pk in seen else _("Not found.")
+                    errors.append({"pk": [message]})
+                    continue
+                seen.add(pk)
+                serializer = TaskSerializer(
+                    tasks[pk], data=item, partial=True, context=context
+                )
+                errors.append({} if serializer.is_valid() else serializer.errors)
+                serializers.append(serializer)
+            raise_for_errors(errors)
+
+            # Tasks moved to another case change both the old and the new case.
+            case_ids = {task.case_id for task in tasks.values()}
+            now = timezone.now()
+            fields = {"last_updated_date"}
+            for serializer in serializers:
+                task = serializer.instance
+                for attr, value in serializer.validated_data.items():
+                    setattr(task, attr, value)
+                    fields.add(attr)
+                # bulk_update() bypasses Task.save() and auto_now, so apply them.
+                task.last_updated_date = now
+                if (
+                    task.status == Task.StatusChoice.FINISHED
+                    and task.completed_date is None
+                ):
+                    task.completed_date = Task.completion_date_expression(now)
+                    fields.add("completed_date")
+            Task.objects.bulk_update(tasks.values(), fields)
+        self.send_tasks_changed(case_ids | {task.case_id for task in tasks.values()})
+        tasks = self.get_queryset().in_bulk(pks)
+        return Response(TaskSerializer([tasks[pk] for pk in pks], many=True).data)
+
+    def delete(self, request, *args, **kwargs):
+        items = self.get_items()
+        pks = [parse_pk(item) for item in items]
+        with transaction.atomic():
+            rows = list(
+                self.get_queryset()
+                .filter(pk__in=[pk for pk in pks if pk is not None])
+                .select_for_update()
+                .values("id", "user_id", "case_id", "status")
+            )
+            existing = {row["id"] for row in rows}
+            raise_for_errors(
+                [{} if pk in existing else {"pk": [_("Not found.")]} for pk in pks]
+            )
+            # Set-based, without the per-task delete signals.
+            deletion.delete_task_rows(rows, timezone.now())
+        # Counters and case timestamps were maintained by delete_task_rows.
+        self.send_tasks_changed(())
+        return Response([{"pk": pk, "deleted": True} for pk in pks])
+
+
+class TaskSyncAPIView(generics.GenericAPIView):
+    """
+    View to fetch the task changes since a previous sync.
+
+    - `GET`: Returns the tasks created or updated since `since`, the primary
+      keys of the tasks deleted since then and a `watermark` to send as `since`
+      next time. Clients apply `deleted` before `changed`. Without `since`, or
+      when it is older than the tombstone retention, all tasks are returned with
+      `reset` set, and the client replaces its local copy.
+
+    Changes are returned in pages of `limit` tasks: clients follow `next` until
+    it is null, and only the last page has the `watermark`. `deleted` is only
+    returned with the first page.
+
+    The watermark lags `SYNC_SAFETY_WINDOW` seconds behind the first page, so
+    writes that were still being committed are returned again by the next sync.
+    """
+
+    serializer_class = TaskSerializer
+    pagination_class = TaskSyncPagination
+
+    def get_queryset(self):
+        """
+        Handles filtering tasks for given user.
+        """
+        return Task.objects.filter(user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        params = TaskSyncQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data.get("since")
+
+        now = timezone.now()
+        watermark = now - timedelta(seconds=settings.SYNC_SAFETY_WINDOW)
+        retention = now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        reset = since is None or since < retention
+        first_page = self.paginator.cursor_query_param not in request.query_params
+
+        tasks = self.get_queryset()
+        deleted = []
+        if not reset:
+            # Tombstones are read before tasks, so a task deleted in between
+            # is missing from both and reported by the next sync instead.
+            if first_page:
+                deleted = list(
+                    TaskTombstone.objects.filter(
+                        user=request.user, deleted_date__gte=since
+                    ).values_list("task_id", flat=True)
+                )
+            tasks = tasks.filter(last_updated_date__gte=since)
+
+        page = self.paginator.paginate_queryset(
+            tasks, request, self, watermark=watermark
+        )
+        next_link = self.paginator.get_next_link()
+        return Response(
+            {
+                "watermark": (
+                    None if next_link else self.paginator.watermark.isoformat()
+                ),
+                "reset": reset,
+                "changed": self.get_serializer(page, many=True).data,
+                "deleted": deleted,
+                "next": next_link,
+            }
+        )
+
+
+class TaskSearchAPIView(CachedResponseMixin, generics.ListAPIView):
+    """
+    View to search the tasks of the user.
+
+    - `GET`: Returns up to `limit` tasks whose title, description or case title
+      contain every word of `q`, best matches first, with their `rank`.
+      Accepts the filters of the task list.
+
+    The search reads a full-text index maintained by the database, see
+    `Myapp.search`. The response is built by `list`, so that
+    `CachedResponseMixin.get` caches it.
+    """
+
+    filter_backends = [TaskFilterBackend]
+    serializer_class = TaskSearchResultSerializer
+
+    def get_queryset(self):
+        """
+        Handles filtering tasks for given user.
+        """
+        return Task.objects.filter(user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        params = TaskSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        tasks = search.search_tasks(
+            self.filter_queryset(self.get_queryset()), params.validated_data["q"]
+        )
+        return Response(
+            {
+                "results": self.get_serializer(
+                    tasks[: params.validated_data["limit"]], many=True
+                ).data
+            }
+        )
+
+
+class TaskExportAPIView(generics.GenericAPIView):
+    """
+    View to export all tasks of the user in one streamed response.
+
+    - `GET`: Streams the tasks as NDJSON (`output=ndjson`, the default) or CSV
+      (`output=csv`), ordered by creation date. With `group=case` they are
+      ordered by case and carry the case title and status. Accepts the filters
+      of the task list.
+
+    Tasks are fetched and written in chunks, so memory use stays flat however
+    many tasks are exported.
+    """
+
+    filter_backends = [TaskFilterBackend]
+
+    def get_queryset(self):
+        """
+        Handles filtering tasks for given user.
+        """
+        return Task.objects.filter(user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        params = TaskExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data["output"]
+
+        tasks = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export.stream_tasks(
+                tasks, output, params.validated_data.get("group") == "case"
+            ),
+            content_type=export.CONTENT_TYPES[output],
+        )
+        response["Content-Disposition"] = f'attachment; filename="tasks.{output}"'
+        return response
+
+
+class TaskImportAPIView(generics.GenericAPIView):
+    """
+    View to import many tasks from an uploaded file.
+
+    - `POST`: Imports the tasks of a multipart `file` in NDJSON or CSV
+      (`input`, guessed from the file extension by default). Every row holds
+      the task fields and the title of its case in `case`; missing cases are
+      created. Returns the number of rows read, tasks and cases created, rows
+      failed, the import speed and the errors of the first invalid rows.
+
+    Rows are written in batches of `IMPORT_BATCH_SIZE` with one transaction
+    each. Invalid rows are skipped, the valid ones are imported.
+    """
+
+    parser_classes = [MultiPartParser]
+    serializer_class = TaskImportSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        input_format = serializer.validated_data.get("input") or imports.guess_format(
+            upload.name
+        )
+        if input_format is None:
+            raise ValidationError(
+                {"input": [_("Cannot guess the format of the file.")]}
+            )
+
+        importer = imports.TaskImporter(
+            request.user, settings.IMPORT_BATCH_SIZE, settings.IMPORT_MAX_ERRORS
+        )
+        try:
+            report = importer.run(codecs.iterdecode(upload, "utf-8-sig"), input_format)
+        except UnicodeDecodeError:
+            report = importer.report
+            report.errors.append(
+                {"line": None, "errors": {"file": [_("The file is not UTF-8.")]}}
+            )
+        return Response(report.as_dict())
+
+
+class TaskStatsAPIView(CachedResponseMixin, generics.RetrieveAPIView):
+    """
+    View to fetch task statistics.
+
+    - `GET`: Returns the number of tasks per status, the total and the
+      completion rate of the user, and the same numbers for every case
+      holding tasks of the user.
+
+    The numbers are read from the task counters with one query that does not
+    depend on the number of tasks. The response is built by `retrieve`, so
+    that `CachedResponseMixin.get` caches it.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        cases = defaultdict(Counter)
+        counters = (
+            TaskCounter.objects.filter(user=request.user, count__gt=0)
+            .order_by("case_id")
+            .values_list("case_id", "status", "count")
+        )
+        for case_id, task_status, count in counters:
+            cases[case_id][task_status] += count
+        total = sum(cases.values(), Counter())
+        return Response(
+            {
+                **self.summarize(total),
+                "cases": [
+                    {"case": case_id, **self.summarize(counts)}
+                    for case_id, counts in cases.items()
+                ],
+            }
+        )
+
+    @staticmethod
+    def summarize(counts):
+        """
+        Returns the counts of all statuses, their total and the completion rate.
+        """
+        counts = {
+            task_status: counts[task_status] for task_status in Task.StatusChoice.values
+        }
+        total = sum(counts.values())
+        finished = counts[Task.StatusChoice.FINISHED]
+        return {
+            "total": total,
+            "counts": counts,
+            "completion_rate": round(finished / total, 4) if total else None,
+        }
+
+
+class TaskAnalyticsAPIView(CachedResponseMixin, generics.RetrieveAPIView):
+    """
+    View to fetch completion time analytics of the tasks of the user.
+
+    - `GET`: Returns, for the tasks finished in the last `days` days, the lead
+      time percentiles (`p50`, `p90`, `p99` in seconds from creation to
+      completion) and the number of tasks finished per `period`, together with
+      the ageing of the unfinished tasks. Accepts `case` to analyse one case.
+
+    With `source=rollup` the lead times and throughput are read from the daily
+    rollups (see `refresh_task_rollups`), whose percentiles are the upper bound
+    of a lead time range. Everything is aggregated in the database.
+
+    The response is built by `retrieve`, so that `CachedResponseMixin.get` caches
+    it; refreshing the rollups invalidates it.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        params = TaskAnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+
+        now = timezone.now()
+        since = now - timedelta(days=params["days"])
+        tasks = Task.objects.filter(user=request.user)
+        if "case" in params:
+            tasks = tasks.filter(case_id=params["case"])
+
+        if params["source"] == "rollup":
+            rollups = TaskDailyRollup.objects.filter(
+                user=request.user, day__gte=since.date()
+            )
+            if "case" in params:
+                rollups = rollups.filter(case_id=params["case"])
+            lead_time = analytics.rollup_lead_time_percentiles(rollups)
+            throughput = analytics.rollup_throughput(rollups, params["period"])
+        else:
+            finished = tasks.filter(completed_date__gte=since)
+            lead_time = analytics.lead_time_percentiles(finished)
+            throughput = analytics.throughput(finished, params["period"])
+
+        return Response(
+            {
+                "source": params["source"],
+                "lead_time": lead_time,
+                "throughput": throughput,
+                "ageing": analytics.ageing(tasks, now),
+            }
+        )
+
+
+class CaseQuerysetMixin:
+    """
+    Shared queryset and serializer handling for the case views.
+
+    Nested tasks are prefetched with a single extra query, so the number of
+    queries does not depend on the number of cases. With `?tasks=summary` the
+    nested tasks are replaced by per-status task counts, computed by one
+    aggregate in the case query itself.
+    """
+
+    def is_task_summary(self):
+        return self.request.query_params.get("tasks") == "summary"
+
+    def get_serializer_class(self):
+        """
+        Handles choosing between nested tasks and task counts.
+        """
+        if self.is_task_summary():
+            return CaseSummarySerializer
+        return CaseSerializer
+
+    def get_conditional_queryset(self):
+        """
+        Handles filtering case for given user, without loading its tasks.
+        """
+        return Case.objects.filter(user=self.request.user)
+
+    def get_queryset(self):
+        """
+        Handles filtering case for given user and loading its tasks.
+        """
+        queryset = Case.objects.filter(user=self.request.user)
+        if self.is_task_summary():
+            return queryset.annotate(
+                **{
+                    f"tasks_{task_status.lower()}": Count(
+                        "tasks", filter=Q(tasks__status=task_status)
+                    )
+                    for task_status in Task.StatusChoice.values
+                }
+            )
+        return queryset.prefetch_related(
+            Prefetch("tasks", queryset=Task.objects.order_by("creation_date", "pk"))
+        )
+
+
+class CaseListCreateAPIView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    CaseQuerysetMixin,
+    generics.ListCreateAPIView,
+):
     """
      View to list all cases or create a new case item.
 
-    - `GET`: Returns a list of all cases.
+    - `GET`: Returns a page of cases, ordered by primary key.
     - `POST`: Creates a new case item.
     """
 
-    serializer_class = CaseSerializer
+    ordering = ("pk",)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Handles listing cases with their tasks from database rows, without
+        building model instances, see `RowSerializer`.
+
+        The tasks of the page are fetched with one query, as the prefetch of
+        `get_queryset` does. Task summaries use the case serializers.
+        """
+        if self.is_task_summary():
+            return super().list(request, *args, **kwargs)
+        case_rows = RowSerializer(CaseSerializer, exclude=["tasks"])
+        task_rows = RowSerializer(TaskSerializer)
+        queryset = self.filter_queryset(self.get_conditional_queryset())
+        queryset = queryset.values_list(*case_rows.columns, named=True)
+        page = self.paginate_queryset(queryset)
+        cases = case_rows.to_representation(page if page is not None else queryset)
+
+        tasks = defaultdict(list)
+        task_queryset = Task.objects.filter(
+            case__in=[case["pk"] for case in cases]
+        ).order_by("creation_date", "pk")
+        for task in task_rows.to_representation(
+            task_queryset.values_list(*task_rows.columns)
+        ):
+            tasks[task["case"]].append(task)
+        for case in cases:
+            case["tasks"] = tasks[case["pk"]]
+
+        if page is None:
+            return Response(cases)
+        return self.get_paginated_response(cases)
 
     def perform_create(self, serializer):
         """
@@ -62,26 +671,183 @@ class CaseListCreateAPIView(generics.ListCreateAPIView):
         """
         serializer.save(user=self.request.user)
 
+
+class CaseRetrieveUpdateDestroyAPIView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    CaseQuerysetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
+    """
+    View to retrieve, update, destroy case item.
+
+    - `GET`: Returns a single case item.
+    - `DELETE`: Destroy a single case item, with its tasks in batches.
+    - `PUT/PATCH`: UPDATE a single case item.
+    """
+
+    def perform_destroy(self, instance):
+        """
+        Handles deleting the case and its tasks, see `deletion.delete_case`.
+        """
+        deletion.delete_case(instance, settings.CASE_DELETE_BATCH_SIZE)
+
+
+class CaseCloseAPIView(generics.GenericAPIView):
+    """
+    View to close a case and finish all its unfinished tasks at once.
+
+    - `POST`: Sets the case to closed and its unfinished tasks to finished,
+      keeping the completion date of tasks that have one, in one transaction
+      with one `UPDATE` for all tasks. Returns the case with the number of
+      tasks finished and whether the case was open.
+    """
+
     def get_queryset(self):
         """
         Handles filtering case for given user.
         """
         return Case.objects.filter(user=self.request.user)
 
+    def post(self, request, *args, **kwargs):
+        now = timezone.now()
+        with transaction.atomic():
+            case = get_object_or_404(
+                self.get_queryset().select_for_update(), pk=self.kwargs["pk"]
+            )
+            tasks_finished = (
+                Task.objects.filter(case=case)
+                .exclude(status=Task.StatusChoice.FINISHED)
+                .update(
+                    status=Task.StatusChoice.FINISHED,
+                    completed_date=Task.completion_date_expression(now),
+                    last_updated_date=now,
+                )
+            )
+            case_closed = (
+                Case.objects.filter(pk=case.pk)
+                .exclude(status=Case.StatusChoice.CLOSED)
+                .update(status=Case.StatusChoice.CLOSED, last_updated_date=now)
+            )
+        tasks_changed.send(sender=Task, user_ids={case.user_id}, case_ids={case.pk})
+        return Response(
+            {
+                "pk": case.pk,
+                "status": Case.StatusChoice.CLOSED,
+                "closed": bool(case_closed),
+                "tasks_finished": tasks_finished,
+            }
+        )
+
 
-class CaseRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ArchivedTaskListAPIView(CachedResponseMixin, generics.ListAPIView):
     """
-    View to retrieve, update, destroy case item.
+    View to list the archived tasks of the user.
 
-    - `GET`: Returns a single case item.
-    - `DELETE`: Destroy a single case item.
-    - `PUT/PATCH`: UPDATE a single case item.
+    - `GET`: Returns a page of archived tasks, ordered by creation date.
+      Accepts the filters and orderings of the task list.
     """
 
-    serializer_class = CaseSerializer
+    serializer_class = ArchivedTaskSerializer
+    filter_backends = [TaskFilterBackend, filters.OrderingFilter]
+    ordering_fields = ["creation_date"]
+    ordering = ("creation_date", "pk")
 
     def get_queryset(self):
         """
-        Handles filtering case for given user.
+        Handles filtering archived tasks for given user.
         """
-        return Case.objects.filter(user=self.request.user)
+        return ArchivedTask.objects.filter(user=self.request.user)
+
+
+class ArchivedTaskRetrieveAPIView(CachedResponseMixin, generics.RetrieveAPIView):
+    """
+    View to retrieve an archived task item.
+
+    - `GET`: Returns a single archived task item.
+    """
+
+    serializer_class = ArchivedTaskSerializer
+
+    def get_queryset(self):
+        """
+        Handles filtering archived task for given user.
+        """
+        return ArchivedTask.objects.filter(user=self.request.user)
+
+
+class ArchivedTaskRestoreAPIView(generics.GenericAPIView):
+    """
+    View to move an archived task back to the tasks.
+
+    - `POST`: Restores the task, and its case if it was archived too, and
+      returns the restored task.
+    """
+
+    serializer_class = TaskSerializer
+
+    def get_queryset(self):
+        """
+        Handles filtering archived task for given user.
+        """
+        return ArchivedTask.objects.filter(user=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        archive.restore_tasks(self.get_queryset().filter(pk=task.pk))
+        return Response(self.get_serializer(Task.objects.get(pk=task.pk)).data)
+
+
+class ArchivedCaseListAPIView(CachedResponseMixin, generics.ListAPIView):
+    """
+    View to list the archived cases of the user.
+
+    - `GET`: Returns a page of archived cases, ordered by primary key.
+    """
+
+    serializer_class = ArchivedCaseSerializer
+    ordering = ("pk",)
+
+    def get_queryset(self):
+        """
+        Handles filtering archived cases for given user.
+        """
+        return ArchivedCase.objects.filter(user=self.request.user)
+
+
+class ArchivedCaseRetrieveAPIView(CachedResponseMixin, generics.RetrieveAPIView):
+    """
+    View to retrieve an archived case item.
+
+    - `GET`: Returns a single archived case item.
+    """
+
+    serializer_class = ArchivedCaseSerializer
+
+    def get_queryset(self):
+        """
+        Handles filtering archived case for given user.
+        """
+        return ArchivedCase.objects.filter(user=self.request.user)
+
+
+class ArchivedCaseRestoreAPIView(CaseQuerysetMixin, generics.GenericAPIView):
+    """
+    View to move an archived case back to the cases.
+
+    - `POST`: Restores the case with all its archived tasks and returns the
+      restored case.
+    """
+
+    def get_object(self):
+        """
+        Handles finding the archived case of the user.
+        """
+        return get_object_or_404(
+            ArchivedCase.objects.filter(user=self.request.user), pk=self.kwargs["pk"]
+        )
+
+    def post(self, request, *args, **kwargs):
+        case = self.get_object()
+        archive.restore_cases(ArchivedCase.objects.filter(pk=case.pk))
+        return Response(self.get_serializer(self.get_queryset().get(pk=case.pk)).data)
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from environs import Env
 from pytz.reference import Local
 
@@ -11,11 +12,10 @@ env = Env()
 env.read_env(path=".env")
 SECRET_KEY = env.str("SECRET_KEY")
 
-DEBUG = True
-
-ALLOWED_HOSTS = ["0.0.0.0", "localhost"]
-
+DEBUG = env.bool("DEBUG", False)
 
+ALLOWED_HOSTS = env.list("ALLOWED_HOSTS", ["0.0.0.0", "localhost"])
+CSRF_TRUSTED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS", [])
 
 
 INSTALLED_APPS = [
@@ -30,7 +30,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "Myapp.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -39,6 +41,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+
 ROOT_URLCONF = "ToDo.urls"
 
 TEMPLATES = [
@@ -60,13 +63,106 @@ TEMPLATES = [
 WSGI_APPLICATION = "ToDo.wsgi.application"
 
 
+# SQLite by default; set DB_ENGINE=postgresql to serve from PostgreSQL.
+DB_ENGINE = env.str("DB_ENGINE", "sqlite3")
+
+# Opt-in SQLite profile for concurrent load, verified by the `Myapp` checks.
+SQLITE_TUNING = env.bool("SQLITE_TUNING", False)
+# Seconds a connection waits for a lock before failing with "database is locked".
+SQLITE_BUSY_TIMEOUT = env.int("SQLITE_BUSY_TIMEOUT", 20)
+SQLITE_PRAGMAS = {
+    # Readers and the writer no longer block each other.
+    "journal_mode": "WAL",
+    # Sync to disk at checkpoints only; safe from corruption in WAL mode.
+    "synchronous": "NORMAL",
+    "mmap_size": env.int("SQLITE_MMAP_SIZE", 128 * 1024 * 1024),
+    # Negative values are KiB per connection.
+    "cache_size": env.int("SQLITE_CACHE_SIZE", -20000),
+}
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db/db.sqlite3",
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": env.str("DB_NAME", "todo"),
+            "USER": env.str("DB_USER", "todo"),
+            "PASSWORD": env.str("DB_PASSWORD", ""),
+            "HOST": env.str("DB_HOST", "localhost"),
+            "PORT": env.int("DB_PORT", 5432),
+            # Seconds a connection is reused across requests, checked before reuse.
+            "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", 60),
+            "CONN_HEALTH_CHECKS": env.bool("DB_CONN_HEALTH_CHECKS", True),
+        }
     }
-}
+    if env.bool("DB_POOL", False):
+        # psycopg's connection pool, shared by the threads of a worker process.
+        # It replaces persistent connections, which Django rejects with a pool.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": env.int("DB_POOL_MIN_SIZE", 2),
+                "max_size": env.int("DB_POOL_MAX_SIZE", 10),
+                "timeout": env.int("DB_POOL_TIMEOUT", 10),
+            }
+        }
+elif DB_ENGINE == "sqlite3":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": env.str("DB_NAME", str(BASE_DIR / "db/db.sqlite3")),
+        }
+    }
+    if SQLITE_TUNING:
+        DATABASES["default"]["OPTIONS"] = {
+            "timeout": SQLITE_BUSY_TIMEOUT,
+            # Take the write lock when a transaction begins, so transactions
+            # that read before writing wait for each other instead of failing.
+            "transaction_mode": "IMMEDIATE",
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+        }
+else:
+    raise ImproperlyConfigured(
+        f"Unsupported DB_ENGINE {DB_ENGINE!r}, use 'sqlite3' or 'postgresql'."
+    )
+
+REDIS_URL = env.str("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+# Whether every process serving requests shares the cache. Invalidations only
+# reach the process that made them otherwise, so the response cache is off
+# without a shared cache. Set it to use the local memory cache with a single
+# worker process.
+SHARED_CACHE = env.bool("SHARED_CACHE", bool(REDIS_URL))
+
+# Per-route request metrics, served at /todo/metrics/ (see Myapp.metrics). They
+# add up the requests of all workers in the cache, so they are off by default
+# without a shared cache.
+METRICS_ENABLED = env.bool("METRICS_ENABLED", SHARED_CACHE)
+# Seconds between two flushes of the metrics of a worker to the shared cache.
+METRICS_FLUSH_INTERVAL = env.int("METRICS_FLUSH_INTERVAL", 10)
+# Requests slower than this many milliseconds are logged with their SQL.
+METRICS_SLOW_REQUEST_MS = env.int("METRICS_SLOW_REQUEST_MS", 500)
+# Slowest queries listed per slow request.
+METRICS_SLOW_QUERIES = env.int("METRICS_SLOW_QUERIES", 3)
+# Bearer token required by the metrics endpoint. Without one, the endpoint is
+# only served with DEBUG.
+METRICS_TOKEN = env.str("METRICS_TOKEN", "")
+
+# Seconds a GET response stays in the per-user response cache, 0 disables it.
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", 300 if SHARED_CACHE else 0)
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -95,20 +191,56 @@ USE_TZ = True
 
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedStaticFilesStorage",
+    },
+}
 
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "Myapp.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DATETIME_FORMAT": "%Y-%m-%d %H:%M:%S",
     "DATE_FORMAT": "%Y-%m-%d",
+    "DEFAULT_PAGINATION_CLASS": "Myapp.pagination.KeysetPagination",
+    "PAGE_SIZE": env.int("PAGE_SIZE", 50),
 }
+MAX_PAGE_SIZE = env.int("MAX_PAGE_SIZE", 500)
+BULK_MAX_BATCH_SIZE = env.int("BULK_MAX_BATCH_SIZE", 1000)
+# Seconds subtracted from sync watermarks, longer than any write transaction.
+SYNC_SAFETY_WINDOW = env.int("SYNC_SAFETY_WINDOW", 5)
+# Days deleted tasks are remembered for syncing clients.
+SYNC_TOMBSTONE_RETENTION_DAYS = env.int("SYNC_TOMBSTONE_RETENTION_DAYS", 30)
+
+# Tasks fetched from the database and written per chunk of an export.
+EXPORT_CHUNK_SIZE = env.int("EXPORT_CHUNK_SIZE", 2000)
+# Rows inserted per transaction by task imports.
+IMPORT_BATCH_SIZE = env.int("IMPORT_BATCH_SIZE", 1000)
+# Invalid rows listed in detail in an import report.
+IMPORT_MAX_ERRORS = env.int("IMPORT_MAX_ERRORS", 100)
+# Days after completion finished tasks, and after their last change closed
+# cases, are moved to the archive by `archive_tasks`.
+ARCHIVE_AFTER_DAYS = env.int("ARCHIVE_AFTER_DAYS", 90)
+# Rows moved per transaction by `archive_tasks`.
+ARCHIVE_BATCH_SIZE = env.int("ARCHIVE_BATCH_SIZE", 1000)
+# Tasks deleted per transaction when a case is deleted.
+CASE_DELETE_BATCH_SIZE = env.int("CASE_DELETE_BATCH_SIZE", 1000)
+
+# Seconds an authenticated user is cached between requests, 0 disables it.
+# Like the response cache, it needs a shared cache (see SHARED_CACHE).
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", 60 if SHARED_CACHE else 0)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=3),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -0,0 +1,72 @@
+"""
+Compares the task analytics computed from the tasks with the analytics read
+from the daily rollups, for the user with the most tasks.
+
+    python -m benchmarks.bench_analytics --tasks 1000000
+"""
+
+import argparse
+import time
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(args.tasks)
+
+    from datetime import timedelta
+
+    from django.db import connection
+    from django.db.models import Count
+    from django.utils import timezone
+
+    from Myapp import analytics
+    from Myapp.models import Task, TaskDailyRollup
+
+    start = time.perf_counter()
+    rows = analytics.refresh_rollups(full=True)
+    full = time.perf_counter() - start
+    start = time.perf_counter()
+    analytics.refresh_rollups()
+    incremental = time.perf_counter() - start
+    print(
+        f"{connection.vendor}, {Task.objects.count()} tasks, {rows} rollup rows\n"
+        f"full refresh {full * 1000:.0f} ms, "
+        f"incremental refresh {incremental * 1000:.0f} ms\n"
+    )
+
+    user_id = (
+        Task.objects.values_list("user")
+        .annotate(total=Count("pk"))
+        .order_by("-total")
+        .first()[0]
+    )
+    since = timezone.now() - timedelta(days=args.days)
+    finished = Task.objects.filter(user_id=user_id, completed_date__gte=since)
+    rollups = TaskDailyRollup.objects.filter(user_id=user_id, day__gte=since.date())
+    for name, function in (
+        ("lead time, tasks", lambda: analytics.lead_time_percentiles(finished)),
+        (
+            "lead time, rollup",
+            lambda: analytics.rollup_lead_time_percentiles(rollups),
+        ),
+        ("weekly throughput, tasks", lambda: analytics.throughput(finished, "week")),
+        (
+            "weekly throughput, rollup",
+            lambda: analytics.rollup_throughput(rollups, "week"),
+        ),
+    ):
+        median, best = measure(function, args.repeat)
+        print(f"{name:<28} {median:8.1f} ms (best {best:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+HTTP throughput of a running server while many slow, mostly idle clients are
+connected, e.g. to compare the sync views under gunicorn threads with the async
+views under uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py ToDo.wsgi:application
+    python -m benchmarks.bench_async --path /todo/tasks/ --idle 200
+
+    WEB_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+        gunicorn -c gunicorn.conf.py ToDo.asgi:application
+    python -m benchmarks.bench_async --path /todo/async/tasks/ --idle 200
+
+Each idle client sends its request headers one line every `--idle-interval`
+seconds and never finishes them, the way slow mobile clients do. Meanwhile the
+active clients send complete keep-alive requests for `--duration` seconds; the
+script prints their throughput, latency percentiles and error count.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.load_test import obtain_token
+
+
+async def read_response(reader):
+    """
+    Reads one HTTP/1.1 response and returns its status code.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def run_idle_client(host, port, path, interval, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(interval)
+            continue
+        try:
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n".encode())
+            number = 0
+            while time.perf_counter() < deadline and not reader.at_eof():
+                await asyncio.sleep(interval)
+                writer.write(f"X-Idle-{number}: 1\r\n".encode())
+                await writer.drain()
+                number += 1
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+
+async def run_active_client(host, port, path, token, deadline, latencies, errors):
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Authorization: Bearer {token}\r\n\r\n"
+    ).encode()
+    writer = None
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            status = await asyncio.wait_for(read_response(reader), timeout=30)
+        except (OSError, ConnectionError, asyncio.TimeoutError, ValueError):
+            errors.append(1)
+            if writer is not None:
+                writer.close()
+            writer = None
+            continue
+        if status >= 400:
+            errors.append(1)
+        else:
+            latencies.append(time.perf_counter() - start)
+    if writer is not None:
+        writer.close()
+
+
+async def run(args, token):
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    latencies, errors = [], []
+    idle_deadline = time.perf_counter() + args.warmup + args.duration
+    idle = [
+        asyncio.create_task(
+            run_idle_client(host, port, args.path, args.idle_interval, idle_deadline)
+        )
+        for _ in range(args.idle)
+    ]
+    # Let the idle clients connect before measuring.
+    await asyncio.sleep(args.warmup)
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(
+        *(
+            run_active_client(host, port, args.path, token, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        )
+    )
+    for task in idle:
+        task.cancel()
+    await asyncio.gather(*idle, return_exceptions=True)
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/todo/async/tasks/")
+    parser.add_argument("--username", default="seed_user_0")
+    parser.add_argument("--password", default="seed-password")
+    parser.add_argument("--idle", type=int, default=200)
+    parser.add_argument("--idle-interval", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=2)
+    args = parser.parse_args()
+
+    token = obtain_token(args.url, args.username, args.password)
+    latencies, errors = asyncio.run(run(args, token))
+
+    print(f"{args.path} with {args.idle} idle connections")
+    if not latencies:
+        print(f"No successful requests, {len(errors)} errors.")
+        return
+    latencies.sort()
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{len(latencies)} requests in {args.duration:.0f} s "
+        f"({len(latencies) / args.duration:.1f} req/s), {len(errors)} errors\n"
+        f"latency p50 {percentiles[49] * 1000:.1f} ms, "
+        f"p90 {percentiles[89] * 1000:.1f} ms, "
+        f"p99 {percentiles[98] * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Measures the per-request cost of JWT authentication with and without the
+cached user lookup of CachedJWTAuthentication.
+
+    python -m benchmarks.bench_auth --requests 5000
+"""
+
+import argparse
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(1000)
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from Myapp.authentication import CachedJWTAuthentication
+
+    user = User.objects.filter(tasks__isnull=False).first()
+    token = str(AccessToken.for_user(user))
+    request = Request(
+        APIRequestFactory().get("/todo/tasks/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    )
+
+    print(f"{args.requests} authentications per run, {connection.vendor}\n")
+    # The benchmark is a single process, so the local memory cache is shared.
+    with override_settings(SHARED_CACHE=True, AUTH_USER_CACHE_TIMEOUT=60):
+        for name, authentication in (
+            ("JWTAuthentication", JWTAuthentication()),
+            ("CachedJWTAuthentication", CachedJWTAuthentication()),
+        ):
+
+            def authenticate_all():
+                for _ in range(args.requests):
+                    authentication.authenticate(request)
+
+            with CaptureQueriesContext(connection) as queries:
+                authenticate_all()
+            median, best = measure(authenticate_all, args.repeat)
+            print(
+                f"{name:<24} {median * 1000 / args.requests:8.1f} us/request "
+                f"(best {best * 1000 / args.requests:.1f}), "
+                f"{len(queries) / args.requests:.3f} queries/request"
+            )
+
+
+if __name__ == "__main__":
+    main()
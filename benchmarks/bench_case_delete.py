@@ -0,0 +1,76 @@
+"""
+Compares deleting a big case through the ORM cascade with the batched
+`delete_case`, which is what the case endpoint uses.
+
+    python -m benchmarks.bench_case_delete --tasks 10000 50000
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(1000)
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from Myapp.deletion import delete_case
+    from Myapp.models import Case, Task
+    from Myapp.signals import tasks_changed
+
+    user = User.objects.filter(tasks__isnull=False).first()
+
+    def create_case(size):
+        case = Case.objects.create(title="Benchmark", user=user)
+        Task.objects.bulk_create(
+            (
+                Task(case=case, user=user, title=f"Task {number}", description="")
+                for number in range(size)
+            ),
+            batch_size=1000,
+        )
+        tasks_changed.send(sender=Task, user_ids={user.pk}, case_ids={case.pk})
+        return case
+
+    def delete_cascade(case):
+        case.delete()
+
+    def delete_batched(case):
+        delete_case(case, args.batch_size)
+
+    print(f"{connection.vendor}, batches of {args.batch_size} tasks\n")
+    for size in args.tasks:
+        print(f"== case with {size} tasks")
+        for name, function in (
+            ("cascade", delete_cascade),
+            ("batched", delete_batched),
+        ):
+            timings = []
+            for _ in range(args.repeat):
+                case = create_case(size)
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    function(case)
+                    timings.append((time.perf_counter() - start) * 1000)
+                query_count = len(queries)
+            print(
+                f"  {name:<8} median {statistics.median(timings):8.1f} ms, "
+                f"best {min(timings):.1f} ms, {query_count} queries"
+            )
+
+
+if __name__ == "__main__":
+    main()
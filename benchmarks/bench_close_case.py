@@ -0,0 +1,94 @@
+"""
+Compares closing a case with the close endpoint against finishing its tasks
+one `PATCH` at a time and then closing the case, as clients did before.
+
+    python -m benchmarks.bench_close_case --tasks 10000
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(1000)
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from Myapp.metrics import QueryTimer
+    from Myapp.models import Case, Task
+    from Myapp.signals import tasks_changed
+
+    user = User.objects.filter(tasks__isnull=False).first()
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def create_case():
+        case = Case.objects.create(title="Benchmark", user=user)
+        Task.objects.bulk_create(
+            (
+                Task(case=case, user=user, title=f"Task {number}", description="")
+                for number in range(args.tasks)
+            ),
+            batch_size=1000,
+        )
+        tasks_changed.send(sender=Task, user_ids={user.pk}, case_ids={case.pk})
+        return case
+
+    def close_per_task(case):
+        for pk in case.tasks.values_list("pk", flat=True):
+            client.patch(
+                reverse("task_retrieve_update_destroy", kwargs={"pk": pk}),
+                {"status": "FINISHED"},
+                format="json",
+            )
+        client.patch(
+            reverse("case_retrieve_update_destroy", kwargs={"pk": case.pk}),
+            {"status": "CLOSED"},
+            format="json",
+        )
+
+    def close_at_once(case):
+        client.post(reverse("case_close", kwargs={"pk": case.pk}))
+
+    print(f"{connection.vendor}, case with {args.tasks} open tasks\n")
+    # The response cache and slow request log would only add noise.
+    with override_settings(
+        ALLOWED_HOSTS=["*"], RESPONSE_CACHE_TIMEOUT=0, METRICS_SLOW_REQUEST_MS=10**6
+    ):
+        for name, function in (
+            ("per task", close_per_task),
+            ("close", close_at_once),
+        ):
+            timings = []
+            for _ in range(args.repeat):
+                case = create_case()
+                timer = QueryTimer(1)
+                with connection.execute_wrapper(timer):
+                    start = time.perf_counter()
+                    function(case)
+                    timings.append((time.perf_counter() - start) * 1000)
+                assert not case.tasks.exclude(status="FINISHED").exists()
+                case.delete()
+            print(
+                f"  {name:<8} median {statistics.median(timings):10.1f} ms, "
+                f"best {min(timings):.1f} ms, {timer.count} queries"
+            )
+
+
+if __name__ == "__main__":
+    main()
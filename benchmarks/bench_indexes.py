@@ -0,0 +1,91 @@
+"""
+Compares query plans and latency of the per-user queries with and without the
+composite indexes declared on Task and Case.
+
+    python -m benchmarks.bench_indexes --tasks 1000000
+"""
+
+import argparse
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, measure, setup_django
+
+
+def query_shapes(user):
+    from Myapp.models import Case, Task
+
+    tasks = Task.objects.filter(user=user)
+    middle = tasks.order_by("creation_date", "pk")[tasks.count() // 2]
+    return {
+        "task list page": tasks.order_by("creation_date", "pk")[:51],
+        "task list deep page": tasks.filter(
+            creation_date__gte=middle.creation_date
+        ).order_by("creation_date", "pk")[:51],
+        "tasks by status": tasks.filter(status=Task.StatusChoice.IN_PROGRESS).order_by(
+            "creation_date"
+        )[:51],
+        "unfinished tasks": tasks.exclude(status=Task.StatusChoice.FINISHED).order_by(
+            "creation_date"
+        )[:51],
+        "open cases": Case.objects.filter(user=user, status=Case.StatusChoice.OPEN),
+    }
+
+
+def run(user, repeat):
+    results = {}
+    for name, queryset in query_shapes(user).items():
+        plan = queryset.explain()
+        median, best = measure(lambda: list(queryset.all()), repeat)
+        results[name] = (plan, median, best)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(args.tasks, users=args.users)
+
+    from django.db import connection
+    from django.db.models import Count
+
+    from Myapp.models import Case, Task
+
+    user = (
+        Task.objects.values("user")
+        .annotate(total=Count("pk"))
+        .order_by("-total")[0]["user"]
+    )
+    indexes = [
+        (model, index) for model in (Task, Case) for index in model._meta.indexes
+    ]
+
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    try:
+        before = run(user, args.repeat)
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+    after = run(user, args.repeat)
+
+    print(f"{Task.objects.count()} tasks, user {user}, {connection.vendor}\n")
+    for name in before:
+        print(f"== {name}")
+        for label, (plan, median, best) in (
+            ("before", before[name]),
+            ("after", after[name]),
+        ):
+            print(f"  {label}: median {median:.2f} ms, best {best:.2f} ms")
+            print("    " + plan.replace("\n", "\n    "))
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures the per-request cost of the request metrics middleware, on a task
+list and a single task, with the response cache disabled.
+
+    python -m benchmarks.bench_metrics --requests 500
+"""
+
+import argparse
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(1000)
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from Myapp.models import Task
+
+    user = User.objects.filter(tasks__isnull=False).first()
+    token = str(AccessToken.for_user(user))
+    task = Task.objects.filter(user=user).first()
+    urls = {"task list": "/todo/tasks/", "task": f"/todo/task/{task.pk}/"}
+    without = [name for name in settings.MIDDLEWARE if not name.startswith("Myapp.")]
+
+    print(f"{args.requests} requests per run, {connection.vendor}\n")
+    for label, url in urls.items():
+        print(f"== {label}: {url}")
+        for name, middleware in (
+            ("without metrics", without),
+            ("with metrics", settings.MIDDLEWARE),
+        ):
+            # A single process, so the local memory cache is shared.
+            with override_settings(
+                MIDDLEWARE=middleware,
+                METRICS_ENABLED=True,
+                SHARED_CACHE=True,
+                RESPONSE_CACHE_TIMEOUT=0,
+                ALLOWED_HOSTS=["*"],
+            ):
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+                def get_all():
+                    for _ in range(args.requests):
+                        client.get(url)
+
+                median, best = measure(get_all, args.repeat)
+            print(
+                f"  {name:<16} {median * 1000 / args.requests:8.1f} us/request "
+                f"(best {best * 1000 / args.requests:.1f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compares the indexed task search with a naive `icontains` scan, for the user
+with the most tasks.
+
+    python -m benchmarks.bench_search --tasks 1000000
+"""
+
+import argparse
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(args.tasks)
+
+    from django.db import connection
+    from django.db.models import Count
+
+    from Myapp.models import Task
+    from Myapp.search import naive_search, search_tasks, search_terms
+
+    user_id = (
+        Task.objects.values_list("user")
+        .annotate(total=Count("pk"))
+        .order_by("-total")
+        .first()[0]
+    )
+    tasks = Task.objects.filter(user_id=user_id)
+    task = tasks.order_by("pk")[tasks.count() // 2]
+    queries = {
+        "one task title": task.title,
+        "case title": task.case.title,
+        "word of every task": "synthetic",
+        "no match": "nonexistent",
+    }
+
+    print(
+        f"{connection.vendor}, {Task.objects.count()} tasks, "
+        f"{tasks.count()} of user {user_id}, first {args.limit} results\n"
+    )
+    for name, query in queries.items():
+        indexed = search_tasks(tasks, query)[: args.limit]
+        naive = naive_search(tasks, search_terms(query))[: args.limit]
+        print(f"== {name}: {query!r}, {len(indexed)} results")
+        for label, queryset in (("index", indexed), ("icontains", naive)):
+            median, best = measure(lambda: list(queryset.all()), args.repeat)
+            print(f"  {label:<10} median {median:8.1f} ms, best {best:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compares the task and case serializers with the `RowSerializer` fast path of
+the listings, fetching and rendering the rows as JSON.
+
+    python -m benchmarks.bench_serializers --rows 10000 100000
+"""
+
+import argparse
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    ensure_seeded(max(args.rows))
+
+    from django.db import connection
+    from django.db.models import Prefetch
+    from rest_framework.renderers import JSONRenderer
+
+    from Myapp.models import Case, Task
+    from Myapp.serializers import CaseSerializer, RowSerializer, TaskSerializer
+
+    renderer = JSONRenderer()
+    task_rows = RowSerializer(TaskSerializer)
+    case_rows = RowSerializer(CaseSerializer, exclude=["tasks"])
+
+    def serialize_tasks(tasks):
+        return renderer.render(TaskSerializer(tasks, many=True).data)
+
+    def serialize_task_rows(tasks):
+        rows = tasks.values_list(*task_rows.columns, named=True)
+        return renderer.render(task_rows.to_representation(rows))
+
+    def serialize_cases(cases):
+        cases = cases.prefetch_related(
+            Prefetch("tasks", queryset=Task.objects.order_by("creation_date", "pk"))
+        )
+        return renderer.render(CaseSerializer(cases, many=True).data)
+
+    def serialize_case_rows(cases):
+        data = case_rows.to_representation(
+            cases.values_list(*case_rows.columns, named=True)
+        )
+        tasks = {case["pk"]: [] for case in data}
+        rows = Task.objects.filter(case__in=list(tasks)).order_by("creation_date", "pk")
+        for task in task_rows.to_representation(rows.values_list(*task_rows.columns)):
+            tasks[task["case"]].append(task)
+        for case in data:
+            case["tasks"] = tasks[case["pk"]]
+        return renderer.render(data)
+
+    print(f"{connection.vendor}, {Task.objects.count()} tasks\n")
+    for size in args.rows:
+        tasks = Task.objects.order_by("creation_date", "pk")[:size]
+        last_case = tasks[len(tasks) - 1].case_id
+        cases = Case.objects.filter(pk__lte=last_case).order_by("pk")
+        case_tasks = Task.objects.filter(case__in=cases).count()
+        assert serialize_tasks(tasks) == serialize_task_rows(tasks)
+        assert serialize_cases(cases) == serialize_case_rows(cases)
+
+        for label, functions, queryset in (
+            (f"{size} tasks", (serialize_tasks, serialize_task_rows), tasks),
+            (
+                f"{cases.count()} cases with {case_tasks} tasks",
+                (serialize_cases, serialize_case_rows),
+                cases,
+            ),
+        ):
+            print(f"== {label}")
+            timings = []
+            for name, function in zip(("serializer", "rows"), functions):
+                median, best = measure(lambda: function(queryset.all()), args.repeat)
+                timings.append(median)
+                print(f"  {name:<10} median {median:8.1f} ms, best {best:.1f} ms")
+            print(f"  speedup    {timings[0] / timings[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
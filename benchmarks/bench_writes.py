@@ -0,0 +1,108 @@
+"""
+Concurrent write throughput of the configured database.
+
+    python -m benchmarks.bench_writes --workers 1,2,4,8
+    DB_ENGINE=postgresql DB_NAME=todo_bench python -m benchmarks.bench_writes
+
+Every worker process updates random tasks the way `PATCH /todo/task/{pk}/`
+does, reading and saving each task in one transaction, for `--duration`
+seconds. The script prints the committed writes per second and the number of
+writes that failed with an `OperationalError` such as "database is locked".
+"""
+
+import argparse
+import multiprocessing
+import random
+import time
+
+from benchmarks.common import DEFAULT_DATABASE, ensure_seeded, setup_django
+
+
+def run_worker(database, pks, start, duration, seed):
+    setup_django(database)
+
+    from django.db import OperationalError, connection, transaction
+
+    from Myapp.models import Task
+
+    rng = random.Random(seed)
+    writes = errors = 0
+    time.sleep(max(0, start - time.time()))
+    deadline = start + duration
+    while time.time() < deadline:
+        pk = rng.choice(pks)
+        try:
+            with transaction.atomic():
+                task = Task.objects.get(pk=pk)
+                task.description = f"Updated by worker {seed} ({writes})"
+                task.save(update_fields=["description", "last_updated_date"])
+            writes += 1
+        except OperationalError:
+            errors += 1
+    connection.close()
+    return writes, errors
+
+
+def run_workers(database, pks, workers, duration):
+    """
+    Runs the workers in spawned processes and returns the writes and failures.
+
+    Spawned workers open their own connections, like server processes do, and
+    read their settings from the environment.
+    """
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers) as pool:
+        # Start all workers together, after their Django setup.
+        start = time.time() + 5
+        results = pool.starmap(
+            run_worker,
+            [(database, pks, start, duration, seed) for seed in range(workers)],
+        )
+    return sum(result[0] for result in results), sum(result[1] for result in results)
+
+
+def report(workers, writes, errors, duration):
+    print(
+        f"{workers:>3} workers {writes / duration:9.1f} writes/s, "
+        f"{errors} failed ({errors / max(writes + errors, 1):.1%})"
+    )
+
+
+def load_task_pks(tasks):
+    """
+    Returns the primary keys of the tasks to update, seeding them if needed.
+    """
+    ensure_seeded(tasks)
+
+    from django.db import connection
+
+    from Myapp.models import Task
+
+    pks = list(Task.objects.values_list("pk", flat=True)[:tasks])
+    connection.close()
+    return pks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    pks = load_task_pks(args.tasks)
+
+    from django.db import connection
+
+    print(f"{connection.vendor}, {args.duration:.0f} s per run\n")
+    for workers in map(int, args.workers.split(",")):
+        writes, errors = run_workers(args.database, pks, workers, args.duration)
+        report(workers, writes, errors, args.duration)
+
+
+if __name__ == "__main__":
+    main()
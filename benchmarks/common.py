@@ -0,0 +1,77 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks run against their own database (`db/benchmark.sqlite3` by default),
+so they never touch the development data. With another engine they run against
+the database named by `BENCHMARK_DB_NAME`, and refuse to run without it. Run
+them from the repository root:
+
+    python -m benchmarks.bench_indexes --tasks 1000000
+"""
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_DATABASE = BASE_DIR / "db" / "benchmark.sqlite3"
+
+
+def setup_django(database=DEFAULT_DATABASE):
+    """
+    Configures Django to use the benchmark database and runs the migrations.
+
+    SQLite benchmarks use the `database` file. Other engines use the database
+    named by `BENCHMARK_DB_NAME`, which must differ from the configured one,
+    since benchmarks seed rows and drop and recreate indexes.
+    """
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ToDo.settings")
+
+    import django
+    from django.conf import settings
+
+    default = settings.DATABASES["default"]
+    if default["ENGINE"] == "django.db.backends.sqlite3":
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
+        default["NAME"] = str(database)
+    else:
+        name = os.environ.get("BENCHMARK_DB_NAME", "")
+        if not name or name == default["NAME"]:
+            sys.exit(
+                f"Refusing to run benchmarks against database {default['NAME']!r}: "
+                "set BENCHMARK_DB_NAME to a separate, existing database."
+            )
+        default["NAME"] = name
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def ensure_seeded(tasks, **options):
+    """
+    Seeds the benchmark database unless it already holds enough tasks.
+    """
+    from django.core.management import call_command
+
+    from Myapp.models import Task
+
+    existing = Task.objects.count()
+    if existing < tasks:
+        call_command("seed_data", tasks=tasks - existing, seed=0, **options)
+
+
+def measure(function, repeat=20):
+    """
+    Calls the function `repeat` times and returns the median and best time in ms.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings)
@@ -0,0 +1,86 @@
+"""
+HTTP load test for a running server, e.g. to compare `runserver` with gunicorn.
+
+    python -m benchmarks.load_test --url http://localhost:8000 \
+        --username seed_user_0 --password seed-password --concurrency 32
+
+Every client thread sends GET requests to the path for `--duration` seconds;
+the script then prints the throughput, latency percentiles and error count.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+
+def obtain_token(url, username, password):
+    request = Request(
+        f"{url}/todo/api/token/",
+        data=json.dumps({"username": username, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urlopen(request) as response:
+        return json.load(response)["access"]
+
+
+def run_client(url, token, deadline, latencies, errors, lock):
+    request = Request(url, headers={"Authorization": f"Bearer {token}"})
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with urlopen(request, timeout=30) as response:
+                response.read()
+        except (HTTPError, URLError, OSError):
+            with lock:
+                errors.append(1)
+            continue
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/todo/tasks/")
+    parser.add_argument("--username", default="seed_user_0")
+    parser.add_argument("--password", default="seed-password")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    args = parser.parse_args()
+
+    token = obtain_token(args.url, args.username, args.password)
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        for _ in range(args.concurrency):
+            executor.submit(
+                run_client,
+                args.url + args.path,
+                token,
+                deadline,
+                latencies,
+                errors,
+                lock,
+            )
+
+    if not latencies:
+        print(f"No successful requests, {len(errors)} errors.")
+        return
+    latencies.sort()
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{len(latencies)} requests in {args.duration:.0f} s "
+        f"({len(latencies) / args.duration:.1f} req/s), {len(errors)} errors\n"
+        f"latency p50 {percentiles[49] * 1000:.1f} ms, "
+        f"p90 {percentiles[89] * 1000:.1f} ms, "
+        f"p99 {percentiles[98] * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Concurrency stress test of SQLite with and without the `SQLITE_TUNING` profile.
+
+    python -m benchmarks.stress_sqlite --workers 2,4,8
+
+Runs the concurrent task updates of `bench_writes` first with the default
+settings (rollback journal, deferred transactions, 5 s busy timeout) and then
+with `SQLITE_TUNING=True` (WAL, immediate transactions, `SQLITE_BUSY_TIMEOUT`),
+and prints the writes per second and the "database is locked" failures of both.
+The database is switched back to the rollback journal at the end.
+"""
+
+import argparse
+import os
+
+from benchmarks.bench_writes import load_task_pks, report, run_workers
+from benchmarks.common import DEFAULT_DATABASE, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--workers", default="2,4,8")
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    # The profile is read by the spawned workers, not by this process.
+    os.environ["SQLITE_TUNING"] = "False"
+    setup_django(args.database)
+    pks = load_task_pks(args.tasks)
+
+    from django.db import connection
+
+    if connection.vendor != "sqlite":
+        parser.error("the stress test needs DB_ENGINE=sqlite3")
+
+    for tuning in ("False", "True"):
+        os.environ["SQLITE_TUNING"] = tuning
+        print(f"SQLITE_TUNING={tuning}, {args.duration:.0f} s per run")
+        for workers in map(int, args.workers.split(",")):
+            writes, errors = run_workers(args.database, pks, workers, args.duration)
+            report(workers, writes, errors, args.duration)
+        print()
+
+    # WAL mode is stored in the database file, unlike the other pragmas.
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode=DELETE")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+Times every endpoint of `Myapp/urls.py` and the task and case serializers at
+several data sizes, and writes the timings and query counts as JSON so runs
+can be compared between commits.
+
+Each size runs in its own process against its own database,
+`db/benchmark_<size>.sqlite3`, seeded by `seed_data` on first use. Delete it
+after changing the seeding options. Writes run in a transaction rolled back
+after every request, so the data stays the same between runs, and the
+response cache is disabled.
+
+    python -m benchmarks.suite --sizes 1000 10000 100000
+    python -m benchmarks.suite --compare db/benchmark-old.json db/benchmark-new.json
+
+Comparing prints the change of every timing and exits with status 1 when a
+median got slower than `--threshold` or a query count grew.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, NamedTuple, Optional
+
+from benchmarks.common import BASE_DIR, ensure_seeded, measure, setup_django
+
+BULK_SIZE = 100
+IMPORT_SIZE = 1000
+SERIALIZED_TASKS = 1000
+
+
+class Endpoint(NamedTuple):
+    """
+    A request to time. `build` returns the keyword arguments of the request for
+    a fixture, it runs inside the rolled back transaction before every request,
+    so it may also prepare the data the request needs.
+    """
+
+    url_name: str
+    method: str
+    build: Optional[Callable] = None
+    variant: str = ""
+
+    @property
+    def label(self):
+        return " ".join(filter(None, (self.method, self.url_name, self.variant)))
+
+
+def task_payload(fixture, number):
+    return {
+        "case": fixture.case.pk,
+        "title": f"Benchmark {number}",
+        "description": "Created by the benchmark suite.",
+    }
+
+
+def import_file(fixture):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    lines = (
+        json.dumps({**task_payload(fixture, number), "status": "CREATED"})
+        for number in range(IMPORT_SIZE)
+    )
+    return SimpleUploadedFile("tasks.ndjson", "\n".join(lines).encode())
+
+
+def archive_case(fixture):
+    from Myapp.archive import CASE_FIELDS, move_tasks
+    from Myapp.models import ArchivedCase, Case, Task
+
+    now = datetime.now(timezone.utc)
+    case = Case.objects.filter(pk=fixture.closed_case.pk)
+    move_tasks(Task.objects.filter(case=fixture.closed_case), now)
+    ArchivedCase.objects.create(archived_date=now, **case.values(*CASE_FIELDS)[0])
+    case.delete()
+    return {"kwargs": {"pk": fixture.closed_case.pk}}
+
+
+def archive_task(fixture):
+    from Myapp.archive import move_tasks
+    from Myapp.models import Task
+
+    now = datetime.now(timezone.utc)
+    move_tasks(Task.objects.filter(pk=fixture.finished_task.pk), now)
+    return {"kwargs": {"pk": fixture.finished_task.pk}}
+
+
+def task_kwargs(fixture):
+    return {"kwargs": {"pk": fixture.task.pk}}
+
+
+def case_kwargs(fixture):
+    return {"kwargs": {"pk": fixture.case.pk}}
+
+
+ENDPOINTS = [
+    Endpoint(
+        "token_obtain_pair",
+        "POST",
+        lambda f: {"data": {"username": f.user.username, "password": f.password}},
+    ),
+    Endpoint("token_refresh", "POST", lambda f: {"data": {"refresh": f.refresh}}),
+    Endpoint("tasks_list_create", "GET"),
+    Endpoint(
+        "tasks_list_create",
+        "GET",
+        lambda f: {"data": {"ordering": "-creation_date", "status": "CREATED"}},
+        "filtered",
+    ),
+    Endpoint("tasks_list_create", "POST", lambda f: {"data": task_payload(f, 0)}),
+    Endpoint(
+        "tasks_bulk",
+        "POST",
+        lambda f: {"data": [task_payload(f, n) for n in range(BULK_SIZE)]},
+    ),
+    Endpoint(
+        "tasks_bulk",
+        "PATCH",
+        lambda f: {"data": [{"pk": pk, "title": "Renamed"} for pk in f.bulk_task_pks]},
+    ),
+    Endpoint("tasks_bulk", "DELETE", lambda f: {"data": f.bulk_task_pks}),
+    Endpoint("tasks_sync", "GET", variant="initial"),
+    Endpoint(
+        "tasks_sync",
+        "GET",
+        lambda f: {"data": {"since": f.week_ago.isoformat()}},
+        "week",
+    ),
+    Endpoint("tasks_search", "GET", lambda f: {"data": {"q": "synthetic task"}}),
+    Endpoint("tasks_export", "GET"),
+    Endpoint(
+        "tasks_import",
+        "POST",
+        lambda f: {"data": {"file": import_file(f)}, "format": "multipart"},
+    ),
+    Endpoint("tasks_stats", "GET"),
+    Endpoint("tasks_analytics", "GET"),
+    Endpoint("task_retrieve_update_destroy", "GET", task_kwargs),
+    Endpoint(
+        "task_retrieve_update_destroy",
+        "PATCH",
+        lambda f: {**task_kwargs(f), "data": {"title": "Renamed"}},
+    ),
+    Endpoint("task_retrieve_update_destroy", "DELETE", task_kwargs),
+    Endpoint("cases_list_create", "GET"),
+    Endpoint(
+        "cases_list_create", "GET", lambda f: {"data": {"tasks": "summary"}}, "summary"
+    ),
+    Endpoint("cases_list_create", "POST", lambda f: {"data": {"title": "Benchmark"}}),
+    Endpoint("case_retrieve_update_destroy", "GET", case_kwargs),
+    Endpoint(
+        "case_retrieve_update_destroy",
+        "PATCH",
+        lambda f: {**case_kwargs(f), "data": {"title": "Renamed"}},
+    ),
+    Endpoint("case_retrieve_update_destroy", "DELETE", case_kwargs),
+    Endpoint("case_close", "POST", case_kwargs),
+    Endpoint("archived_tasks_list", "GET", lambda f: archive_case(f) and {}),
+    Endpoint("archived_task_retrieve", "GET", archive_task),
+    Endpoint("archived_task_restore", "POST", archive_task),
+    Endpoint("archived_cases_list", "GET", lambda f: archive_case(f) and {}),
+    Endpoint("archived_case_retrieve", "GET", archive_case),
+    Endpoint("archived_case_restore", "POST", archive_case),
+    Endpoint("metrics", "GET"),
+    Endpoint("async_tasks_list_create", "GET"),
+    Endpoint("async_tasks_list_create", "POST", lambda f: {"data": task_payload(f, 0)}),
+    Endpoint("async_task_retrieve", "GET", task_kwargs),
+    Endpoint("async_cases_list_create", "GET"),
+    Endpoint("async_case_retrieve", "GET", case_kwargs),
+]
+
+
+def check_coverage():
+    """
+    Fails unless every named route of `Myapp/urls.py` has an endpoint to time.
+    """
+    from Myapp.urls import urlpatterns
+
+    names = {pattern.name for pattern in urlpatterns}
+    timed = {endpoint.url_name for endpoint in ENDPOINTS}
+    if names != timed:
+        raise SystemExit(
+            f"Routes without benchmark: {sorted(names - timed)}, "
+            f"benchmarks without route: {sorted(timed - names)}."
+        )
+
+
+def build_fixture(seed_options):
+    """
+    Returns the user whose requests are timed and the rows they work on: the
+    largest open case of the user, tasks in it and a closed case.
+    """
+    from types import SimpleNamespace
+
+    from django.contrib.auth.models import User
+    from django.db.models import Count
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from Myapp.models import Case, Task
+
+    user = User.objects.get(username=f"{seed_options['prefix']}0")
+    cases = Case.objects.filter(user=user).annotate(size=Count("tasks"))
+    case = cases.filter(status=Case.StatusChoice.OPEN).order_by("-size").first()
+    open_tasks = Task.objects.filter(case=case).exclude(
+        status=Task.StatusChoice.FINISHED
+    )
+    refresh = RefreshToken.for_user(user)
+    return SimpleNamespace(
+        user=user,
+        password=seed_options["password"],
+        access=str(refresh.access_token),
+        refresh=str(refresh),
+        case=case,
+        closed_case=cases.filter(status=Case.StatusChoice.CLOSED, size__gt=0)
+        .order_by("-size")
+        .first(),
+        task=open_tasks.order_by("pk").first(),
+        finished_task=Task.objects.filter(
+            user=user, status=Task.StatusChoice.FINISHED, case__status="OPEN"
+        ).first(),
+        bulk_task_pks=list(
+            open_tasks.order_by("pk").values_list("pk", flat=True)[:BULK_SIZE]
+        ),
+        week_ago=datetime.now(timezone.utc) - timedelta(days=7),
+    )
+
+
+def time_endpoint(client, endpoint, fixture, repeat):
+    """
+    Returns the median and best time in ms of the request, its query count and
+    response status. Every request runs in a rolled back transaction.
+    """
+    from django.db import connection, transaction
+    from django.urls import reverse
+
+    from Myapp.metrics import QueryTimer
+
+    timings = []
+    for _ in range(repeat + 1):
+        with transaction.atomic():
+            request = endpoint.build(fixture) if endpoint.build else {}
+            url = reverse(endpoint.url_name, kwargs=request.get("kwargs"))
+            send = getattr(client, endpoint.method.lower())
+            options = {}
+            if endpoint.method != "GET":
+                options["format"] = request.get("format", "json")
+            timer = QueryTimer(1)
+            with connection.execute_wrapper(timer):
+                start = time.perf_counter()
+                response = send(url, request.get("data"), **options)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                timings.append((time.perf_counter() - start) * 1000)
+            transaction.set_rollback(True)
+    # The first request warms up the caches of the process.
+    timings = sorted(timings[1:])
+    return {
+        "median_ms": round(timings[len(timings) // 2], 3),
+        "best_ms": round(timings[0], 3),
+        "queries": timer.count,
+        "status": response.status_code,
+    }
+
+
+def time_serializers(fixture, repeat):
+    """
+    Returns the timings of serializing a page of tasks and the cases of the user
+    with their nested tasks, with the rows already loaded.
+    """
+    from django.db.models import Prefetch
+
+    from Myapp.models import Case, Task
+    from Myapp.serializers import CaseSerializer, TaskSerializer
+
+    tasks = list(Task.objects.filter(user=fixture.user)[:SERIALIZED_TASKS])
+    cases = list(
+        Case.objects.filter(user=fixture.user).prefetch_related(
+            Prefetch("tasks", Task.objects.order_by("pk"))
+        )
+    )
+    results = {}
+    for label, serializer, rows in (
+        ("TaskSerializer", TaskSerializer, tasks),
+        ("CaseSerializer", CaseSerializer, cases),
+    ):
+        median, best = measure(lambda: serializer(rows, many=True).data, repeat)
+        results[label] = {
+            "median_ms": round(median, 3),
+            "best_ms": round(best, 3),
+            "rows": len(rows),
+        }
+    return results
+
+
+def run_size(size, repeat, seed_options):
+    """
+    Seeds the database of a size and returns the timings of all endpoints and
+    serializers. Runs in its own process, Django is set up once per process.
+    """
+    # Read by the URLconf, so the metrics route exists for `check_coverage`.
+    os.environ["METRICS_ENABLED"] = "True"
+    setup_django(BASE_DIR / "db" / f"benchmark_{size}.sqlite3")
+    check_coverage()
+    ensure_seeded(size, **seed_options)
+
+    from django.db import connection
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    from Myapp.models import Task
+
+    fixture = build_fixture(seed_options)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {fixture.access}")
+    endpoints = {}
+    # The bearer token of the client also authorizes the metrics endpoint.
+    with override_settings(
+        RESPONSE_CACHE_TIMEOUT=0, ALLOWED_HOSTS=["*"], METRICS_TOKEN=fixture.access
+    ):
+        for endpoint in ENDPOINTS:
+            endpoints[endpoint.label] = time_endpoint(client, endpoint, fixture, repeat)
+            print(f"  {size:>8} {endpoint.label:<48} {endpoints[endpoint.label]}")
+    return {
+        "tasks": Task.objects.count(),
+        "user_tasks": Task.objects.filter(user=fixture.user).count(),
+        "database": connection.vendor,
+        "endpoints": endpoints,
+        "serializers": time_serializers(fixture, repeat),
+    }
+
+
+def git_commit():
+    """
+    Returns the current commit, marked dirty when the tree has changes.
+    """
+
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=BASE_DIR, capture_output=True, text=True
+        ).stdout.strip()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return (
+        f"{commit}-dirty"
+        if git("status", "--porcelain", "--untracked-files=no")
+        else commit
+    )
+
+
+def versions():
+    import django
+    import rest_framework
+    import sqlite3
+
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "djangorestframework": rest_framework.VERSION,
+        "sqlite": sqlite3.sqlite_version,
+    }
+
+
+def run(args):
+    seed_options = {
+        "users": args.users,
+        "cases": args.cases,
+        "skew": args.skew,
+        "prefix": "seed_user_",
+        "password": "seed-password",
+    }
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "versions": versions(),
+        "repeat": args.repeat,
+        "seed": seed_options,
+        "sizes": {},
+    }
+    spawn = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        with ProcessPoolExecutor(1, mp_context=spawn) as executor:
+            results["sizes"][str(size)] = executor.submit(
+                run_size, size, args.repeat, seed_options
+            ).result()
+
+    output = args.output or BASE_DIR / "db" / f"benchmark-{commit}.json"
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nWrote {output}")
+
+
+def compare(old_path, new_path, threshold):
+    """
+    Prints the changes between two result files and returns whether any timing
+    or query count regressed.
+    """
+    with open(old_path) as file:
+        old = json.load(file)
+    with open(new_path) as file:
+        new = json.load(file)
+
+    print(f"{old['commit']} ({old['date']}) -> {new['commit']} ({new['date']})")
+    regressed = False
+    for size, new_results in new["sizes"].items():
+        old_results = old["sizes"].get(size)
+        if old_results is None:
+            continue
+        print(f"\n== {size} tasks")
+        for group in ("endpoints", "serializers"):
+            for label, timing in new_results[group].items():
+                before = old_results[group].get(label)
+                if before is None:
+                    continue
+                ratio = timing["median_ms"] / max(before["median_ms"], 0.001)
+                queries = (before.get("queries"), timing.get("queries"))
+                flags = []
+                if ratio > threshold:
+                    flags.append("SLOWER")
+                if queries[0] is not None and queries[1] > queries[0]:
+                    flags.append("MORE QUERIES")
+                if before.get("status") != timing.get("status"):
+                    flags.append(f"STATUS {before.get('status')}->{timing['status']}")
+                regressed = regressed or bool(flags[:2])
+                query_change = (
+                    f"{queries[0]:>4} -> {queries[1]:<4} queries"
+                    if queries[0] is not None
+                    else ""
+                )
+                print(
+                    f"  {label:<48} {before['median_ms']:9.2f} -> "
+                    f"{timing['median_ms']:9.2f} ms ({ratio:5.2f}x) "
+                    f"{query_change} {' '.join(flags)}"
+                )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--cases", type=int, default=20, help="Cases per user.")
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--output", help="Defaults to db/benchmark-<commit>.json.")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio of a median reported as a regression.",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for the production server.
+
+Serves ToDo.wsgi with threaded workers by default:
+
+    gunicorn -c gunicorn.conf.py ToDo.wsgi:application
+
+To serve ToDo.asgi instead, set WEB_WORKER_CLASS=uvicorn.workers.UvicornWorker
+and run `gunicorn -c gunicorn.conf.py ToDo.asgi:application`.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("WEB_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("WEB_THREADS", 4))
+worker_class = os.environ.get("WEB_WORKER_CLASS", "gthread")
+timeout = int(os.environ.get("WEB_TIMEOUT", 30))
+keepalive = int(os.environ.get("WEB_KEEPALIVE", 5))
+# Recycle workers periodically to bound memory growth.
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 5000))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 500))
+accesslog = os.environ.get("WEB_ACCESS_LOG", "-")
+preload_app = True